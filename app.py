@@ -2,11 +2,13 @@
 Most top-level instanciator and runner. Main point of entry for the server code.
 """
 import logging.config
+from fastapi import Depends
 from fastapi.openapi.utils import get_openapi
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from fastapi_route_logger_middleware import RouteLoggerMiddleware
-from config.db import close_connection_to_mongo, _is_testing
+from config.db import (close_connection_to_mongo, check_database_indexes,
+                       _is_testing)
 from config.main import app
 from routes.users import router as users_router
 from routes.events import router as events_router
@@ -14,6 +16,13 @@ from routes.feedback import router as feedback_router
 from routes.admin import router as admin_router
 from routes.images import router as images_router
 from routes.auth import router as auth_router
+from util.events import (start_event_status_sweeper, stop_event_status_sweeper,
+                         backfill_event_location_points, archive_ended_events)
+from util.users import start_request_user_identity_map
+from util.passwords import (start_password_hashing_pool,
+                            shutdown_password_hashing_pool)
+from util.images import (start_image_resizing_pool,
+                         shutdown_image_resizing_pool)
 
 
 @app.get("/")
@@ -81,13 +90,27 @@ def custom_schema():
     return app.openapi_schema
 
 
-app.include_router(users_router)
-app.include_router(events_router)
-app.include_router(feedback_router)
-app.include_router(admin_router)
-app.include_router(images_router)
-app.include_router(auth_router)
+# runs before any other dependency of every route
+request_scoped_dependencies = [Depends(start_request_user_identity_map)]
 
+app.include_router(users_router, dependencies=request_scoped_dependencies)
+app.include_router(events_router, dependencies=request_scoped_dependencies)
+app.include_router(feedback_router, dependencies=request_scoped_dependencies)
+app.include_router(admin_router, dependencies=request_scoped_dependencies)
+app.include_router(images_router, dependencies=request_scoped_dependencies)
+app.include_router(auth_router, dependencies=request_scoped_dependencies)
+
+# process pools must start before the database executor,
+# see `start_password_hashing_pool`
+app.add_event_handler("startup", start_password_hashing_pool)
+app.add_event_handler("startup", start_image_resizing_pool)
+app.add_event_handler("startup", check_database_indexes)
+app.add_event_handler("startup", backfill_event_location_points)
+app.add_event_handler("startup", archive_ended_events)
+app.add_event_handler("startup", start_event_status_sweeper)
+app.add_event_handler("shutdown", stop_event_status_sweeper)
+app.add_event_handler("shutdown", shutdown_password_hashing_pool)
+app.add_event_handler("shutdown", shutdown_image_resizing_pool)
 app.add_event_handler("shutdown", close_connection_to_mongo)
 
 app.openapi = custom_schema
@@ -0,0 +1,7 @@
+"""
+Benchmark scripts for the hot paths of the API.
+
+Each `bench_*.py` module can be run on its own with `python -m`, and needs the
+same environment variables as the server. Benchmarks always run against a
+throwaway testing database, which is dropped once they finish.
+"""
@@ -0,0 +1,81 @@
+"""
+Benchmarks the per-event cost of reading query responses: full documents
+hydrated into `Event` and then `EventQueryResponse` (validating twice),
+against projected documents built with `EventQueryResponse.construct()`.
+
+Usage: python -m benchmarks.bench_event_projection [page sizes...]
+"""
+import sys
+from typing import List
+
+from benchmarks import common
+import models.events as event_models
+import util.events as event_utils
+
+DEFAULT_PAGE_SIZES = [100, 1_000, 5_000]
+SEEDED_EVENTS = 10_000
+
+
+async def read_full_documents(
+        page_size: int) -> List[event_models.EventQueryResponse]:
+    """
+    The read path before projections: every field is fetched and each
+    document is validated as an `Event`, then again as the response.
+    """
+    events_found = []
+    events = event_utils.events_collection().find().limit(page_size)
+
+    async for event_document in events:
+        event = event_models.Event(**event_document)
+        events_found.append(
+            event_models.EventQueryResponse(**event.dict(),
+                                            event_id=event.get_id()))
+
+    return events_found
+
+
+async def read_projected_documents(
+        page_size: int) -> List[event_models.EventQueryResponse]:
+    """
+    The current read path: only the response fields are fetched and
+    rows are constructed without validation.
+    """
+    projection_dict = event_models.EventQueryResponse.get_projection_dict()
+    events = event_utils.events_collection().find(
+        {}, projection_dict).limit(page_size)
+
+    return [
+        event_models.EventQueryResponse.from_database_document(event_document)
+        async for event_document in events
+    ]
+
+
+def main(page_sizes: List[int]) -> None:
+    """
+    Seeds the database once and times both read paths at each page size,
+    reporting the median cost per event in microseconds.
+    """
+    common.use_throwaway_database()
+    rows = []
+
+    try:
+        common.seed_events(max(SEEDED_EVENTS, *page_sizes))
+
+        for page_size in page_sizes:
+            full_ms = common.time_coroutine(read_full_documents, page_size)
+            projected_ms = common.time_coroutine(read_projected_documents,
+                                                 page_size)
+
+            to_micros_per_event = lambda ms, size=page_size: ms * 1000 / size
+            rows.append((page_size, f"{to_micros_per_event(full_ms):.1f}",
+                         f"{to_micros_per_event(projected_ms):.1f}"))
+    finally:
+        common.drop_throwaway_database()
+
+    common.print_results_table(
+        "Event query responses, median microseconds per event",
+        ("events read", "full + Event", "projected + construct"), rows)
+
+
+if __name__ == "__main__":
+    main([int(size) for size in sys.argv[1:]] or DEFAULT_PAGE_SIZES)
@@ -0,0 +1,65 @@
+"""
+Benchmarks `/events/search`: the ranked `$text` search against the
+full collection scan it replaced, at increasing collection sizes.
+
+Usage: python -m benchmarks.bench_event_search [collection sizes...]
+"""
+import sys
+import random
+from typing import List
+
+from benchmarks import common
+import models.events as event_models
+import util.events as event_utils
+
+DEFAULT_COLLECTION_SIZES = [10_000, 100_000]
+
+
+async def full_scan_search(
+        form: event_models.EventSearchForm) -> event_models.ListOfEvents:
+    """
+    The search implementation before the text index: reads every event
+    and keeps the ones whose title or description equal the keyword.
+    """
+    events = event_utils.events_collection().find()
+    result_events = []
+
+    async for event in events:
+        if form.keyword in {event["title"], event["description"]}:
+            result_events.append(
+                event_models.EventQueryResponse(**event,
+                                                event_id=event["_id"]))
+
+    return event_models.ListOfEvents(events=result_events)
+
+
+def main(collection_sizes: List[int]) -> None:
+    """
+    Seeds the database at each size and times both search paths
+    with the title of a random seeded event as the keyword.
+    """
+    common.use_throwaway_database()
+    rows = []
+
+    try:
+        for size in collection_sizes:
+            common.clear_collections()
+            documents = common.seed_events(size)
+
+            keyword = random.choice(documents)["title"]
+            form = event_models.EventSearchForm(keyword=keyword)
+
+            full_scan_ms = common.time_coroutine(full_scan_search, form)
+            text_index_ms = common.time_coroutine(event_utils.search_events,
+                                                  form)
+            rows.append((size, f"{full_scan_ms:.1f}", f"{text_index_ms:.1f}"))
+    finally:
+        common.drop_throwaway_database()
+
+    common.print_results_table(
+        "Event search, median ms per query",
+        ("events", "full scan", "text index"), rows)
+
+
+if __name__ == "__main__":
+    main([int(size) for size in sys.argv[1:]] or DEFAULT_COLLECTION_SIZES)
@@ -0,0 +1,113 @@
+"""
+Load test for password hashing: fires a storm of concurrent logins at a
+running server while probing an unrelated endpoint, reporting the login
+throughput and the probe's latency percentiles.
+
+Start the server first (e.g. `uvicorn app:app`), then run:
+python -m benchmarks.bench_login_storm [base url] [logins] [concurrency]
+"""
+import sys
+import time
+import uuid
+import statistics
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Tuple
+
+import requests
+
+from benchmarks import common
+
+DEFAULT_BASE_URL = "http://localhost:8000"
+DEFAULT_LOGINS = 200
+DEFAULT_CONCURRENCY = 32
+PROBE_PATH = "/"
+
+
+def register_storm_user(base_url: str) -> Tuple[str, str]:
+    """
+    Registers a throwaway user to log in as, returning it's email/password.
+    """
+    email = f"storm-{uuid.uuid4().hex[:12]}@example.com"
+    password = "stormpass"
+    response = requests.post(f"{base_url}/users/register",
+                             json={
+                                 "first_name": "Storm",
+                                 "last_name": "Tester",
+                                 "email": email,
+                                 "password": password,
+                             })
+    response.raise_for_status()
+    return email, password
+
+
+def log_in(base_url: str, email: str, password: str) -> int:
+    """
+    Logs in once, returning the response status code.
+    """
+    response = requests.post(f"{base_url}/users/login",
+                             json={
+                                 "identifier": {
+                                     "email": email
+                                 },
+                                 "password": password
+                             })
+    return response.status_code
+
+
+def probe_until_stopped(base_url: str, stop_event: threading.Event,
+                        latencies_ms: List[float]) -> None:
+    """
+    Keeps hitting the probe endpoint until stopped, recording latencies.
+    """
+    while not stop_event.is_set():
+        start = time.perf_counter()
+        requests.get(f"{base_url}{PROBE_PATH}")
+        latencies_ms.append((time.perf_counter() - start) * 1000)
+
+
+def get_percentile(values: List[float], percentile: int) -> float:
+    """
+    Returns the given percentile (1-99) of the values.
+    """
+    return statistics.quantiles(values, n=100)[percentile - 1]
+
+
+def main(base_url: str, logins: int, concurrency: int) -> None:
+    """
+    Runs the login storm with the probe going in the background.
+    """
+    email, password = register_storm_user(base_url)
+
+    stop_event = threading.Event()
+    latencies_ms = []
+    probe_thread = threading.Thread(target=probe_until_stopped,
+                                    args=(base_url, stop_event, latencies_ms))
+    probe_thread.start()
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        status_codes = list(
+            executor.map(lambda _: log_in(base_url, email, password),
+                         range(logins)))
+    elapsed_seconds = time.perf_counter() - start
+
+    stop_event.set()
+    probe_thread.join()
+
+    successful_logins = status_codes.count(200)
+    common.print_results_table(
+        f"Login storm: {logins} logins, {concurrency} at a time",
+        ("logins/s", "ok", "429", f"{PROBE_PATH} p50 ms",
+         f"{PROBE_PATH} p99 ms"),
+        [(f"{successful_logins / elapsed_seconds:.1f}", successful_logins,
+          status_codes.count(429), f"{get_percentile(latencies_ms, 50):.1f}",
+          f"{get_percentile(latencies_ms, 99):.1f}")])
+
+
+if __name__ == "__main__":
+    main(
+        sys.argv[1] if sys.argv[1:] else DEFAULT_BASE_URL,
+        int(sys.argv[2]) if sys.argv[2:] else DEFAULT_LOGINS,
+        int(sys.argv[3]) if sys.argv[3:] else DEFAULT_CONCURRENCY,
+    )
@@ -0,0 +1,136 @@
+# pylint: disable=unsubscriptable-object
+#       - this is actually a pylint bug that hasn't been resolved.
+"""
+Shared setup, data generation and timing helpers for the benchmarks.
+"""
+import os
+import time
+import random
+import asyncio
+import statistics
+from datetime import datetime, timedelta
+from typing import Callable, Awaitable, Any, List, Dict, Tuple
+
+from faker import Faker
+
+import models.events as event_models
+from config.db import _get_global_database_instance, get_database, \
+    get_database_client_name
+
+INSERTION_CHUNK_SIZE = 5_000
+
+
+def use_throwaway_database() -> None:
+    """
+    Flags the process as testing so that `config.db` picks a unique,
+    disposable database. Must run before the database is first used.
+    """
+    os.environ["_called_from_test"] = "True"
+
+
+def drop_throwaway_database() -> None:
+    """
+    Drops the benchmark database and closes the connection.
+    """
+    database_instance = _get_global_database_instance()
+    database_instance.delete_test_database()
+    database_instance.close_client_connection()
+
+
+def clear_collections() -> None:
+    """
+    Deletes every document from the benchmark database, keeping the indexes.
+    """
+    _get_global_database_instance().clear_test_collections()
+
+
+def generate_event_documents(amount: int) -> List[Dict[str, Any]]:
+    """
+    Returns `amount` random, valid, public and approved event documents
+    whose dates are spread around the current date.
+    """
+    fake = Faker()
+    Faker.seed(amount)
+    random.seed(amount)
+
+    tags = [tag.name for tag in event_models.EventTagEnum]
+    documents = []
+
+    for _ in range(amount):
+        start_time = datetime.utcnow() + timedelta(
+            hours=random.randint(-24 * 5, 24 * 30))
+        end_time = start_time + timedelta(hours=random.randint(1, 24 * 3))
+        event = event_models.Event(
+            title=fake.sentence(),
+            description=fake.text(),
+            date_time_start=start_time,
+            date_time_end=end_time,
+            tags=random.sample(tags, 2),
+            location={
+                "title": fake.city(),
+                "latitude": float(fake.latitude()),
+                "longitude": float(fake.longitude()),
+            },
+            max_capacity=random.randint(1, 100),
+            public=True,
+            links=[],
+            creator_id=fake.uuid4(),
+            approval=event_models.EventApprovalEnum.approved,
+        )
+        documents.append(event.dict())
+
+    return documents
+
+
+def seed_events(amount: int) -> List[Dict[str, Any]]:
+    """
+    Inserts `amount` random events into the benchmark database
+    and returns the inserted documents.
+    """
+    documents = generate_event_documents(amount)
+    events = get_database()[get_database_client_name()]["events"]
+
+    for chunk_start in range(0, amount, INSERTION_CHUNK_SIZE):
+        chunk_end = chunk_start + INSERTION_CHUNK_SIZE
+        events.insert_many(documents[chunk_start:chunk_end])
+
+    return documents
+
+
+def time_coroutine(coroutine_function: Callable[..., Awaitable[Any]],
+                   *args,
+                   repeat: int = 5) -> float:
+    """
+    Runs the coroutine function `repeat` times and returns the median
+    wall time of a single run, in milliseconds.
+    """
+    loop = asyncio.new_event_loop()
+    timings = []
+
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            loop.run_until_complete(coroutine_function(*args))
+            timings.append((time.perf_counter() - start) * 1000)
+    finally:
+        loop.close()
+
+    return statistics.median(timings)
+
+
+def print_results_table(title: str, headers: Tuple[str, ...],
+                        rows: List[Tuple[Any, ...]]) -> None:
+    """
+    Prints the benchmark results as a plain, aligned text table.
+    """
+    widths = [
+        max(len(str(cell)) for cell in column)
+        for column in zip(headers, *rows)
+    ]
+    format_row = lambda row: "  ".join(
+        str(cell).rjust(width) for cell, width in zip(row, widths))
+
+    print(f"\n{title}")
+    print(format_row(headers))
+    for row in rows:
+        print(format_row(row))
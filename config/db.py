@@ -1,3 +1,5 @@
+# pylint: disable=unsubscriptable-object
+#       - this is actually a pylint bug that hasn't been resolved.
 """
 Global settings manager + instanciator of the database client instance.
 
@@ -7,11 +9,65 @@ as well as making sure that we never accidentally swap from the production
 database to the testing database.
 """
 import os
+import asyncio
+import logging
+import itertools
+import functools
 from uuid import uuid4
-from typing import Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Callable, Optional
 import gridfs
-from pymongo import MongoClient, IndexModel
-from config.main import DB_URI
+from pymongo import MongoClient, IndexModel, ASCENDING, GEOSPHERE, TEXT
+from pymongo.cursor import Cursor
+from pymongo.collection import Collection
+from pymongo.database import Database as MongoDatabase
+from config.main import DB_URI, DB_EXECUTOR_MAX_WORKERS
+
+# Every index the queries in `util/` rely on, keyed by collection name.
+# Names are always explicit since they're how the startup check pairs
+# registered indexes with the ones in the database.
+INDEX_REGISTRY: Dict[str, List[IndexModel]] = {
+    "users": [
+        IndexModel([("email", ASCENDING)], name="email_1", unique=True),
+        # archiving ended events for every user that has them visible
+        IndexModel([("events_visible", ASCENDING)], name="events_visible_1"),
+    ],
+    "events": [
+        # batch query: equality fields first, then the page sort order
+        IndexModel([("approval", ASCENDING), ("public", ASCENDING),
+                    ("status", ASCENDING), ("date_time_start", ASCENDING),
+                    ("_id", ASCENDING)],
+                   name="batch_query"),
+        # admin approval queue, oldest events first
+        IndexModel([("approval", ASCENDING), ("date_time_start", ASCENDING),
+                    ("_id", ASCENDING)],
+                   name="approval_queue"),
+        IndexModel([("creator_id", ASCENDING)], name="creator_id_1"),
+        # status sweeper, one index per date it compares against
+        IndexModel([("status", ASCENDING), ("date_time_end", ASCENDING)],
+                   name="status_date_time_end"),
+        IndexModel([("status", ASCENDING), ("date_time_start", ASCENDING)],
+                   name="status_date_time_start"),
+        IndexModel([("location_point", GEOSPHERE)],
+                   name="location_point_2dsphere"),
+        IndexModel([("title", TEXT), ("description", TEXT)],
+                   name="title_description_text",
+                   weights={
+                       "title": 3,
+                       "description": 1
+                   }),
+    ],
+    "feedback": [
+        # an event's feedback in creation order
+        IndexModel([("event_id", ASCENDING), ("created_at", ASCENDING),
+                    ("_id", ASCENDING)],
+                   name="event_id_1_created_at_1__id_1"),
+    ],
+}
+
+# index options that change what an index does, compared by the startup check
+INDEX_SPEC_OPTIONS = ("unique", "sparse", "expireAfterSeconds",
+                      "partialFilterExpression")
 
 
 def get_database() -> MongoClient:
@@ -25,6 +81,50 @@ def get_database() -> MongoClient:
     return db_instance.get_database_client()
 
 
+def get_async_database() -> "AsyncDatabase":
+    """
+    Returns the awaitable facade over the current database.
+
+    Every call made through it runs on the database executor instead of
+    the event loop. Even if called multiple times, the same object will
+    always be returned.
+    """
+    db_instance = _get_global_database_instance()
+    return db_instance.get_async_database()
+
+
+async def run_in_database_executor(function: Callable[..., Any], *args,
+                                   **kwargs) -> Any:
+    """
+    Runs a blocking database call on the bounded database executor and
+    awaits its result, keeping the event loop free in the meantime.
+    """
+    db_instance = _get_global_database_instance()
+    executor = db_instance.get_executor()
+
+    loop = asyncio.get_running_loop()
+    blocking_call = functools.partial(function, *args, **kwargs)
+    return await loop.run_in_executor(executor, blocking_call)
+
+
+def check_database_indexes() -> None:
+    """
+    Startup check that logs a warning for every collection whose indexes
+    didn't match `INDEX_REGISTRY` when the database was first set up,
+    be it missing (since created), mismatched or extra indexes.
+    """
+    db_instance = _get_global_database_instance()
+    index_report = db_instance.get_startup_index_report()
+
+    for collection_name, index_names in index_report.items():
+        if any(index_names.values()):
+            logging.warning(
+                "Indexes out of sync on '%s': missing %s (created), "
+                "mismatched %s, extra %s", collection_name,
+                index_names["missing"], index_names["mismatched"],
+                index_names["extra"])
+
+
 def close_connection_to_mongo() -> None:
     """
     Public facing method for closing the database connection
@@ -91,6 +191,133 @@ def _generate_test_database_name() -> str:
     return testing_db_name_str
 
 
+class AsyncCursor:
+    """
+    Awaitable facade over a pymongo cursor.
+
+    Cursor modifiers (`sort`, `limit`, ...) are applied to the underlying
+    cursor straight away since they never touch the network, while every
+    fetch of documents runs on the database executor.
+    """
+    DEFAULT_FETCH_SIZE = 100
+
+    def __init__(self, cursor: Cursor):
+        self.cursor = cursor
+        self.fetch_size = self.DEFAULT_FETCH_SIZE
+
+    def sort(self, *args, **kwargs) -> "AsyncCursor":
+        self.cursor.sort(*args, **kwargs)
+        return self
+
+    def skip(self, skip: int) -> "AsyncCursor":
+        self.cursor.skip(skip)
+        return self
+
+    def limit(self, limit: int) -> "AsyncCursor":
+        self.cursor.limit(limit)
+        return self
+
+    def batch_size(self, batch_size: int) -> "AsyncCursor":
+        """
+        Sets the amount of documents fetched per round trip, both for
+        the server-side cursor and for the async iteration.
+        """
+        self.cursor.batch_size(batch_size)
+        self.fetch_size = batch_size
+        return self
+
+    async def to_list(self, length: Optional[int] = None) -> List[Any]:
+        """
+        Exhausts the cursor (or reads up to `length` documents)
+        and returns the documents as a list.
+        """
+        return await run_in_database_executor(self.__fetch_documents, length)
+
+    def __aiter__(self):
+        return self.__iterate_documents()
+
+    async def __iterate_documents(self):
+        """
+        Yields documents one at a time, fetching them
+        from the server `fetch_size` documents at a time.
+        """
+        while True:
+            documents = await self.to_list(self.fetch_size)
+            if not documents:
+                return
+            for document in documents:
+                yield document
+
+    def __fetch_documents(self, length: Optional[int]) -> List[Any]:
+        return list(itertools.islice(self.cursor, length))
+
+
+class AsyncCollection:
+    """
+    Awaitable facade over a pymongo collection.
+
+    Only the whitelisted pymongo methods are exposed; each one is wrapped
+    into a coroutine that runs the original call on the database executor.
+    """
+    AWAITABLE_METHODS = frozenset({
+        "find_one",
+        "insert_one",
+        "insert_many",
+        "update_one",
+        "update_many",
+        "delete_one",
+        "delete_many",
+        "find_one_and_update",
+        "find_one_and_delete",
+        "count_documents",
+        "bulk_write",
+        "create_indexes",
+        "index_information",
+    })
+
+    def __init__(self, collection: Collection):
+        self.collection = collection
+
+    def find(self, *args, **kwargs) -> AsyncCursor:
+        """
+        Builds the query cursor; no I/O is done until documents are fetched.
+        """
+        return AsyncCursor(self.collection.find(*args, **kwargs))
+
+    async def aggregate(self, *args, **kwargs) -> AsyncCursor:
+        """
+        Runs the aggregation (which hits the server straight away)
+        and returns the awaitable cursor over its results.
+        """
+        command_cursor = await run_in_database_executor(
+            self.collection.aggregate, *args, **kwargs)
+        return AsyncCursor(command_cursor)
+
+    def __getattr__(self, name: str) -> Callable[..., Any]:
+        if name not in self.AWAITABLE_METHODS:
+            raise AttributeError(f"'{name}' is not available asynchronously")
+
+        blocking_method = getattr(self.collection, name)
+
+        async def _awaitable_method(*args, **kwargs) -> Any:
+            return await run_in_database_executor(blocking_method, *args,
+                                                  **kwargs)
+
+        return _awaitable_method
+
+
+class AsyncDatabase:
+    """
+    Awaitable facade over a pymongo database; indexing it by name
+    returns an `AsyncCollection`.
+    """
+    def __init__(self, database: MongoDatabase):
+        self.database = database
+
+    def __getitem__(self, collection_name: str) -> AsyncCollection:
+        return AsyncCollection(self.database[collection_name])
+
+
 class Database:
     """
     Utility class that holds the main database client instance.
@@ -101,7 +328,13 @@ class Database:
         """
         self.client = MongoClient(DB_URI)
         self.database_name = _get_database_name_str()
-        self.__setup_database_indexes()
+        self.executor = ThreadPoolExecutor(
+            max_workers=DB_EXECUTOR_MAX_WORKERS,
+            thread_name_prefix="database-executor")
+        self.async_database = AsyncDatabase(self.client[self.database_name])
+        # taken before anything is created, so the startup check sees it all
+        self.startup_index_report = self.get_index_report()
+        self.__setup_database_indexes(self.startup_index_report)
 
     def get_database_client(self) -> MongoClient:
         """
@@ -109,10 +342,24 @@ class Database:
         """
         return self.client
 
+    def get_async_database(self) -> AsyncDatabase:
+        """
+        Returns the instance's awaitable database facade.
+        """
+        return self.async_database
+
+    def get_executor(self) -> ThreadPoolExecutor:
+        """
+        Returns the bounded executor that blocking database calls run on.
+        """
+        return self.executor
+
     def close_client_connection(self) -> None:
         """
-        Closes the client's connection to mongo.
+        Closes the client's connection to mongo, waiting
+        for the in-flight database calls to finish first.
         """
+        self.executor.shutdown(wait=True)
         self.client.close()
 
     def get_database_name(self) -> str:
@@ -158,80 +405,117 @@ class Database:
         """
         return "test" in self.database_name and _is_testing()
 
-    def __setup_database_indexes(self) -> None:
+    def get_startup_index_report(self) -> Dict[str, Dict[str, List[str]]]:
+        """
+        Returns the index report taken when the instance was created,
+        before any missing index was set up.
+        """
+        return self.startup_index_report
+
+    def get_index_report(self) -> Dict[str, Dict[str, List[str]]]:
         """
-        Sets up the database indexes for the unique fields.
+        Compares the indexes in the database against `INDEX_REGISTRY`.
 
-        If the indexes are set up already, does nothing, making
-        it safe to call multiple times.
+        Returns the names of the `missing`, `mismatched` (same name but a
+        different key or options) and `extra` indexes for every registered
+        collection (the default `_id_` index is ignored).
         """
-        indexes_dict = self.__get_index_command_dict()
         db_instance = self.client[self.database_name]
+        index_report = {}
+
+        for collection_name, index_models in INDEX_REGISTRY.items():
+            expected_indexes = {
+                model.document["name"]: model.document
+                for model in index_models
+            }
+            existing_indexes = db_instance[collection_name].index_information()
+            existing_indexes.pop("_id_", None)
+
+            mismatched_names = [
+                name for name in expected_indexes.keys()
+                & existing_indexes.keys()
+                if not _check_index_matches(expected_indexes[name],
+                                            existing_indexes[name])
+            ]
+            index_report[collection_name] = {
+                "missing":
+                sorted(expected_indexes.keys() - existing_indexes.keys()),
+                "mismatched": sorted(mismatched_names),
+                "extra":
+                sorted(existing_indexes.keys() - expected_indexes.keys()),
+            }
+
+        return index_report
+
+    def __setup_database_indexes(
+            self, index_report: Dict[str, Dict[str, List[str]]]) -> None:
+        """
+        Creates the indexes from `INDEX_REGISTRY` that are missing
+        according to the given report.
 
-        indexes_already_setup = self.__check_indexes_already_exist()
+        Indexes that are already set up are left alone, even mismatched
+        ones, since replacing them is a call for whoever runs the database.
+        """
+        db_instance = self.client[self.database_name]
 
-        if not indexes_already_setup:
-            for collection_name, index_models in indexes_dict.items():
-                db_instance[collection_name].create_indexes(index_models)
+        for collection_name, index_models in INDEX_REGISTRY.items():
+            missing_names = set(index_report[collection_name]["missing"])
+            models_to_create = [
+                model for model in index_models
+                if model.document["name"] in missing_names
+            ]
 
-    def __get_index_command_dict(self) -> Dict[str, IndexModel]:  # pylint: disable=no-self-use
-        """
-        Returns a dict with all of the collection names as keys and
-        their corresponding IndexModel.
+            if models_to_create:
+                db_instance[collection_name].create_indexes(models_to_create)
 
-        Can be iterated over to insert the correct indexes into the collections.
-        """
 
-        indexes_dict = {
-            "users": [IndexModel("email", unique=True)],
-        }
+def _get_index_spec(index_dict: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Returns what an index does (its key, text fields and options) from
+    either an `IndexModel` document or an `index_information()` entry.
 
-        return indexes_dict
+    The server stores a text index under the `_fts`/`_ftsx` fields with the
+    text fields in its weights, so text fields are compared on their own.
+    """
+    key_pairs = list(dict(index_dict["key"]).items())
+    weights = dict(index_dict.get("weights") or {}) or None
+
+    if any(field == "_fts" for field, _ in key_pairs):
+        text_fields = sorted(weights or {})
+    else:
+        text_fields = sorted(field for field, kind in key_pairs
+                             if kind == TEXT)
+
+    return {
+        "key": [(field, int(kind) if isinstance(kind, float) else kind)
+                for field, kind in key_pairs
+                if kind != TEXT and field not in ("_fts", "_ftsx")],
+        "text_fields": text_fields,
+        "weights": weights,
+        "options": {
+            option: index_dict[option]
+            for option in INDEX_SPEC_OPTIONS if index_dict.get(option)
+        },
+    }
+
+
+def _check_index_matches(expected_document: Dict[str, Any],
+                         existing_info: Dict[str, Any]) -> bool:
+    """
+    Checks if an index in the database does what the registered one does.
 
-    def __check_indexes_already_exist(self) -> bool:
-        """
-        Uses the database instance to check if all of the collection
-        indexes have been created
-        """
-        db_instance = self.client[self.database_name]
-        master_indexes_dict = self.__get_master_dict_of_indexes()
-
-        try:
-            for collection_name, index_dict in master_indexes_dict.items():
-                db_collection = db_instance[collection_name]
-                indexes_match = db_collection.index_information() == index_dict
-                assert indexes_match
-            return True
-        except AssertionError as _assert_error:
-            return False
-
-    def __get_master_dict_of_indexes(self) -> Dict[str, Any]:  # pylint: disable=no-self-use
-        """
-        Returns the dict object with all of the indexes that should be
-        in the collections.
-
-        Keys for the dict are collection names, and the values are
-        their indexes.
-
-        Used to verify that the indexes present in the database are
-        valid and match the spec.
-        """
-
-        indexes_dict = {
-            "users": {
-                '_id_': {
-                    'v': 2,
-                    'key': [('_id', 1)]
-                },
-                'email_1': {
-                    'v': 2,
-                    'unique': True,
-                    'key': [('email', 1)]
-                }
-            },
-        }
-
-        return indexes_dict
+    Text fields weigh 1 unless registered otherwise, and weights
+    are only compared when the server reports them.
+    """
+    expected_spec = _get_index_spec(expected_document)
+    existing_spec = _get_index_spec(existing_info)
+
+    if expected_spec["text_fields"] and not expected_spec["weights"]:
+        expected_spec["weights"] = dict.fromkeys(expected_spec["text_fields"],
+                                                 1)
+    if existing_spec["weights"] is None:
+        expected_spec["weights"] = None
+    return expected_spec == existing_spec
 
 
 # enforces singleton pattern behind the scenes
@@ -18,3 +18,67 @@ if not JWT_SECRET_KEY:
     raise Exception("Key Error: JWT_SECRET_KEY not set!")
 
 JWT_EXPIRY_TIME = 3000
+
+# size of the thread pool that blocking pymongo calls are offloaded onto;
+# matches pymongo's default connection pool size so no call waits on a socket
+DB_EXECUTOR_MAX_WORKERS = int(os.environ.get("DB_EXECUTOR_MAX_WORKERS", 100))
+
+# seconds between each bulk sweep moving events to `ongoing` and `expired`
+EVENT_STATUS_SWEEP_INTERVAL_SECONDS = int(
+    os.environ.get("EVENT_STATUS_SWEEP_INTERVAL_SECONDS", 60))
+
+# seconds the worker running the sweeper holds it's lease for; another worker
+# takes over the sweeps if the lease isn't renewed within this long
+EVENT_STATUS_SWEEPER_LEASE_SECONDS = int(
+    os.environ.get("EVENT_STATUS_SWEEPER_LEASE_SECONDS",
+                   EVENT_STATUS_SWEEP_INTERVAL_SECONDS * 3))
+
+# events fetched per database round trip while streaming the full event export
+EVENTS_EXPORT_BATCH_SIZE = int(os.environ.get("EVENTS_EXPORT_BATCH_SIZE", 500))
+
+# seconds public event listings (batch, location and search) stay cached,
+# how many each worker keeps in-process, and an optional Redis-compatible
+# server url to share them between every worker instead; with more than one
+# worker, writes only invalidate every worker's listings through Redis
+EVENT_RESPONSE_CACHE_TTL_SECONDS = int(
+    os.environ.get("EVENT_RESPONSE_CACHE_TTL_SECONDS", 30))
+EVENT_RESPONSE_CACHE_MAX_ENTRIES = int(
+    os.environ.get("EVENT_RESPONSE_CACHE_MAX_ENTRIES", 1024))
+EVENT_RESPONSE_CACHE_REDIS_URL = os.environ.get(
+    "EVENT_RESPONSE_CACHE_REDIS_URL")
+
+# seconds a user's token version is trusted in-process before being re-read,
+# i.e. how long a revoked token can still be accepted by other workers
+TOKEN_VERSION_CACHE_TTL_SECONDS = int(
+    os.environ.get("TOKEN_VERSION_CACHE_TTL_SECONDS", 30))
+
+# server worker processes (as set for gunicorn), which share the machine's cpus
+WEB_CONCURRENCY = max(int(os.environ.get("WEB_CONCURRENCY", 1)), 1)
+
+# processes bcrypt hashing runs on in each server worker (by default the cpus
+# split between every worker), and how many hashing calls may be running
+# or queued at once before new ones are turned away with a 429
+PASSWORD_HASHING_WORKERS = int(
+    os.environ.get("PASSWORD_HASHING_WORKERS",
+                   max((os.cpu_count() or 1) // WEB_CONCURRENCY, 1)))
+PASSWORD_HASHING_MAX_PENDING = int(
+    os.environ.get("PASSWORD_HASHING_MAX_PENDING",
+                   PASSWORD_HASHING_WORKERS * 8))
+
+# largest image upload accepted, in bytes; checked while the upload streams
+# into GridFS so oversized files are cut off without being read in whole
+IMAGE_UPLOAD_MAX_BYTES = int(
+    os.environ.get("IMAGE_UPLOAD_MAX_BYTES", 10 * 1024 * 1024))
+
+# processes resized copies of images are generated on in each server worker,
+# by default the cpus split between every worker
+IMAGE_RESIZING_WORKERS = int(
+    os.environ.get("IMAGE_RESIZING_WORKERS",
+                   max((os.cpu_count() or 1) // WEB_CONCURRENCY, 1)))
+
+# bytes of image data each worker keeps cached in memory, and the largest
+# single image (in bytes) that gets cached instead of streamed from GridFS
+IMAGE_CACHE_MAX_BYTES = int(
+    os.environ.get("IMAGE_CACHE_MAX_BYTES", 64 * 1024 * 1024))
+IMAGE_CACHE_MAX_ITEM_BYTES = int(
+    os.environ.get("IMAGE_CACHE_MAX_ITEM_BYTES", 2 * 1024 * 1024))
@@ -28,10 +28,19 @@ Admin User login
 """
 
 get_all_events_desc = """
-Returns all of the events in the queue event decision queue
+Returns a page of the events in the event decision queue, oldest start time
+first. Pass the returned `continuation_token` back to get the next page;
+it's only set when there's a next page to fetch.
 """
 get_all_events_summ = """
-Get all events to approve/deny
+Get a page of events to approve/deny
+"""
+
+count_events_queue_desc = """
+Returns how many events are waiting in the event decision queue
+"""
+count_events_queue_summ = """
+Count events to approve/deny
 """
 
 decide_event_desc = """
@@ -40,3 +49,21 @@ Given an event ID, lets the admin user decide the approval status of the event
 decide_event_summm = """
 Approve/Deny event by ID
 """
+
+decide_events_desc = """
+Given a list of event ID and approve/deny pairs, lets the admin user decide
+the approval status of many events at once. Returns the outcome of each
+decision in order: approved, denied, not_found, already_decided or duplicate
+"""
+decide_events_summ = """
+Approve/Deny many events by ID
+"""
+
+image_cache_stats_desc = """
+Returns the hit, miss and eviction counts of the in-memory image cache,
+along with how many images and bytes it currently holds. Every worker keeps
+it's own cache, so these only cover the worker that answered the request.
+"""
+image_cache_stats_summ = """
+Get image cache stats
+"""
@@ -9,7 +9,7 @@ Register event
 """
 
 events_by_location_desc = """
-Take in a user's location and a given mile radius and return all the events within that radius
+Take in a user's location and a given mile radius and return all the events within that radius, closest first
 """
 events_by_location_summ = """
 Get events within a given radius
@@ -46,14 +46,17 @@ Register event
 """
 
 events_by_location_desc = """
-Take in a user's location and a given mile radius and return all the events within that radius
+Take in a user's location and a given mile radius and return all the events within that radius, closest first
 """
 events_by_location_summ = """
 Get events within a given radius
 """
 
 get_event_desc = """
-Returns an event with a matching event ID
+Returns an event with a matching event ID.
+
+Send the returned `ETag` back in `If-None-Match` to get an empty 304
+instead if the event hasn't changed.
 """
 get_event_summ = """
 Get event by ID
@@ -67,7 +70,10 @@ Get event by ID and status
 """
 
 get_all_events_desc = """
-Returns all of the events in the database
+Returns all of the events in the database.
+
+Send `Accept: application/x-ndjson` to stream them instead, one JSON event
+per line, as they are read from the database.
 """
 get_all_events_summ = """
 Get all events
@@ -80,8 +86,17 @@ search_events_summ = """
 Search events
 """
 
+bulk_get_events_desc = """
+Returns the events for a list of up to 100 event IDs in one request, e.g. the IDs in a user's `events_visible`.
+Events are in the same order as the IDs sent; IDs that don't match an event are listed in `missing_ids`.
+"""
+bulk_get_events_summ = """
+Get events by IDs
+"""
+
 batch_query_desc = """
 Batch query for events by single datetime, datetime range, or list of tag filters.
+Results are ordered by start time; pass the returned `continuation_token` back to get the next page.
 """
 batch_query_summ = """
 Batch Event Query
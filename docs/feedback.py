@@ -14,8 +14,22 @@ Delete feedback
 """
 
 get_feedback_by_id_desc = """
-Returns data of matching feedback queried by ID
+Returns data of matching feedback queried by ID.
+
+Send the returned `ETag` back in `If-None-Match` to get an empty 304
+instead if the feedback hasn't changed.
 """
 get_feedback_by_id_summ = """
 Get Feedback by ID
 """
+
+get_event_feedback_desc = """
+Returns a page of the feedback on an event, oldest first.
+
+Pass the `continuation_token` from a response to get the page after it;
+it's only present when there are more pages. `limit` sets the page size
+(20 by default, 100 at most). Pages can be revalidated with `If-None-Match`.
+"""
+get_event_feedback_summ = """
+Get Feedback for Event
+"""
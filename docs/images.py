@@ -1,13 +1,43 @@
 # pylint: skip-file
 image_upload_desc = """
 Inserts the image to the image database.
+
+The upload is streamed into the database as it's read; data that doesn't
+start with a valid image header is rejected with a 422, and uploads over
+the maximum size (10MB by default) with a 413.
+
+Uploading data that was already uploaded returns a new image ID, but the
+data itself is only stored once.
 """
 image_upload_summ = """
 Upload Image
 """
 
+image_delete_desc = """
+Deletes the image by ID. Only the user who uploaded the image can delete it,
+anyone else gets a 401.
+
+Images uploaded with the same data share a single stored copy of it, which
+(along with it's resized copies) is only deleted along with the last image
+pointing to it.
+"""
+image_delete_summ = """
+Delete Image
+"""
+
 image_query_desc = """
-Queries the image by ID and returns the image data.
+Queries the image by ID and streams back the image data.
+
+Responses carry an `ETag` and `Cache-Control` header; sending the ETag back
+in `If-None-Match` returns an empty 304 if the image hasn't changed.
+The ETag of an uploaded image is the SHA-256 hash of it's data, and since
+that can never change under the same ID, it's cached as immutable.
+A single `Range: bytes=start-end` header returns only those bytes with a 206.
+
+Passing `size` (128, 512 or 1024) returns a copy of the image shrunk so that
+it's longest side fits in that many pixels, generated the first time it's
+asked for. Resized copies are sent as WebP if the `Accept` header allows it,
+else as JPEG.
 """
 image_query_summ = """
 Get Image By ID
@@ -10,13 +10,39 @@
 """
 Data Class for JWT Token Operations
 """
+from enum import auto
 from datetime import datetime, timedelta
-from typing import Optional, Any, Dict
+from typing import Optional, Any, Dict, Union
 import jwt
+from pydantic import BaseModel, Extra
 
+import models.commons as common_models
 from config.main import JWT_SECRET_KEY, JWT_EXPIRY_TIME
 
 
+class TokenError(common_models.AutoName):
+    """
+    The reasons a token string can fail verification.
+    """
+    expired = auto()
+    invalid = auto()
+
+
+class TokenClaims(BaseModel):
+    """
+    The verified payload of a token. Claims other than the ones
+    declared here are kept as extra fields.
+    """
+    user_id: Optional[common_models.UserId] = None
+    # both missing on tokens minted before they were added to the claims
+    user_type: Optional[str] = None
+    token_version: Optional[int] = None
+    exp: int
+
+    class Config:
+        extra = Extra.allow
+
+
 class Token:
     """
     Main top-level Token Class. Holds the static methods
@@ -24,6 +50,26 @@ class Token:
     depending on if it is an encoded string or a payload
     dict.
     """
+    @staticmethod
+    def verify(encoded_token_str: str) -> Union[TokenClaims, TokenError]:
+        """
+        Decodes and verifies the token string exactly once.
+
+        Returns the token claims if the token is valid and not expired,
+        else the `TokenError` saying why it isn't.
+        """
+        try:
+            payload_dict = jwt.decode(encoded_token_str,
+                                      JWT_SECRET_KEY,
+                                      algorithms=["HS256"])
+        except jwt.exceptions.ExpiredSignatureError:
+            return TokenError.expired
+        except jwt.exceptions.InvalidTokenError:
+            return TokenError.invalid
+
+        # the signature was just verified, so the payload can be trusted
+        return TokenClaims.construct(**payload_dict)
+
     @staticmethod
     def get_dict_from_enc_token_str(encoded_token_str: str) -> Dict[Any, Any]:
         """
@@ -31,15 +77,10 @@ class Token:
         it is both not expired and valid before doing so.
         Returns a dict.
         """
-        valid = Token.check_if_valid(encoded_token_str)
-        is_expired = Token.check_if_expired(encoded_token_str)
-        if valid and not is_expired:
-            payload_dict = jwt.decode(encoded_token_str,
-                                      JWT_SECRET_KEY,
-                                      algorithms=["HS256"])
-        else:
-            payload_dict = {'Error:', 'not valid'}
-        return payload_dict
+        claims = Token.verify(encoded_token_str)
+        if isinstance(claims, TokenError):
+            return {'Error:', 'not valid'}
+        return claims.dict(exclude_unset=True)
 
     @staticmethod
     def get_enc_token_str_from_dict(
@@ -72,24 +113,13 @@ class Token:
     @staticmethod
     def check_if_expired(encoded_token_str: str) -> bool:
         """
-        Tries to decode an encoded string
-        and checks if it raises the expiry error.
+        Checks if the encoded string fails verification for being expired.
         """
-        try:
-            jwt.decode(encoded_token_str, JWT_SECRET_KEY, algorithms=["HS256"])
-            return False
-        except jwt.ExpiredSignatureError:
-            return True
+        return Token.verify(encoded_token_str) is TokenError.expired
 
     @staticmethod
     def check_if_valid(encoded_token_str: str) -> bool:
         """
-        Tries to decode an encoded string
-        and checks if it raises any invalid errors.
+        Checks if the encoded string passes verification.
         """
-        try:
-            jwt.decode(encoded_token_str, JWT_SECRET_KEY, algorithms=["HS256"])
-            return True
-        except (jwt.exceptions.DecodeError, jwt.exceptions.InvalidTokenError,
-                jwt.exceptions.ExpiredSignatureError):
-            return False
+        return not isinstance(Token.verify(encoded_token_str), TokenError)
@@ -4,6 +4,8 @@
 #       - pydantic validators use cls instead of self; theyre not instance based
 # pylint: disable=no-name-in-module
 #       - Need to whitelist pydantic locally
+# pylint: disable=unsubscriptable-object
+#       - pylint bug with optional
 """
 Holds common modeling classes or utility functions that can be used
 in any single module in `models/`.
@@ -12,12 +14,16 @@ Any function that achieves the same goal but is written more than once should
 be in this file instead and imported when needed.
 """
 
+import base64
+import binascii
 from enum import Enum
 from uuid import uuid4
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from datetime import datetime
 
-from pydantic import BaseModel, validator, Field
+from pydantic import BaseModel, ValidationError, validator, Field
+
+from models import exceptions
 
 # Type aliases
 EventId = str
@@ -101,3 +107,67 @@ class ExtendedBaseModel(BaseModel):
         parent_dict = super().dict(*args, **kwargs)
         parent_dict["_id"] = self.get_id()
         return parent_dict
+
+
+class VersionedBaseModel(ExtendedBaseModel):
+    """
+    `ExtendedBaseModel` for documents that keep track of their writes.
+
+    `updated_at` and `version` are set on insert through `mark_written`, and
+    every update in `util/` moves them along with `add_write_stamp`. Documents
+    written before these fields existed read them as `None` and `0`.
+    """
+    updated_at: Optional[datetime] = None
+    version: int = 0
+
+    def mark_written(self) -> None:
+        """
+        Stamps the instance as written right now, just before inserting it.
+        """
+        self.updated_at = datetime.utcnow()
+        self.version += 1
+
+
+def add_write_stamp(update_dict: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Returns a copy of the mongo update dict that also sets the document's
+    `updated_at` to now and bumps it's `version`.
+    """
+    stamped_update_dict = dict(update_dict)
+    stamped_update_dict["$set"] = {
+        **update_dict.get("$set", {}), "updated_at": datetime.utcnow()
+    }
+    stamped_update_dict["$inc"] = {**update_dict.get("$inc", {}), "version": 1}
+    return stamped_update_dict
+
+
+class ContinuationToken(BaseModel):
+    """
+    Position of the last document of a page, handed to the client as an
+    opaque string so it can ask for the page right after it.
+
+    Paginated queries sort by a datetime field and then by `_id`, so both
+    values are needed to resume without skipping or repeating documents.
+    """
+    last_id: str
+    last_date_time: Optional[datetime] = None
+
+    def encode(self) -> str:
+        """
+        Returns the url-safe, opaque string form of the token.
+        """
+        return base64.urlsafe_b64encode(self.json().encode()).decode()
+
+    @classmethod
+    def decode(cls, encoded_token_str: str) -> 'ContinuationToken':
+        """
+        Parses a string made by `encode` back into a token,
+        raising a 422 if it is malformed.
+        """
+        try:
+            token_json = base64.urlsafe_b64decode(encoded_token_str.encode())
+            return cls.parse_raw(token_json)
+        except (binascii.Error, ValueError, ValidationError) as token_error:
+            detail = "Invalid or malformed continuation token"
+            raise exceptions.InvalidDataException(
+                detail=detail) from token_error
@@ -17,12 +17,18 @@ These models should be the only places where raw input/output data is changed.
 import random
 from enum import auto
 from datetime import datetime, timedelta
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Union, Protocol
 
-from pydantic import BaseModel, validator
+from pydantic import BaseModel, Field, validator
 import models.images as image_models
 import models.commons as common_models
 
+# most event ids that can be fetched at once through the bulk query
+BULK_EVENT_QUERY_MAX_IDS = 100
+
+# most approval decisions an admin can send at once
+BULK_EVENT_APPROVAL_MAX_ITEMS = 500
+
 EventId = common_models.EventId
 
 
@@ -59,6 +65,19 @@ class EventStatusEnum(common_models.AutoName):
     expired = auto()
 
 
+class EventSchedule(Protocol):
+    """
+    Anything carrying an event's status and dates, like an `Event` or an
+    `EventQueryResponse` built straight from a database document.
+
+    The status is usually it's name, since that's how it's stored, but
+    models built in code may still hold the enum member itself.
+    """
+    status: Union[str, EventStatusEnum]
+    date_time_start: datetime
+    date_time_end: datetime
+
+
 class Location(BaseModel):
     """
     Simple tuple-like to group (lat, long) into a logical pairing.
@@ -68,7 +87,25 @@ class Location(BaseModel):
     longitude: float
 
 
-class Event(common_models.ExtendedBaseModel):
+class GeoJsonPoint(BaseModel):
+    """
+    GeoJSON rendition of a `Location`, stored next to it in the database
+    so that location queries can be answered by the `2dsphere` index.
+
+    Keep in mind that GeoJSON orders coordinates as (long, lat).
+    """
+    type: str = "Point"
+    coordinates: List[float]
+
+    @classmethod
+    def from_location(cls, location: Location) -> 'GeoJsonPoint':
+        """
+        Returns the GeoJSON point for the given location.
+        """
+        return cls(coordinates=[location.longitude, location.latitude])
+
+
+class Event(common_models.VersionedBaseModel):
     """
     Main Event model that should have a 1:1 correlation with the database
     rendition of an event.
@@ -91,6 +128,19 @@ class Event(common_models.ExtendedBaseModel):
     image_ids: List[image_models.ImageId] = []
     creator_id: common_models.UserId
     approval: EventApprovalEnum = EventApprovalEnum.unapproved
+    location_point: Optional[GeoJsonPoint] = None
+
+    @validator("location_point", pre=True, always=True)
+    def set_location_point(cls: 'Event', _value: Any,
+                           values: Dict[str, Any]) -> Optional[GeoJsonPoint]:
+        """
+        Always derives the GeoJSON point from the `location` field
+        so the two can never drift apart.
+        """
+        location = values.get("location")
+        if not location:
+            return None
+        return GeoJsonPoint.from_location(location)
 
 
 class EventRegistrationForm(BaseModel):
@@ -162,6 +212,34 @@ class EventQueryResponse(BaseModel):
     creator_id: common_models.UserId
     event_id: EventId
 
+    @classmethod
+    def get_projection_dict(cls) -> Dict[str, bool]:
+        """
+        Returns the database projection for only the fields this model needs.
+
+        `event_id` is read from the `_id` field, which is always returned.
+        """
+        return {
+            field_name: True
+            for field_name in cls.__fields__
+            if field_name != "event_id"
+        }
+
+    @classmethod
+    def from_database_document(
+            cls, document: Dict[str, Any]) -> "EventQueryResponse":
+        """
+        Builds the response from a (projected) event document without
+        running validation, since documents were already validated as
+        `Event` models on their way into the database.
+        """
+        field_values = {
+            field_name: document[field_name]
+            for field_name in cls.__fields__
+            if field_name in document
+        }
+        return cls.construct(**field_values, event_id=document["_id"])
+
 
 class ListOfEvents(BaseModel):
     """
@@ -196,6 +274,82 @@ class AllEventsQueryResponse(ListOfEvents):
     """
 
 
+class ApprovalQueueResponse(ListOfEvents):
+    """
+    Returns a page of the events waiting for an approval decision.
+
+    `continuation_token` is only set when there's a next page to fetch.
+    """
+    continuation_token: Optional[str] = None
+
+
+class ApprovalQueueCountResponse(BaseModel):
+    """
+    Returns how many events are waiting for an approval decision.
+    """
+    count: int
+
+
+class BulkEventQueryForm(BaseModel):
+    """
+    Form holding the ids of the events to fetch at once.
+    """
+    event_ids: List[EventId] = Field(...,
+                                     min_items=1,
+                                     max_items=BULK_EVENT_QUERY_MAX_IDS)
+
+
+class BulkEventQueryResponse(ListOfEvents):
+    """
+    Returns the events found for a bulk query, in the order their ids
+    were asked for, along with the ids that didn't match any event.
+    """
+    missing_ids: List[EventId] = []
+
+
+class EventApprovalDecision(BaseModel):
+    """
+    An admin's decision to approve (or deny) a single event.
+    """
+    event_id: EventId
+    approve: bool
+
+
+class BulkEventApprovalForm(BaseModel):
+    """
+    Form holding many approval decisions to be applied at once.
+    """
+    decisions: List[EventApprovalDecision] = Field(
+        ..., min_items=1, max_items=BULK_EVENT_APPROVAL_MAX_ITEMS)
+
+
+class EventApprovalOutcomeEnum(common_models.AutoName):
+    """
+    What happened to a single decision in a bulk approval.
+    """
+    approved = auto()
+    denied = auto()
+    not_found = auto()
+    already_decided = auto()
+    duplicate = auto()
+
+
+class EventApprovalOutcome(BaseModel):
+    """
+    The outcome of the decision on a single event.
+    """
+    event_id: EventId
+    outcome: EventApprovalOutcomeEnum
+
+
+class BulkEventApprovalResponse(BaseModel):
+    """
+    Returns the outcome of every decision in a bulk approval,
+    in the order they were sent.
+    """
+    outcomes: List[EventApprovalOutcome]
+
+
 class CancelEventForm(BaseModel):
     """
     Form that represents an event cancellation.
@@ -211,16 +365,23 @@ class EventSearchResponse(ListOfEvents):
 
 class EventSearchForm(BaseModel):
     """
-    Form that represents values inputed for a search
+    Form that represents values inputed for a search.
+
+    Results are ranked by relevance, and paged through with `limit`/`offset`.
     """
     keyword: str
+    limit: int = Field(20, ge=1, le=100)
+    offset: int = Field(0, ge=0)
 
 
 class BatchEventQueryResponse(ListOfEvents):
     """
     Returns the list of events queried from the batch event
     query endpoint.
+
+    `continuation_token` is only set when there's a next page to fetch.
     """
+    continuation_token: Optional[str] = None
 
 
 class DateRange(common_models.CustomBaseModel):
@@ -241,6 +402,7 @@ class BatchEventQueryModel(common_models.CustomBaseModel):
     query_date: Optional[datetime] = datetime.today() - timedelta(hours=4)
     query_date_range: Optional[DateRange]
     event_tag_filter: Optional[List[EventTagEnum]] = []
-    limit: Optional[int] = 5
-    index: Optional[int] = 0
+    limit: int = Field(5, ge=1, le=100)
+    index: int = Field(0, ge=0)
+    continuation_token: Optional[str] = None
     
\ No newline at end of file
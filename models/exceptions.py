@@ -30,6 +30,26 @@ class UserNotFoundException(HTTPException):
         super().__init__(status_code=404, detail=detail)
 
 
+class PayloadTooLargeException(HTTPException):
+    """
+    Raised when an upload is bigger than the maximum size allowed.
+    """
+    def __init__(self, detail: Optional[str] = None):
+        if not detail:
+            detail = "Uploaded data is too large"
+        super().__init__(status_code=413, detail=detail)
+
+
+class RangeNotSatisfiableException(HTTPException):
+    """
+    Raised when the `Range` asked for lies outside of the file.
+    """
+    def __init__(self, detail: Optional[str] = None):
+        if not detail:
+            detail = "Requested range not satisfiable"
+        super().__init__(status_code=416, detail=detail)
+
+
 class ImageNotFoundException(HTTPException):
     """
     Default exception for a 404 on images.
@@ -119,3 +139,14 @@ class DatabaseError(HTTPException):
         if not detail:
             detail = "Database error"
         super().__init__(status_code=500, detail=detail)
+
+
+class ServiceBusyException(HTTPException):
+    """
+    Raised when a bounded resource (e.g. the password hashing pool)
+    is saturated, telling the client to retry later with a 429.
+    """
+    def __init__(self, detail: Optional[str] = None):
+        if not detail:
+            detail = "Server is busy, try again later"
+        super().__init__(status_code=429, detail=detail)
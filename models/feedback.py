@@ -5,6 +5,9 @@
 """
 Holds the (small) models for feedback object to be tied to an event.
 """
+from datetime import datetime
+from typing import List, Optional
+
 from pydantic import BaseModel
 import models.commons as common_models
 import models.users as user_models
@@ -12,14 +15,18 @@ import models.users as user_models
 FeedbackId = str
 
 
-class Feedback(common_models.ExtendedBaseModel):
+class Feedback(common_models.VersionedBaseModel):
     """
     Holds the very simple feedback model that will be
     indexed by ID in an event.
+
+    `created_at` orders an event's feedback and is set on registration;
+    feedback written before it existed reads it as `None` and is listed first.
     """
     event_id: str
     comment: str
     creator_id: user_models.UserId
+    created_at: Optional[datetime] = None
 
 
 class FeedbackQueryResponse(BaseModel):
@@ -31,6 +38,24 @@ class FeedbackQueryResponse(BaseModel):
     creator_id: user_models.UserId
 
 
+class FeedbackListItem(FeedbackQueryResponse):
+    """
+    Public facing data for a single piece of feedback in a list,
+    along with it's id.
+    """
+    feedback_id: FeedbackId
+
+
+class EventFeedbackListResponse(BaseModel):
+    """
+    A page of the feedback on an event.
+
+    `continuation_token` is only set when there's a next page to fetch.
+    """
+    feedback: List[FeedbackListItem]
+    continuation_token: Optional[str] = None
+
+
 class FeedbackRegistrationRequest(BaseModel):
     """
     Client facing registration form for feedback.
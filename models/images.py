@@ -1,10 +1,131 @@
+# pylint: disable=unsubscriptable-object
+#       - pylint bug with optional
 """
 Holds models for image operations
 """
+from enum import IntEnum, auto
+from typing import Dict, Optional
 from pydantic import BaseModel
 
+from models.commons import AutoName, ExtendedBaseModel, UserId
+
 ImageId = str
 
 
+class ImageSizeEnum(IntEnum):
+    """
+    Sizes (in pixels, along the longest side) that resized
+    copies of an image can be asked for in.
+    """
+    SMALL = 128
+    MEDIUM = 512
+    LARGE = 1024
+
+
+class ImageFormatEnum(AutoName):
+    """
+    Formats resized copies of an image are encoded in.
+    Values double as the PIL format names.
+    """
+    WEBP = auto()
+    JPEG = auto()
+
+    def get_media_type(self) -> str:
+        """
+        Returns the MIME type for images in this format.
+        """
+        return f"image/{self.value.lower()}"  # pylint: disable=no-member
+
+
+class StoredImage(ExtendedBaseModel):
+    """
+    Maps an image id onto the content it was uploaded with: the SHA-256
+    hash of the image data and the id of the GridFS file holding it.
+
+    Images uploaded before content hashing have no hash, and are
+    stored as a GridFS file with the same id as the image.
+
+    `uploader_id` is the user who uploaded the image, and the only one
+    who can delete it; images uploaded before it was kept have none.
+    """
+    content_hash: Optional[str] = None
+    file_id: str
+    uploader_id: Optional[UserId] = None
+
+    def get_content_key(self) -> str:
+        """
+        Returns the key resized copies of the image are stored under,
+        shared by every image with the same content.
+        """
+        return self.content_hash or self.get_id()
+
+
+class ImageContent(ExtendedBaseModel):
+    """
+    A single stored copy of some image data, keyed by it's SHA-256 hash,
+    along with the amount of images pointing to it.
+    """
+    file_id: str
+    ref_count: int = 0
+
+
+class CachedImage(BaseModel):
+    """
+    An image's data held in memory, along with the headers
+    it's served with.
+    """
+    data: bytes
+    content_type: Optional[str] = None
+    headers: Dict[str, str]
+
+    @property
+    def length(self) -> int:
+        """
+        Size of the image data in bytes, same as `GridOut.length`.
+        """
+        return len(self.data)
+
+
+def get_derivative_image_id(content_key: str, size: ImageSizeEnum,
+                            image_format: ImageFormatEnum) -> ImageId:
+    """
+    Returns the id a resized copy of the image content is stored under.
+    """
+    return f"{content_key}_{size.value}.{image_format.value.lower()}"
+
+
 class ImageUploadResponse(BaseModel):
     image_id: ImageId
+
+
+class ImageCacheStatsResponse(BaseModel):
+    """
+    Hit/miss metrics and current size of a worker's image cache.
+    """
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+    bytes: int
+
+
+class ByteRange(BaseModel):
+    """
+    An inclusive range of bytes within a file of `total_length` bytes,
+    as asked for by a `Range` request header.
+    """
+    start: int
+    end: int
+    total_length: int
+
+    def get_length(self) -> int:
+        """
+        Returns the amount of bytes in the range.
+        """
+        return self.end - self.start + 1
+
+    def get_content_range_header(self) -> str:
+        """
+        Returns the `Content-Range` header value for the range.
+        """
+        return f"bytes {self.start}-{self.end}/{self.total_length}"
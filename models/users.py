@@ -39,12 +39,37 @@ def validate_password(password: str) -> str:
     return password
 
 
+def hash_password(password: str) -> str:
+    """
+    Returns the stored form of the password: the string
+    representation of it's bcrypt hash.
+    """
+    encoded_new_pass = password.encode('utf-8')
+
+    hashed_pass = bcrypt.hashpw(encoded_new_pass, bcrypt.gensalt())
+    return str(hashed_pass)
+
+
+def check_password_matches(password_to_check: str,
+                           stored_password: str) -> bool:
+    """
+    Checks if the password matches the stored form of a password
+    and returns a boolean.
+    """
+    pass_to_check = password_to_check.encode('utf-8')
+
+    # XXX: awful code! get rid of asap!
+    user_pass = stored_password[2:-1].encode('utf-8')
+    passwords_match = bcrypt.checkpw(pass_to_check, user_pass)
+    return passwords_match
+
+
 class UserTypeEnum(common_models.AutoName):
     PUBLIC_USER = auto()
     ADMIN = auto()
 
 
-class User(common_models.ExtendedBaseModel):
+class User(common_models.VersionedBaseModel):
     """
     Main top-level user model. Should hold only enough data to be useful,
     as any more can become painful to deal with due to privacy etc.
@@ -59,28 +84,20 @@ class User(common_models.ExtendedBaseModel):
     events_created: List[str] = []  # FIXME: this should be truly annotated
     events_archived: Optional[List[common_models.EventId]] = []
     user_links: List[AnyUrl] = []
+    # bumped to revoke every token minted before, e.g. on password changes
+    token_version: int = 0
 
     def set_password(self, new_password: str) -> None:
         """
         Sets a hashed password for user using bcrypt
         """
-        encoded_new_pass = new_password.encode('utf-8')
-
-        hashed_pass = bcrypt.hashpw(encoded_new_pass, bcrypt.gensalt())
-        self.password = str(hashed_pass)
+        self.password = hash_password(new_password)
 
     def check_password(self, password_to_check: str) -> bool:
         """
         Checks if value matches the user's password and returns a boolean
         """
-        pass_to_check = password_to_check.encode('utf-8')
-        user_pass = self.password.encode('utf-8')
-
-        # XXX: awful code! get rid of asap!
-        if isinstance(self.password, str):
-            user_pass = self.password[2:-1].encode('utf-8')
-        passwords_match = bcrypt.checkpw(pass_to_check, user_pass)
-        return passwords_match
+        return check_password_matches(password_to_check, self.password)
 
     def get_id(self) -> UserId:
         """
@@ -1,3 +1,5 @@
+# pylint: disable=unsubscriptable-object
+#       - this is actually a pylint bug that hasn't been resolved.
 """
 Endpoints for admin only calls.
 
@@ -5,16 +7,24 @@ These endpoints overlap heavily with the `user` endpoints,
 but have different schemas and should be logically/physically
 separated so as to never have a data or logic mix.
 """
-from fastapi import APIRouter, Depends
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query
 from models import users as models
 from models import events as events_model
+from models import images as images_model
 from docs import admin as docs
 from util import users as utils
 from util import auth as auth_utils
 from util import events as event_utils
+from util.image_cache import IMAGE_CACHE
 
 router = APIRouter()
 
+# page size bounds for the approval queue
+APPROVAL_QUEUE_DEFAULT_LIMIT = 20
+APPROVAL_QUEUE_MAX_LIMIT = 100
+
 
 @router.post(
     "/admin/register",
@@ -64,19 +74,39 @@ async def login_user(login_form: models.UserLoginForm):
 
 
 @router.get("/admin/events_queue",
-            response_model=events_model.AllEventsQueryResponse,
+            response_model=events_model.ApprovalQueueResponse,
             description=docs.get_all_events_desc,
             summary=docs.get_all_events_summ,
             tags=["Admin"],
             status_code=200)
-async def get_all_events_in_queue(admin_id_str: str = Depends(
+async def get_all_events_in_queue(
+        limit: int = Query(APPROVAL_QUEUE_DEFAULT_LIMIT,
+                           ge=1,
+                           le=APPROVAL_QUEUE_MAX_LIMIT),
+        continuation_token: Optional[str] = None,
+        admin_id_str: str = Depends(auth_utils.check_header_token_is_admin)):
+    """
+    Endpoint for returning events in the queue, one page at a time.
+    """
+    del admin_id_str  # unused var
+    return await event_utils.get_events_to_approve_page(
+        limit, continuation_token)
+
+
+@router.get("/admin/events_queue/count",
+            response_model=events_model.ApprovalQueueCountResponse,
+            description=docs.count_events_queue_desc,
+            summary=docs.count_events_queue_summ,
+            tags=["Admin"],
+            status_code=200)
+async def count_events_in_queue(admin_id_str: str = Depends(
     auth_utils.check_header_token_is_admin)):
     """
-    Endpoint for returning events in the queue.
+    Endpoint for returning how many events are in the queue.
     """
     del admin_id_str  # unused var
-    events = await event_utils.get_list_events_to_approve()
-    return events
+    count = await event_utils.count_events_to_approve()
+    return events_model.ApprovalQueueCountResponse(count=count)
 
 
 @router.get("/admin/decide_event",
@@ -94,3 +124,36 @@ async def approve_or_deny_event(approve_bool: bool,
     """
     del admin_id_str  # unused var
     await event_utils.change_event_approval(event_id, approve_bool)
+
+
+@router.post("/admin/decide_events",
+             response_model=events_model.BulkEventApprovalResponse,
+             description=docs.decide_events_desc,
+             summary=docs.decide_events_summ,
+             tags=["Admin"],
+             status_code=200)
+async def approve_or_deny_events(form: events_model.BulkEventApprovalForm,
+                                 admin_id_str: str = Depends(
+                                     auth_utils.check_header_token_is_admin)):
+    """
+    Applies many approve/deny decisions at once, returning the
+    outcome of each one.
+    """
+    del admin_id_str  # unused var
+    return await event_utils.decide_events_approval(form.decisions)
+
+
+@router.get("/admin/image_cache/stats",
+            response_model=images_model.ImageCacheStatsResponse,
+            description=docs.image_cache_stats_desc,
+            summary=docs.image_cache_stats_summ,
+            tags=["Admin"],
+            status_code=200)
+async def get_image_cache_stats(admin_id_str: str = Depends(
+    auth_utils.check_header_token_is_admin)):
+    """
+    Endpoint for returning the image cache metrics of the worker
+    that serves the request.
+    """
+    del admin_id_str  # unused var
+    return images_model.ImageCacheStatsResponse(**IMAGE_CACHE.get_stats())
@@ -1,3 +1,5 @@
+# pylint: disable=unsubscriptable-object
+#       - this is actually a pylint bug that hasn't been resolved.
 """
 FastAPI endpoint handlers for code related to events.
 
@@ -6,8 +8,9 @@ data handling as possible, handing it off to the handler in `util/` as soon
 as possible.
 """
 import logging
-from typing import Any
-from fastapi import APIRouter, Depends
+from typing import Any, Dict, Optional
+from fastapi import APIRouter, Depends, Header
+from fastapi.responses import StreamingResponse, Response
 
 from models import events as models
 from docs import events as docs
@@ -15,6 +18,7 @@ from util import events as utils
 import models.commons as common_models
 
 import util.auth as auth_utils
+import util.http_cache as http_cache_utils
 
 router = APIRouter()
 
@@ -53,22 +57,45 @@ async def register_event(
             description=docs.get_event_desc,
             summary=docs.get_event_summ,
             tags=["Events"],
-            status_code=201)
+            status_code=200)
 async def get_event(
     event_id,
-    optional_user_id: str = Depends(
-        auth_utils.get_user_id_from_optional_token_header_check_existence)):
+    if_none_match: Optional[str] = Header(None),
+    _optional_token_payload: Optional[Dict[str, Any]] = Depends(
+        auth_utils.get_payload_from_optional_token_header)):
     """
     Simplest query endpoint that queries the database for a single event with
     a matching `event_id`.
+
+    Read-only, so it's a single indexed read; answers with a 304 if the
+    client's cached copy is still good.
+
+    The token is optional, but if one is sent it must be valid. It's only
+    decoded, never looked up, so the user isn't read.
     """
-    found_event = await utils.get_event_by_id(event_id,
-                                              user_id=optional_user_id)
+    found_event = await utils.get_event_by_id(event_id)
 
     event_id = found_event.get_id()
     event_data = found_event.dict()
 
-    return models.EventQueryResponse(**event_data, event_id=event_id)
+    event_response = models.EventQueryResponse(**event_data, event_id=event_id)
+    return await http_cache_utils.get_conditional_json_response(
+        event_response, if_none_match, found_event.updated_at)
+
+
+@router.post(
+    "/events/get/bulk",
+    response_model=models.BulkEventQueryResponse,
+    description=docs.bulk_get_events_desc,
+    summary=docs.bulk_get_events_summ,
+    tags=["Events"],
+    status_code=200,
+)
+async def bulk_get_events(form: models.BulkEventQueryForm):
+    """
+    Queries the database for every event in a list of ids at once.
+    """
+    return await utils.get_events_by_ids(form.event_ids)
 
 
 @router.get(
@@ -104,8 +131,8 @@ async def events_by_location(lat: float, lon: float, radius: float = 10.0):
     Should return all of the events that are within the given search radius.
     """
     origin = (lat, lon)
-    valid_events = await utils.events_by_location(origin, radius)
-    return valid_events
+    response_json = await utils.get_events_by_location_json(origin, radius)
+    return Response(response_json, media_type="application/json")
 
 
 @router.get("/events/find/all",
@@ -114,10 +141,17 @@ async def events_by_location(lat: float, lon: float, radius: float = 10.0):
             summary=docs.get_all_events_summ,
             tags=["Events"],
             status_code=200)
-async def get_all_events():
+async def get_all_events(accept: Optional[str] = Header(None)):
     """
     Endpoint for returning ALL events in the database without any filter.
+
+    Streams the events as NDJSON instead if the client accepts it.
     """
+    if await utils.check_accept_wants_ndjson(accept):
+        return StreamingResponse(utils.iterate_all_events_as_ndjson(),
+                                 media_type=utils.NDJSON_MEDIA_TYPE,
+                                 headers={"Vary": "Accept"})
+
     events = await utils.get_all_events()
     return events
 
@@ -146,8 +180,8 @@ async def cancel_event(
     status_code=200,
 )
 async def search_events(form: models.EventSearchForm):
-    events = await utils.search_events(form)
-    return events
+    response_json = await utils.get_search_events_json(form)
+    return Response(response_json, media_type="application/json")
 
 
 @router.post(
@@ -160,8 +194,8 @@ async def search_events(form: models.EventSearchForm):
 )
 async def batch_query_events(query_form: models.BatchEventQueryModel):
     await log_endpoint("Event batch get form:", query_form)
-    event_response_form = await utils.batch_event_query(query_form)
-    return event_response_form
+    response_json = await utils.get_batch_event_query_json(query_form)
+    return Response(response_json, media_type="application/json")
 
 
 async def log_endpoint(message: str, data: Any) -> None:
@@ -1,3 +1,5 @@
+# pylint: disable=unsubscriptable-object
+#       - this is actually a pylint bug that hasn't been resolved.
 """
 Endpoints for feedback operations.
 
@@ -9,11 +11,14 @@ actual union of events and feedback to code in `util/` files to remain
 flexible and have this code be implementation-agnostic.
 """
 
-from fastapi import APIRouter, Depends
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query, Header
 
 from docs import feedback as docs
 import util.feedback as utils
 import util.auth as auth_utils
+import util.http_cache as http_cache_utils
 from models import exceptions
 from models import commons as common_models
 from models import feedback as feedback_models
@@ -21,6 +26,10 @@ from models import feedback as feedback_models
 router = APIRouter()
 ROUTER_TAG = "Feedback"
 
+# page size bounds for listing an event's feedback
+EVENT_FEEDBACK_DEFAULT_LIMIT = 20
+EVENT_FEEDBACK_MAX_LIMIT = 100
+
 
 @router.delete(
     "/feedback/delete",
@@ -75,9 +84,35 @@ async def add_feedback(
             summary=docs.get_feedback_by_id_summ,
             tags=[ROUTER_TAG],
             status_code=200)
-async def get_feedback(feedback_id: common_models.FeedbackId):
+async def get_feedback(feedback_id: common_models.FeedbackId,
+                       if_none_match: Optional[str] = Header(None)):
     """
     Endpoint to query a feedback by ID.
     """
-    feedback_data = await utils.get_feedback(feedback_id)
-    return feedback_models.FeedbackQueryResponse(**feedback_data)
+    feedback = await utils.get_feedback(feedback_id)
+    feedback_response = feedback_models.FeedbackQueryResponse(
+        **feedback.dict())
+    return await http_cache_utils.get_conditional_json_response(
+        feedback_response, if_none_match, feedback.updated_at)
+
+
+@router.get("/events/{event_id}/feedback",
+            response_model=feedback_models.EventFeedbackListResponse,
+            description=docs.get_event_feedback_desc,
+            summary=docs.get_event_feedback_summ,
+            tags=[ROUTER_TAG],
+            status_code=200)
+async def get_event_feedback(
+        event_id: common_models.EventId,
+        limit: int = Query(EVENT_FEEDBACK_DEFAULT_LIMIT,
+                           ge=1,
+                           le=EVENT_FEEDBACK_MAX_LIMIT),
+        continuation_token: Optional[str] = None,
+        if_none_match: Optional[str] = Header(None)):
+    """
+    Endpoint to list the feedback on an event, one page at a time.
+    """
+    feedback_page = await utils.get_event_feedback(event_id, limit,
+                                                   continuation_token)
+    return await http_cache_utils.get_conditional_json_response(
+        feedback_page, if_none_match)
@@ -1,12 +1,15 @@
+# pylint: disable=unsubscriptable-object
+#       - this is actually a pylint bug that hasn't been resolved.
 """
 Endpoint routers for Images.
 """
-import io
-from fastapi.responses import StreamingResponse
-from fastapi import APIRouter, File, UploadFile, Depends
+from typing import Optional
+from fastapi.responses import StreamingResponse, Response
+from fastapi import APIRouter, File, UploadFile, Depends, Header
 
 from docs import images as docs
 from util import images as utils
+from util import http_cache as http_cache_utils
 from util import auth as auth_utils
 from models import images as models
 
@@ -23,16 +26,64 @@ async def upload_file(
         file: UploadFile = File(...),
         user_id_from_token: str = Depends(
             auth_utils.get_user_id_from_header_and_check_existence)):
-    del user_id_from_token  # unused var
-    image_id = await utils.image_upload(file)
+    image_id = await utils.image_upload(file, user_id_from_token)
     return models.ImageUploadResponse(image_id=image_id)
 
 
+@router.delete('/images/delete',
+               description=docs.image_delete_desc,
+               summary=docs.image_delete_summ,
+               tags=["Images"],
+               status_code=204)
+async def delete_image(
+        image_id: models.ImageId,
+        user_id_from_token: str = Depends(
+            auth_utils.get_user_id_from_header_and_check_existence)):
+    """
+    Endpoint for deleting an image, only allowed for the user who
+    uploaded it.
+
+    Returns nothing if it is successful (204).
+    """
+    await utils.delete_image(image_id, user_id_from_token)
+
+
 @router.get('/images/get',
             description=docs.image_query_desc,
             summary=docs.image_query_summ,
             tags=["Images"],
             status_code=200)
-async def image_query(image_id: models.ImageId):
-    image_data_as_bytes = await utils.get_image_by_id(image_id)
-    return StreamingResponse(io.BytesIO(image_data_as_bytes))
+async def image_query(image_id: models.ImageId,
+                      size: Optional[models.ImageSizeEnum] = None,
+                      range_header: Optional[str] = Header(None,
+                                                           alias="Range"),
+                      if_none_match: Optional[str] = Header(None),
+                      accept: Optional[str] = Header(None)):
+    image_format = None
+    if size:
+        image_format = await utils.get_image_format_from_accept_header(accept)
+    image_file = await utils.get_image_to_serve(image_id, size, image_format)
+    headers = await utils.get_image_cache_headers(image_file)
+    if size:
+        headers["Vary"] = "Accept"
+
+    if await http_cache_utils.check_etag_matches(if_none_match,
+                                                 headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+
+    byte_range = await utils.get_byte_range_from_header(
+        range_header, image_file.length)
+    chunks = utils.iterate_image_chunks(image_file, byte_range)
+
+    if byte_range:
+        headers["Content-Range"] = byte_range.get_content_range_header()
+        headers["Content-Length"] = str(byte_range.get_length())
+        return StreamingResponse(chunks,
+                                 status_code=206,
+                                 headers=headers,
+                                 media_type=image_file.content_type)
+
+    headers["Content-Length"] = str(image_file.length)
+    return StreamingResponse(chunks,
+                             headers=headers,
+                             media_type=image_file.content_type)
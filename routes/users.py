@@ -8,6 +8,7 @@ from fastapi import APIRouter, Depends
 
 import util.users as utils
 import util.auth as auth_utils
+import util.http_cache as http_cache_utils
 from docs import users as docs
 from models import users as models
 import models.commons as common_models
@@ -55,8 +56,16 @@ async def delete_user(
              tags=["Users"],
              status_code=200)
 async def get_user(identifier: models.UserIdentifier):
+    """
+    Endpoint to query a user's public info.
+
+    Sends the ETag and Last-Modified headers, but never a 304,
+    since conditional requests only apply to GETs.
+    """
     user_data = await utils.get_user_info_by_identifier(identifier)
-    return models.UserInfoQueryResponse(**user_data.dict())
+    user_response = models.UserInfoQueryResponse(**user_data.dict())
+    return await http_cache_utils.get_conditional_json_response(
+        user_response, None, user_data.updated_at)
 
 
 @router.post("/users/login",
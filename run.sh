@@ -1,2 +1,3 @@
 pip3 install -r requirements.txt
-gunicorn -w 4 -k uvicorn.workers.UvicornWorker app:app --bind 0.0.0.0:$PORT --access-logfile - --log-level info
+export WEB_CONCURRENCY=${WEB_CONCURRENCY:-4}
+gunicorn -w $WEB_CONCURRENCY -k uvicorn.workers.UvicornWorker app:app --bind 0.0.0.0:$PORT --access-logfile - --log-level info
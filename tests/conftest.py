@@ -23,7 +23,9 @@ from faker import Faker
 from asgiref.sync import async_to_sync
 
 from requests.models import Response as HTTPResponse
-from config.db import _get_global_database_instance
+from config.db import _get_global_database_instance, AsyncCollection
+from util.image_cache import IMAGE_CACHE
+from util.response_cache import EVENT_RESPONSE_CACHE
 
 import models.auth as auth_models
 import models.users as user_models
@@ -66,11 +68,14 @@ def pytest_unconfigure(config):
 @pytest.fixture(autouse=True)
 def run_around_tests():
     """
-    Clears all documents in the test collections after every single test.
+    Clears all documents in the test collections (and the images and
+    event listings cached in-process) after every single test.
     """
     yield
     global_database_instance = _get_global_database_instance()
     global_database_instance.clear_test_collections()
+    IMAGE_CACHE.clear()
+    EVENT_RESPONSE_CACHE.clear()
 
 
 @pytest.fixture(scope='function')
@@ -537,6 +542,28 @@ def generate_random_event(
     return event_models.Event(**event_data)
 
 
+@pytest.fixture(scope='function')
+def event_with_dates_factory(
+    registered_user: user_models.User
+) -> Callable[[event_models.EventStatusEnum, datetime, datetime],
+              event_models.Event]:
+    """
+    Returns a function that inserts an event with the given status and
+    dates straight into the database, skipping any registration logic.
+    """
+    def _insert_event(status: event_models.EventStatusEnum,
+                      start_time: datetime,
+                      end_time: datetime) -> event_models.Event:
+        event = generate_random_event(user=registered_user,
+                                      custom_date_range=(start_time,
+                                                         end_time))
+        event.status = status
+        async_to_sync(event_utils.insert_event_to_database)(event)
+        return event
+
+    return _insert_event
+
+
 @pytest.fixture(scope='function')
 def unapproved_event_factory(
         registered_user: user_models.User) -> Callable[[], event_models.Event]:
@@ -1059,7 +1086,36 @@ def expired_event_factory(
             user=registered_user,
             custom_date_range=(datetime.now(),
                                datetime.now() + timedelta(seconds=1)))
+        event_data.status = event_models.EventStatusEnum.active
         async_to_sync(event_utils.register_event)(event_data)
         return event_data
 
     return _register_event
+
+
+class CountingCollection:
+    """
+    Wraps an async collection, counting every `find_one` call.
+    """
+    def __init__(self, collection: AsyncCollection):
+        self.collection = collection
+        self.find_one_calls = 0
+
+    async def find_one(self, *args, **kwargs) -> Dict[str, Any]:
+        self.find_one_calls += 1
+        return await self.collection.find_one(*args, **kwargs)
+
+    def __getattr__(self, attribute_name: str) -> Any:
+        return getattr(self.collection, attribute_name)
+
+
+@pytest.fixture(scope="function")
+def counting_users_collection(monkeypatch) -> CountingCollection:
+    """
+    Swaps the users collection in `util.users` for a counting
+    wrapper for the duration of the test, and returns it.
+    """
+    counting_collection = CountingCollection(user_utils.users_collection())
+    monkeypatch.setattr(user_utils, "users_collection",
+                        lambda: counting_collection)
+    return counting_collection
@@ -5,17 +5,22 @@
 """
 Endpoint testing for adding feedback to an event.
 """
+import asyncio
 import logging
-from typing import Dict, Callable, Any
+from typing import Dict, Callable, Any, List
 
 from asgiref.sync import async_to_sync
 from fastapi.testclient import TestClient
 from requests.models import Response as HTTPResponse
 
 from app import app
+import models.events as event_models
 import models.feedback as feedback_models
 import models.users as user_models
 import util.feedback as feedback_utils
+from models import exceptions
+
+CONCURRENT_FEEDBACK_COUNT = 300
 
 client = TestClient(app)
 
@@ -70,6 +75,32 @@ def check_feedback_added_exists(response: HTTPResponse) -> bool:
         return False
 
 
+async def register_feedback_concurrently(
+        event: event_models.Event,
+        feedback_count: int) -> List[feedback_models.FeedbackId]:
+    """
+    Registers the amount of feedback on the event all at once,
+    returning the registered feedback ids.
+    """
+    registration_forms = [
+        feedback_models.FeedbackRegistrationRequest(
+            event_id=event.get_id(),
+            comment=f"comment {index}",
+            creator_id=event.creator_id) for index in range(feedback_count)
+    ]
+    return await asyncio.gather(*[
+        feedback_utils.register_feedback(registration_form)
+        for registration_form in registration_forms
+    ])
+
+
+async def get_event_comment_ids(
+        event_id: str) -> List[feedback_models.FeedbackId]:
+    event_document = await feedback_utils.events_collection().find_one(
+        {"_id": event_id})
+    return event_document["comment_ids"]
+
+
 class TestAddFeedback:
     def test_add_feedback_success(
         self,
@@ -156,3 +187,34 @@ class TestAddFeedback:
                                headers=valid_header_dict_with_user_id)
         assert not check_add_feedback_resp_valid(response)
         assert response.status_code == 422
+
+    def test_add_feedback_concurrently_none_lost(  # pylint: disable=invalid-name
+            self, registered_event: event_models.Event):
+        """
+        Registers hundreds of pieces of feedback on the same event at once,
+        expecting every one of their ids on the event.
+        """
+        feedback_ids = async_to_sync(register_feedback_concurrently)(
+            registered_event, CONCURRENT_FEEDBACK_COUNT)
+        comment_ids = async_to_sync(get_event_comment_ids)(
+            registered_event.get_id())
+
+        assert len(set(feedback_ids)) == CONCURRENT_FEEDBACK_COUNT
+        assert sorted(comment_ids) == sorted(feedback_ids)
+
+    def test_add_feedback_nonexistent_event_not_stored(  # pylint: disable=invalid-name
+        self, no_event_feedback_reg_form: feedback_models.
+        FeedbackRegistrationRequest):
+        """
+        Attempts to add feedback to an event that doesn't exist,
+        expecting no feedback document to be left behind.
+        """
+        register_feedback = async_to_sync(feedback_utils.register_feedback)
+        try:
+            register_feedback(no_event_feedback_reg_form)
+        except exceptions.EventNotFoundException:
+            pass
+
+        feedback_count = async_to_sync(
+            feedback_utils.feedback_collection().count_documents)({})
+        assert feedback_count == 0
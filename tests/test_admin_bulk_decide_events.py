@@ -0,0 +1,159 @@
+# pylint: disable=no-self-use
+#       - pylint test classes must pass self, even if unused.
+"""
+Endpoint tests for deciding the approval of many events at once.
+"""
+from typing import Any, Dict, Callable, List
+
+from asgiref.sync import async_to_sync
+from fastapi.testclient import TestClient
+
+import util.events as event_utils
+import models.events as event_models
+
+from app import app
+
+client = TestClient(app)
+
+
+def get_bulk_endpoint_url_str() -> str:
+    """
+    Returns the endpoint url string
+    """
+    return "/admin/decide_events"
+
+
+def get_decisions_json(decision_pairs: List[Any]) -> Dict[str, Any]:
+    """
+    Creates the request body from (event_id, approve) pairs.
+    """
+    decisions = [{
+        "event_id": event_id,
+        "approve": approve
+    } for event_id, approve in decision_pairs]
+    return {"decisions": decisions}
+
+
+def get_outcomes_from_response(response: Any) -> List[str]:
+    """
+    Returns just the outcome strings from the response, in order.
+    """
+    return [outcome["outcome"] for outcome in response.json()["outcomes"]]
+
+
+def get_event_approval(event_id: event_models.EventId) -> str:
+    """
+    Returns the approval enum value currently stored for the event.
+    """
+    return async_to_sync(event_utils.get_event_by_id)(event_id).approval
+
+
+class TestAdminBulkDecideEvents:
+    def test_approve_and_deny_many(self,
+                                   unapproved_event_factory: Callable[[],
+                                                                      None],
+                                   valid_admin_header: Dict[str, Any]):
+        """
+        Approves some events and denies others in one request, expecting
+        every decision to land and be reported in order.
+        """
+        events = [unapproved_event_factory() for _ in range(4)]
+        decision_pairs = [(event.get_id(), index % 2 == 0)
+                          for index, event in enumerate(events)]
+
+        response = client.post(get_bulk_endpoint_url_str(),
+                               json=get_decisions_json(decision_pairs),
+                               headers=valid_admin_header)
+
+        assert response.status_code == 200
+        assert get_outcomes_from_response(response) == [
+            "approved", "denied", "approved", "denied"
+        ]
+        assert [get_event_approval(event.get_id()) for event in events] == [
+            "approved", "denied", "approved", "denied"
+        ]
+
+    def test_mixed_outcomes(self, unapproved_event_factory: Callable[[],
+                                                                     None],
+                            random_valid_uuid4_str: str,
+                            valid_admin_header: Dict[str, Any]):
+        """
+        Sends decisions for a missing event, an already decided event and
+        a repeated event, expecting each to be reported as such.
+        """
+        decided_event = unapproved_event_factory()
+        async_to_sync(event_utils.change_event_approval)(
+            decided_event.get_id(), True)
+        pending_event = unapproved_event_factory()
+
+        decision_pairs = [
+            (random_valid_uuid4_str, True),
+            (decided_event.get_id(), False),
+            (pending_event.get_id(), False),
+            (pending_event.get_id(), True),
+        ]
+        response = client.post(get_bulk_endpoint_url_str(),
+                               json=get_decisions_json(decision_pairs),
+                               headers=valid_admin_header)
+
+        assert response.status_code == 200
+        assert get_outcomes_from_response(response) == [
+            "not_found", "already_decided", "denied", "duplicate"
+        ]
+        assert get_event_approval(decided_event.get_id()) == "approved"
+        assert get_event_approval(pending_event.get_id()) == "denied"
+
+    def test_same_decision_twice(self, unapproved_event_factory: Callable[[],
+                                                                          None],
+                                 valid_admin_header: Dict[str, Any]):
+        """
+        Sends the same decisions in two separate requests, expecting the
+        second request to report every event as already decided.
+        """
+        events = [unapproved_event_factory() for _ in range(2)]
+        decision_pairs = [(events[0].get_id(), True),
+                          (events[1].get_id(), False)]
+
+        first_response = client.post(get_bulk_endpoint_url_str(),
+                                     json=get_decisions_json(decision_pairs),
+                                     headers=valid_admin_header)
+        second_response = client.post(get_bulk_endpoint_url_str(),
+                                      json=get_decisions_json(decision_pairs),
+                                      headers=valid_admin_header)
+
+        assert get_outcomes_from_response(first_response) == [
+            "approved", "denied"
+        ]
+        assert get_outcomes_from_response(second_response) == [
+            "already_decided", "already_decided"
+        ]
+
+    def test_empty_decisions_rejected(self, valid_admin_header: Dict[str,
+                                                                     Any]):
+        """
+        Sends no decisions at all, expecting a validation error.
+        """
+        response = client.post(get_bulk_endpoint_url_str(),
+                               json=get_decisions_json([]),
+                               headers=valid_admin_header)
+
+        assert response.status_code == 422
+
+    def test_user_not_admin_failure(self,
+                                    unapproved_event_factory: Callable[[],
+                                                                       None],
+                                    valid_header_dict_with_user_id: Dict[str,
+                                                                         Any]):
+        """
+        Tries to decide events with a regular user's token,
+        expecting auth failure and no changes.
+        """
+        event = unapproved_event_factory()
+
+        response = client.post(get_bulk_endpoint_url_str(),
+                               json=get_decisions_json([(event.get_id(),
+                                                         True)]),
+                               headers=valid_header_dict_with_user_id)
+
+        assert response.status_code == 401
+        assert get_event_approval(event.get_id()) == "unapproved"
@@ -5,7 +5,7 @@
 """
 Endpoint tests for Admin Queue of Events.
 """
-from typing import Any, Dict, Callable
+from typing import Any, Dict, Callable, List
 
 from fastapi.testclient import TestClient
 from requests.models import Response as HTTPResponse
@@ -24,6 +24,34 @@ def get_queue_endpoint_url_str() -> str:
     return "/admin/events_queue"
 
 
+def get_count_endpoint_url_str() -> str:
+    """
+    Returns the queue count endpoint url string
+    """
+    return "/admin/events_queue/count"
+
+
+def get_all_queue_pages(header_dict: Dict[str, Any],
+                        limit: int) -> List[Dict[str, Any]]:
+    """
+    Walks the queue page by page with the continuation token,
+    returning the json of every page.
+    """
+    pages = []
+    params = {"limit": limit}
+    while True:
+        response = client.get(get_queue_endpoint_url_str(),
+                              params=params,
+                              headers=header_dict)
+        assert response.status_code == 200
+        pages.append(response.json())
+
+        continuation_token = response.json()["continuation_token"]
+        if not continuation_token:
+            return pages
+        params["continuation_token"] = continuation_token
+
+
 class TestAdminGetEventsQueue:
     def test_get_all_events_success(
         self, unapproved_event_factory: Callable[[], None],
@@ -79,3 +107,65 @@ class TestAdminGetEventsQueue:
                               headers=valid_header_dict_with_user_id)
         assert response.status_code == 401
         assert not check_list_return_events_valid(response, num_events)
+
+    def test_queue_pages_oldest_first(
+            self, unapproved_event_factory: Callable[[], event_models.Event],
+            valid_admin_header: Dict[str, Any]):
+        """
+        Walks the queue in small pages, expecting every event exactly
+        once, sorted by start time.
+        """
+        num_events = 7
+        event_ids = {unapproved_event_factory().get_id()
+                     for _ in range(num_events)}
+
+        pages = get_all_queue_pages(valid_admin_header, limit=3)
+        events_seen = [event for page in pages for event in page["events"]]
+        start_times = [event["date_time_start"] for event in events_seen]
+
+        assert [len(page["events"]) for page in pages] == [3, 3, 1]
+        assert {event["event_id"] for event in events_seen} == event_ids
+        assert len(events_seen) == num_events
+        assert start_times == sorted(start_times)
+
+    def test_queue_limit_out_of_bounds(self, valid_admin_header: Dict[str,
+                                                                      Any]):
+        """
+        Asks for an empty page, expecting a validation error.
+        """
+        response = client.get(get_queue_endpoint_url_str(),
+                              params={"limit": 0},
+                              headers=valid_admin_header)
+        assert response.status_code == 422
+
+    def test_queue_count(
+        self, unapproved_event_factory: Callable[[], None],
+        registered_admin_user: user_models.User,
+        register_event_with_user: Callable[[], event_models.Event],
+        get_header_dict_from_user: Callable[[user_models.User], Dict[str,
+                                                                     Any]]):
+        """
+        Registers some events needing a decision and some that don't,
+        expecting only the former to be counted.
+        """
+        num_events = 5
+        for _ in range(num_events):
+            unapproved_event_factory()
+        register_event_with_user(registered_admin_user)
+
+        header_dict = get_header_dict_from_user(registered_admin_user)
+        response = client.get(get_count_endpoint_url_str(),
+                              headers=header_dict)
+
+        assert response.status_code == 200
+        assert response.json() == {"count": num_events}
+
+    def test_queue_count_not_admin(
+            self, valid_header_dict_with_user_id: Dict[str, Any]):
+        """
+        Asks for the queue count with a regular user's token,
+        expecting auth failure.
+        """
+        response = client.get(get_count_endpoint_url_str(),
+                              headers=valid_header_dict_with_user_id)
+        assert response.status_code == 401
@@ -0,0 +1,119 @@
+# pylint: disable=no-self-use
+#       - pylint test classes must pass self, even if unused.
+# pylint: disable=invalid-name
+#       - this module has some pretty verbose names,
+#         shrinking them feels worse than disabling this lint.
+"""
+Unit tests for the awaitable database layer in `config.db`.
+"""
+import time
+import asyncio
+from typing import List, Dict, Any
+
+from asgiref.sync import async_to_sync
+
+from config.db import get_async_database, run_in_database_executor
+
+
+def get_scratch_collection_name() -> str:
+    """
+    Returns the name of the collection used by these tests; it gets wiped
+    after every test like every other testing collection.
+    """
+    return "async_database_scratch"
+
+
+def generate_documents(amount: int) -> List[Dict[str, Any]]:
+    """
+    Returns a list of simple, uniquely identifiable documents.
+    """
+    return [{"_id": str(index), "index": index} for index in range(amount)]
+
+
+async def insert_and_read_back_concurrently(
+        documents: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Inserts every document concurrently, then reads all of them back
+    concurrently, returning the documents found.
+    """
+    collection = get_async_database()[get_scratch_collection_name()]
+
+    await asyncio.gather(
+        *[collection.insert_one(document) for document in documents])
+
+    return await asyncio.gather(*[
+        collection.find_one({"_id": document["_id"]})
+        for document in documents
+    ])
+
+
+async def count_documents_by_iteration(batch_size: int) -> int:
+    """
+    Iterates over the whole scratch collection with the async cursor
+    and returns the amount of documents seen.
+    """
+    collection = get_async_database()[get_scratch_collection_name()]
+
+    documents_seen = 0
+    async for _ in collection.find().batch_size(batch_size):
+        documents_seen += 1
+    return documents_seen
+
+
+async def count_ticks_during_blocking_call(blocking_seconds: float) -> int:
+    """
+    Runs a blocking call on the database executor while a ticker task
+    runs on the event loop, returning how many times the ticker ran.
+    """
+    ticks = 0
+
+    async def _ticker():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.01)
+
+    ticker_task = asyncio.ensure_future(_ticker())
+    await run_in_database_executor(time.sleep, blocking_seconds)
+    ticker_task.cancel()
+
+    return ticks
+
+
+class TestAsyncDatabase:
+    def test_async_database_is_singleton(self):
+        """
+        Gets the async database twice, expecting the exact same object.
+        """
+        assert get_async_database() is get_async_database()
+
+    def test_concurrent_inserts_and_reads_ok(self):
+        """
+        Inserts and reads back many documents concurrently,
+        expecting every document to be found intact.
+        """
+        documents = generate_documents(200)
+        found_documents = async_to_sync(insert_and_read_back_concurrently)(
+            documents)
+
+        assert found_documents == documents
+
+    def test_cursor_iteration_reads_every_batch(self):
+        """
+        Inserts more documents than fit in a single batch and iterates
+        over them, expecting every document to be seen exactly once.
+        """
+        amount_of_documents = 250
+        documents = generate_documents(amount_of_documents)
+        async_to_sync(insert_and_read_back_concurrently)(documents)
+
+        documents_seen = async_to_sync(count_documents_by_iteration)(100)
+        assert documents_seen == amount_of_documents
+
+    def test_blocking_call_does_not_block_event_loop(self):
+        """
+        Runs a slow blocking call through the executor, expecting
+        other tasks on the event loop to keep running meanwhile.
+        """
+        ticks = async_to_sync(count_ticks_during_blocking_call)(0.5)
+        assert ticks > 10
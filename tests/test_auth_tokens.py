@@ -13,7 +13,7 @@ from typing import Dict, Any
 import time
 from fastapi.testclient import TestClient
 from app import app
-from models.auth import Token
+from models.auth import Token, TokenClaims, TokenError
 
 client = TestClient(app)
 
@@ -90,3 +90,36 @@ class TestAuthUser:
         encoded_token_str = Token.get_enc_token_str_from_dict(
             valid_header_dict_with_user_id, delta)
         assert not Token.check_if_expired(encoded_token_str)
+
+    def test_verify_valid_token(self):
+        """
+        Verifies a freshly encoded token, expecting the typed claims
+        to hold the original payload, extra claims included.
+        """
+        encoded_token_str = Token.get_enc_token_str_from_dict({
+            "user_id": "some-user-id",
+            "extra": "claim"
+        })
+        token_claims = Token.verify(encoded_token_str)
+
+        assert isinstance(token_claims, TokenClaims)
+        assert token_claims.user_id == "some-user-id"
+        assert token_claims.dict(exclude_unset=True)["extra"] == "claim"
+
+    def test_verify_expired_token(
+            self, valid_header_dict_with_user_id: Dict[str, Any]):
+        """
+        Verifies an expired token, expecting the expired error.
+        """
+        delta = create_timedelta(0, 0, 0)
+        encoded_token_str = Token.get_enc_token_str_from_dict(
+            valid_header_dict_with_user_id, delta)
+        time.sleep(1)
+
+        assert Token.verify(encoded_token_str) is TokenError.expired
+
+    def test_verify_garbage_token(self):
+        """
+        Verifies a string that isn't a token, expecting the invalid error.
+        """
+        assert Token.verify("not.a.token") is TokenError.invalid
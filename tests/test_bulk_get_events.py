@@ -0,0 +1,117 @@
+# pylint: disable=no-self-use
+#       - pylint test classes must pass self, even if unused.
+"""
+Endpoint tests for fetching many events at once by their ids.
+"""
+from uuid import uuid4
+from datetime import datetime, timedelta
+from typing import Any, Callable, List
+
+from asgiref.sync import async_to_sync
+from fastapi.testclient import TestClient
+
+from app import app
+import models.events as event_models
+import util.events as event_utils
+
+client = TestClient(app)
+
+
+def get_bulk_events_endpoint_url() -> str:
+    return "/events/get/bulk"
+
+
+def bulk_get_events(event_ids: List[str]) -> Any:
+    return client.post(get_bulk_events_endpoint_url(),
+                       json={"event_ids": event_ids})
+
+
+def get_response_event_ids(response: Any) -> List[str]:
+    return [event["event_id"] for event in response.json()["events"]]
+
+
+class TestBulkGetEvents:
+    def test_events_in_requested_order(
+            self, registered_event_factory: Callable[[],
+                                                     event_models.Event]):
+        """
+        Fetches several events, expecting them back in the
+        same order as their ids were sent.
+        """
+        event_ids = [registered_event_factory().get_id() for _ in range(5)]
+        requested_ids = list(reversed(event_ids))
+
+        response = bulk_get_events(requested_ids)
+
+        assert response.status_code == 200
+        assert get_response_event_ids(response) == requested_ids
+        assert response.json()["missing_ids"] == []
+
+    def test_missing_ids_reported(
+            self, registered_event_factory: Callable[[],
+                                                     event_models.Event]):
+        """
+        Fetches existing events mixed with ids that don't exist, expecting
+        the existing events back and the rest listed as missing.
+        """
+        first_event_id = registered_event_factory().get_id()
+        second_event_id = registered_event_factory().get_id()
+        missing_event_id = str(uuid4())
+
+        response = bulk_get_events(
+            [first_event_id, missing_event_id, second_event_id])
+
+        assert get_response_event_ids(response) == [
+            first_event_id, second_event_id
+        ]
+        assert response.json()["missing_ids"] == [missing_event_id]
+
+    def test_repeated_ids_returned_once(
+            self, registered_event: event_models.Event):
+        """
+        Sends the same id twice, expecting the event only once.
+        """
+        event_id = registered_event.get_id()
+
+        response = bulk_get_events([event_id, event_id])
+
+        assert get_response_event_ids(response) == [event_id]
+
+    def test_status_current_no_writes(
+            self, event_with_dates_factory: Callable[..., event_models.Event]):
+        """
+        Fetches an event stored as active whose end date has passed,
+        expecting it to be reported as expired without being updated.
+        """
+        event = event_with_dates_factory(
+            event_models.EventStatusEnum.active,
+            datetime.utcnow() - timedelta(days=2),
+            datetime.utcnow() - timedelta(days=1))
+
+        response = bulk_get_events([event.get_id()])
+        stored_event_document = async_to_sync(
+            event_utils.events_collection().find_one)({"_id": event.get_id()})
+
+        assert response.json()["events"][0]["status"] == "expired"
+        assert stored_event_document["status"] == "active"
+
+    def test_too_many_ids(self):
+        """
+        Sends more ids than allowed at once, expecting a 422.
+        """
+        too_many_ids = [
+            str(uuid4())
+            for _ in range(event_models.BULK_EVENT_QUERY_MAX_IDS + 1)
+        ]
+
+        response = bulk_get_events(too_many_ids)
+
+        assert response.status_code == 422
+
+    def test_no_ids(self):
+        """
+        Sends an empty list of ids, expecting a 422.
+        """
+        response = bulk_get_events([])
+
+        assert response.status_code == 422
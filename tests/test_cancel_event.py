@@ -73,9 +73,14 @@ def check_event_update_safe(old_event: event_models.Event,
                             new_event: event_models.Event) -> bool:
     """
     Checks if a newly acquired event object is the same as the old, except for
-    an enum which is expected to now be cancelled on the new object.
+    an enum which is expected to now be cancelled on the new object, and the
+    write stamp which is expected to have moved along.
     """
+    if new_event.version != old_event.version + 1:
+        return False
     old_event.status = event_models.EventStatusEnum.cancelled
+    old_event.version = new_event.version
+    old_event.updated_at = new_event.updated_at
     return old_event == new_event
 
 
@@ -98,7 +103,7 @@ def event_in_database(event: event_models.Event) -> bool:
     Checks if the given event is in the database
     """
     id_dict = async_to_sync(event_utils.generate_event_id_dict)(event)
-    var = event_utils.events_collection().find_one(id_dict)
+    var = async_to_sync(event_utils.events_collection().find_one)(id_dict)
     return bool(var)
 
 
@@ -276,3 +281,26 @@ class TestCancelEvent:
         assert check_no_event_response(response)
         assert new_user_data == old_user_data
         assert not event_in_database(unregistered_event)
+
+    def test_cancel_archives_for_users(
+            self, registered_user: user_models.User,
+            registered_active_event_factory: Callable[[], event_models.Event],
+            get_header_dict_from_user: Callable[[user_models.User],
+                                                Dict[str, Any]]):
+        """
+        Cancels an event a user has visible, expecting it
+        to be moved to the user's archived events.
+        """
+        event = registered_active_event_factory(registered_user)
+        async_to_sync(user_utils.add_event_to_user_visible)(registered_user.id,
+                                                            event.id)
+        header_dict = get_header_dict_from_user(registered_user)
+
+        response = get_event_cancel_response(event, header_dict)
+
+        user_identifier = user_models.UserIdentifier(user_id=registered_user.id)
+        new_user_data = async_to_sync(
+            user_utils.get_user_info_by_identifier)(user_identifier)
+        assert check_valid_cancel_response(response)
+        assert event.id not in new_user_data.events_visible
+        assert event.id in new_user_data.events_archived
@@ -0,0 +1,173 @@
+# pylint: disable=no-self-use
+#       - pylint test classes must pass self, even if unused.
+# pylint: disable=invalid-name
+#       - this module has some pretty verbose names,
+#         shrinking them feels worse than disabling this lint.
+"""
+Tests for the index registry in `config.db`: the drift report, and that the hot
+queries are answered with an index scan instead of a collection scan.
+"""
+from typing import Dict, Any
+from asgiref.sync import async_to_sync
+from pymongo import IndexModel, DESCENDING
+from pymongo.collection import Collection
+
+import util.events as event_utils
+import util.feedback as feedback_utils
+from config.db import (INDEX_REGISTRY, get_database, get_database_client_name,
+                       _get_global_database_instance, _check_index_matches)
+
+
+def get_sync_collection(collection_name: str) -> Collection:
+    """
+    Returns the plain pymongo collection, which can explain queries.
+    """
+    database = get_database()[get_database_client_name()]
+    return database[collection_name]
+
+
+def get_plan_stages(plan: Dict[str, Any]) -> set:
+    """
+    Walks a query plan tree and returns the set of every stage name in it.
+    """
+    stages = {plan.get("stage")}
+
+    child_plans = plan.get("inputStages", [])
+    if "inputStage" in plan:
+        child_plans = [*child_plans, plan["inputStage"]]
+
+    for child_plan in child_plans:
+        stages |= get_plan_stages(child_plan)
+
+    return stages
+
+
+def check_explain_uses_index(explain_output: Dict[str, Any]) -> bool:
+    """
+    Checks that the winning plan of an explain output
+    scans an index and never the whole collection.
+    """
+    winning_plan = explain_output["queryPlanner"]["winningPlan"]
+    stages = get_plan_stages(winning_plan)
+    return "IXSCAN" in stages and "COLLSCAN" not in stages
+
+
+class TestDatabaseIndexes:
+    def test_index_report_in_sync(self):
+        """
+        Gets the index report for the testing database,
+        expecting no missing or extra indexes.
+        """
+        index_report = _get_global_database_instance().get_index_report()
+
+        for index_names in index_report.values():
+            assert not index_names["missing"]
+            assert not index_names["mismatched"]
+            assert not index_names["extra"]
+
+    def test_index_report_finds_drift(self):
+        """
+        Drops one registered index and swaps another for one of the same
+        name on a different key, expecting both to be reported.
+        """
+        events_collection = get_sync_collection("events")
+        events_collection.drop_index("status_date_time_end")
+        events_collection.drop_index("creator_id_1")
+        events_collection.create_index([("creator_id", DESCENDING)],
+                                       name="creator_id_1")
+
+        try:
+            index_report = _get_global_database_instance().get_index_report()
+        finally:
+            events_collection.drop_index("creator_id_1")
+            events_collection.create_indexes(INDEX_REGISTRY["events"])
+
+        assert index_report["events"]["missing"] == ["status_date_time_end"]
+        assert index_report["events"]["mismatched"] == ["creator_id_1"]
+        assert not index_report["events"]["extra"]
+
+    def test_index_options_compared(self):
+        """
+        Compares a registered unique index against the same key without
+        the option, expecting a mismatch.
+        """
+        registered_document = INDEX_REGISTRY["users"][0].document
+        existing_info = {"key": [("email", 1)], "v": 2}
+
+        assert not _check_index_matches(registered_document, existing_info)
+
+    def test_server_text_index_matches(self):
+        """
+        Compares the registered text index against the way the server
+        reports it, expecting a match only while the weights agree.
+        """
+        registered_document = IndexModel(
+            [("title", "text"), ("description", "text")],
+            name="title_description_text",
+            weights={
+                "title": 3,
+                "description": 1
+            }).document
+        existing_info = {
+            "key": [("_fts", "text"), ("_ftsx", 1)],
+            "weights": {
+                "title": 3,
+                "description": 1
+            },
+            "v": 2,
+        }
+
+        assert _check_index_matches(registered_document, existing_info)
+        existing_info["weights"]["title"] = 1
+        assert not _check_index_matches(registered_document, existing_info)
+
+    def test_batch_query_uses_index(self):
+        """
+        Explains the batch event query, expecting an index scan.
+        """
+        filter_dict = async_to_sync(event_utils.get_base_batch_filter_dict)()
+        explain_output = get_sync_collection("events").find(filter_dict).sort(
+            event_utils.BATCH_QUERY_SORT).explain()
+
+        assert check_explain_uses_index(explain_output)
+
+    def test_approval_queue_uses_index(self):
+        """
+        Explains the admin approval queue query, expecting an index scan.
+        """
+        filter_dict = async_to_sync(
+            event_utils.get_event_approval_filter_dict)()
+        explain_output = get_sync_collection("events").find(filter_dict).sort(
+            event_utils.BATCH_QUERY_SORT).explain()
+
+        assert check_explain_uses_index(explain_output)
+
+    def test_creator_id_query_uses_index(self):
+        """
+        Explains a query by event creator, expecting an index scan.
+        """
+        explain_output = get_sync_collection("events").find({
+            "creator_id": "some-user-id"
+        }).explain()
+
+        assert check_explain_uses_index(explain_output)
+
+    def test_feedback_by_event_uses_index(self):
+        """
+        Explains a query for an event's feedback, expecting an index scan.
+        """
+        explain_output = get_sync_collection("feedback").find({
+            "event_id": "some-event-id"
+        }).sort(feedback_utils.EVENT_FEEDBACK_SORT).explain()
+
+        assert check_explain_uses_index(explain_output)
+
+    def test_user_by_email_uses_index(self):
+        """
+        Explains a user lookup by email, expecting an index scan.
+        """
+        explain_output = get_sync_collection("users").find({
+            "email": "someone@example.com"
+        }).explain()
+
+        assert check_explain_uses_index(explain_output)
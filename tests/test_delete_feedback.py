@@ -5,14 +5,18 @@
 """
 Endpoint testing for deleting feedback off of an event.
 """
+import asyncio
 import logging
 from typing import Dict, Callable, Any
+from asgiref.sync import async_to_sync
 from fastapi.testclient import TestClient
 from requests.models import Response as HTTPResponse
 
 from app import app
+import models.events as event_models
 import models.feedback as feedback_models
 import models.users as user_models
+import util.feedback as feedback_utils
 
 client = TestClient(app)
 
@@ -53,6 +57,28 @@ def check_delete_feedback_response_valid(response: HTTPResponse) -> bool:  # pyl
         return False
 
 
+async def register_then_delete_feedback_concurrently(  # pylint: disable=invalid-name
+        event: event_models.Event, feedback_count: int) -> None:
+    """
+    Registers the amount of feedback on the event,
+    then deletes all of it at once.
+    """
+    feedback_ids = []
+    for index in range(feedback_count):
+        registration_form = feedback_models.FeedbackRegistrationRequest(
+            event_id=event.get_id(),
+            comment=f"comment {index}",
+            creator_id=event.creator_id)
+        feedback_ids.append(await
+                            feedback_utils.register_feedback(registration_form))
+
+    await asyncio.gather(*[
+        feedback_utils.delete_feedback(event.get_id(), feedback_id,
+                                       event.creator_id)
+        for feedback_id in feedback_ids
+    ])
+
+
 class TestDeleteFeedback:
     def test_delete_feedback_success(
         self, registered_feedback: feedback_models.Feedback,
@@ -139,3 +165,38 @@ class TestDeleteFeedback:
                                  headers=valid_header_dict_with_user_id)
         assert not check_delete_feedback_response_valid(response)
         assert response.status_code == 422
+
+    def test_delete_feedback_concurrently_all_removed(  # pylint: disable=invalid-name
+            self, registered_event: event_models.Event):
+        """
+        Deletes many pieces of feedback on the same event at once,
+        expecting none of their ids to be left on the event.
+        """
+        async_to_sync(register_then_delete_feedback_concurrently)(
+            registered_event, 100)
+
+        event_document = async_to_sync(
+            feedback_utils.events_collection().find_one)(
+                {"_id": registered_event.get_id()})
+        feedback_count = async_to_sync(
+            feedback_utils.feedback_collection().count_documents)({})
+
+        assert event_document["comment_ids"] == []
+        assert feedback_count == 0
+
+    def test_delete_feedback_twice_failure(  # pylint: disable=invalid-name
+        self, registered_feedback: feedback_models.Feedback,
+        get_header_dict_from_user_id: Callable[[user_models.UserId],
+                                               Dict[str, Any]]):
+        """
+        Deletes the same piece of feedback twice, expecting
+        the second delete to 404.
+        """
+        headers = get_header_dict_from_user_id(registered_feedback.creator_id)
+        request_url = get_delete_feedback_endpoint_url()
+        params = get_delete_feedback_url_params(registered_feedback)
+
+        client.delete(request_url, params=params, headers=headers)
+        response = client.delete(request_url, params=params, headers=headers)
+
+        assert response.status_code == 404
@@ -4,6 +4,9 @@
 #       - honestly just annoying to use lazy(%) interpolation.
 # pylint: disable=unsubscriptable-object
 #       - bug with pylint
+# pylint: disable=invalid-name
+#       - this module has some pretty verbose names,
+#         shrinking them feels worse than disabling this lint.
 """
 Holds endpoint tests for the batch event query requests.
 """
@@ -13,9 +16,11 @@ from datetime import datetime
 from typing import Dict, Any, Callable, Optional
 
 from fastapi.testclient import TestClient
+from asgiref.sync import async_to_sync
 from requests.models import Response as HTTPResponse
 
 import models.events as event_models
+import util.events as event_utils
 
 from app import app
 
@@ -298,3 +303,91 @@ class TestBatchEventQueryEndpoint:
 
         # should be at least one item of overlap
         assert response.json()["events"][0] == event_to_be_compared
+
+    def test_batch_query_continuation_token_pages(
+        self, register_event_for_batch_query: Callable[[
+            event_models.BatchEventQueryModel, Optional[bool], Optional[bool]
+        ], event_models.Event]):
+        """
+        Registers some events then walks through them with the continuation
+        token, expecting every valid event exactly once and no token at the
+        end of the last page.
+        """
+        query_form = get_batch_query_form_for_today()
+        limit_amount = 4
+        query_form.limit = limit_amount
+
+        form_numbers = 10
+        generate_range_of_events(register_event_for_batch_query, query_form,
+                                 form_numbers)
+
+        endpoint_url = get_batch_query_endpoint_url()
+        event_ids_seen = []
+
+        while True:
+            json_data = get_json_dict_from_query_form(query_form)
+            response = client.post(endpoint_url, json=json_data)
+
+            assert check_query_events_resp_valid(response, query_form)
+            assert len(response.json()["events"]) <= limit_amount
+            event_ids_seen.extend(
+                event["event_id"] for event in response.json()["events"])
+
+            continuation_token = response.json()["continuation_token"]
+            if not continuation_token:
+                break
+            query_form.continuation_token = continuation_token
+
+        assert len(event_ids_seen) == form_numbers
+        assert len(set(event_ids_seen)) == form_numbers
+
+    def test_batch_query_invalid_continuation_token(self):
+        """
+        Queries with a garbage continuation token, expecting a 422.
+        """
+        query_form = get_batch_query_form_for_today()
+        query_form.continuation_token = "not a valid token"
+
+        json_data = get_json_dict_from_query_form(query_form)
+        endpoint_url = get_batch_query_endpoint_url()
+        response = client.post(endpoint_url, json=json_data)
+
+        assert response.status_code == 422
+
+    def test_batch_query_non_positive_limit(self):
+        """
+        Queries with a limit of zero and below, expecting a 422 each time.
+        """
+        endpoint_url = get_batch_query_endpoint_url()
+
+        for limit_amount in (0, -1):
+            json_data = get_json_dict_from_query_form(
+                get_batch_query_form_for_today())
+            json_data["limit"] = limit_amount
+            response = client.post(endpoint_url, json=json_data)
+
+            assert response.status_code == 422
+
+    def test_batch_query_events_have_only_response_fields(
+        self, register_event_for_batch_query: Callable[[
+            event_models.BatchEventQueryModel, Optional[bool], Optional[bool]
+        ], event_models.Event]):
+        """
+        Registers a few events and queries them through the util method,
+        expecting every projected event to hold exactly the response fields
+        and to still pass validation.
+        """
+        query_form = get_batch_query_form_for_today()
+        form_numbers = 3
+        query_form.limit = form_numbers
+
+        generate_range_of_events(register_event_for_batch_query, query_form,
+                                 form_numbers)
+
+        response = async_to_sync(event_utils.batch_event_query)(query_form)
+        response_fields = set(event_models.EventQueryResponse.__fields__)
+
+        assert len(response.events) == form_numbers
+        for event in response.events:
+            assert set(event.dict()) == response_fields
+            assert event_models.EventQueryResponse(**event.dict())
@@ -5,7 +5,8 @@
 """
 Holds endpoint tests for getting all events in the database
 """
-from typing import Callable
+import json
+from typing import Callable, Dict
 
 from fastapi.testclient import TestClient
 from requests.models import Response as HTTPResponse
@@ -22,6 +23,13 @@ def get_all_events_endpoint_url() -> str:
     return "/events/find/all"
 
 
+def get_ndjson_header_dict() -> Dict[str, str]:
+    """
+    Returns the header asking for the streamed NDJSON export
+    """
+    return {"Accept": "application/x-ndjson"}
+
+
 class TestGetAllEvents:
     def test_get_all_events_success(self,
                                     registered_event_factory: Callable[[],
@@ -49,3 +57,32 @@ class TestGetAllEvents:
         endpoint_url = get_all_events_endpoint_url()
         response = client.get(endpoint_url)
         assert check_list_return_events_valid(response, 0)
+
+    def test_get_all_events_ndjson(self, registered_event_factory: Callable[[],
+                                                                         None]):
+        """
+        Registers some events and streams them back as NDJSON,
+        expecting one valid event per line.
+        """
+        event_ids = {registered_event_factory().get_id() for _ in range(12)}
+
+        response = client.get(get_all_events_endpoint_url(),
+                              headers=get_ndjson_header_dict())
+        events = [json.loads(line) for line in response.text.splitlines()]
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith(
+            "application/x-ndjson")
+        assert {event["event_id"] for event in events} == event_ids
+        assert all("title" in event for event in events)
+
+    def test_get_no_events_ndjson(self):
+        """
+        Streams the export without registering any events,
+        expecting an empty body.
+        """
+        response = client.get(get_all_events_endpoint_url(),
+                              headers=get_ndjson_header_dict())
+
+        assert response.status_code == 200
+        assert not response.text
@@ -0,0 +1,241 @@
+# pylint: disable=no-self-use
+#       - pylint test classes must pass self, even if unused.
+# pylint: disable=invalid-name
+#       - this module has some pretty verbose names,
+#         shrinking them feels worse than disabling this lint.
+"""
+Tests for the cache of public event listing responses.
+"""
+from typing import Any, List
+
+import pytest
+import fakeredis
+from pydantic import BaseModel, ValidationError
+from asgiref.sync import async_to_sync
+from fastapi.testclient import TestClient
+
+from app import app
+import util.events as event_utils
+import models.events as event_models
+from config.db import get_database, get_database_client_name
+from util.response_cache import InProcessResponseCacheBackend, \
+    RedisResponseCacheBackend, ResponseCache, EVENT_RESPONSE_CACHE, \
+    get_response_cache_key
+
+client = TestClient(app)
+
+
+def search_events(keyword: str) -> Any:
+    return client.post("/events/search", json={"keyword": keyword})
+
+
+def get_event_ids_from_response(response: Any) -> List[str]:
+    return [event["event_id"] for event in response.json()["events"]]
+
+
+def get_redis_backend(
+        server: fakeredis.FakeServer) -> RedisResponseCacheBackend:
+    """
+    Returns a Redis backend connected to the given fake server, standing
+    in for one worker's connection to the shared server.
+    """
+    return RedisResponseCacheBackend(client=fakeredis.FakeRedis(
+        server=server))
+
+
+class CountedResponse(BaseModel):
+    count: int
+
+
+class TestResponseCacheBackend:
+    def test_expired_entry_not_returned(self):
+        """
+        Caches a response that expires right away, expecting a miss.
+        """
+        backend = InProcessResponseCacheBackend(max_entries=10)
+        async_to_sync(backend.set)("key", "{}", 0)
+
+        assert async_to_sync(backend.get)("key") is None
+        assert not backend.entries
+
+    def test_evicts_oldest_entries(self):
+        """
+        Fills a two entry cache past it's limit, expecting
+        the oldest entry to be evicted.
+        """
+        backend = InProcessResponseCacheBackend(max_entries=2)
+        for key in ("first", "second", "third"):
+            async_to_sync(backend.set)(key, "{}", 60)
+
+        assert async_to_sync(backend.get)("first") is None
+        assert async_to_sync(backend.get)("third") == "{}"
+
+    def test_invalidate_moves_to_new_generation(self):
+        """
+        Invalidates the cache, expecting a new generation and no entries.
+        """
+        backend = InProcessResponseCacheBackend(max_entries=10)
+        async_to_sync(backend.set)("key", "{}", 60)
+        old_generation = async_to_sync(backend.get_generation)()
+
+        async_to_sync(backend.invalidate)()
+
+        assert async_to_sync(backend.get_generation)() != old_generation
+        assert async_to_sync(backend.get)("key") is None
+
+    def test_key_ignores_query_dict_order(self):
+        """
+        Builds keys from dicts holding the same values in different
+        orders, expecting the same key.
+        """
+        first_key = get_response_cache_key("search", {"a": 1, "b": 2})
+        second_key = get_response_cache_key("search", {"b": 2, "a": 1})
+
+        assert first_key == second_key
+
+
+class TestRedisResponseCacheBackend:
+    def test_set_and_get(self):
+        """
+        Caches a response, expecting it back along with
+        a miss for a key that was never set.
+        """
+        backend = get_redis_backend(fakeredis.FakeServer())
+        async_to_sync(backend.set)("key", "{}", 60)
+
+        assert async_to_sync(backend.get)("key") == "{}"
+        assert async_to_sync(backend.get)("other_key") is None
+
+    def test_set_leaves_expiry_to_server(self):
+        """
+        Caches a response, expecting the server to hold
+        it for no longer than the TTL given.
+        """
+        backend = get_redis_backend(fakeredis.FakeServer())
+        async_to_sync(backend.set)("key", "{}", 60)
+
+        ttl_seconds = backend.client.ttl("event_responses:key")
+
+        assert 0 < ttl_seconds <= 60
+
+    def test_invalidate_bumps_shared_generation(self):
+        """
+        Invalidates through one worker's backend, expecting another worker's
+        backend on the same server to see the new generation.
+        """
+        server = fakeredis.FakeServer()
+        first_backend = get_redis_backend(server)
+        second_backend = get_redis_backend(server)
+        old_generation = async_to_sync(second_backend.get_generation)()
+
+        async_to_sync(first_backend.invalidate)()
+
+        assert async_to_sync(
+            second_backend.get_generation)() == old_generation + 1
+
+    def test_invalidate_reaches_every_response_cache(self):
+        """
+        Caches a response through two response caches on the same server,
+        then invalidates through one, expecting the other to compute the
+        response again instead of serving the stale one.
+        """
+        server = fakeredis.FakeServer()
+        first_cache = ResponseCache(get_redis_backend(server), 60)
+        second_cache = ResponseCache(get_redis_backend(server), 60)
+        computed_counts = []
+
+        async def compute_response() -> CountedResponse:
+            computed_counts.append(len(computed_counts))
+            return CountedResponse(count=len(computed_counts))
+
+        def get_or_compute(cache: ResponseCache) -> str:
+            return async_to_sync(cache.get_or_compute)(
+                "search", {"keyword": "event"}, compute_response)
+
+        first_json = get_or_compute(first_cache)
+        cached_json = get_or_compute(second_cache)
+        async_to_sync(first_cache.invalidate)()
+        recomputed_json = get_or_compute(second_cache)
+
+        assert cached_json == first_json
+        assert second_cache.get_stats() == {"hits": 1, "misses": 1}
+        assert recomputed_json == CountedResponse(count=2).json()
+
+    def test_unreachable_server_skips_cache(self):
+        """
+        Uses a server that's down, expecting misses and no errors.
+        """
+        server = fakeredis.FakeServer()
+        server.connected = False
+        backend = get_redis_backend(server)
+
+        async_to_sync(backend.set)("key", "{}", 60)
+
+        assert async_to_sync(backend.get)("key") is None
+        assert async_to_sync(backend.get_generation)() == 0
+
+
+class TestEventResponseCache:
+    def test_repeated_search_is_cached(self,
+                                       registered_event: event_models.Event):
+        """
+        Searches for the same event twice, the second time with different
+        case and spacing, expecting the second search to hit the cache.
+        """
+        first_response = search_events(registered_event.title)
+        second_response = search_events(
+            f"  {registered_event.title.upper()} ")
+
+        assert first_response.status_code == 200
+        assert second_response.json() == first_response.json()
+        assert EVENT_RESPONSE_CACHE.get_stats() == {"hits": 1, "misses": 1}
+
+    def test_register_event_invalidates(
+            self, unregistered_event: event_models.Event):
+        """
+        Searches for an event before it's registered, then registers it,
+        expecting the next search to find it instead of the cached miss.
+        """
+        empty_response = search_events(unregistered_event.title)
+        async_to_sync(event_utils.register_event)(unregistered_event)
+        response = search_events(unregistered_event.title)
+
+        assert not empty_response.json()["events"]
+        assert get_event_ids_from_response(response) == [
+            unregistered_event.get_id()
+        ]
+
+    def test_approval_decision_invalidates(
+            self, unapproved_event_factory: Any):
+        """
+        Caches a location query, then approves an event,
+        expecting the next query to be computed again.
+        """
+        event = unapproved_event_factory()
+        location = event.location
+        params = {"lat": location.latitude, "lon": location.longitude}
+        client.get("/events/location", params=params)
+
+        async_to_sync(event_utils.change_event_approval)(event.get_id(), True)
+        client.get("/events/location", params=params)
+
+        assert EVENT_RESPONSE_CACHE.get_stats() == {"hits": 0, "misses": 2}
+
+    def test_invalid_document_not_cached(
+            self, registered_event: event_models.Event):
+        """
+        Strips a required field from a stored event, expecting the listing
+        holding it to fail validation instead of being cached.
+        """
+        events_collection = get_database()[get_database_client_name()].events
+        events_collection.update_one({"_id": registered_event.get_id()},
+                                     {"$unset": {
+                                         "title": ""
+                                     }})
+        location = registered_event.location
+        origin = (location.latitude, location.longitude)
+
+        with pytest.raises(ValidationError):
+            async_to_sync(event_utils.get_events_by_location_json)(origin, 10)
+
+        assert not EVENT_RESPONSE_CACHE.backend.entries
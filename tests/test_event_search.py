@@ -1,11 +1,15 @@
 # pylint: disable=no-self-use
 #       - pylint test classes must pass self, even if unused.
+# pylint: disable=invalid-name
+#       - this module has some pretty verbose names,
+#         shrinking them feels worse than disabling this lint.
 # pylint: disable=logging-fstring-interpolation
 #       - honestly just annoying to use lazy(%) interpolation.
 """
 Holds endpoint tests for searching events in the database
 """
 import logging
+from typing import Callable, List
 from fastapi.testclient import TestClient
 from requests.models import Response as HTTPResponse
 
@@ -16,18 +20,17 @@ from app import app
 client = TestClient(app)
 
 
-def check_search_events_response_valid(  # pylint: disable=invalid-name
-        response: HTTPResponse, search_form) -> bool:
+def check_search_events_response_valid(
+        response: HTTPResponse, expected_event: event_models.Event) -> bool:
     """
     Takes the server response for the endpoint and checks
-    if the event returned contains the keyword
+    that the expected event was returned as the best match
     """
     try:
         assert response.status_code == 200
         events = response.json()["events"]
-        for event in events:
-            assert event["title"] == search_form["keyword"] or \
-                event["description"] == search_form["keyword"]
+        assert events
+        assert events[0]["event_id"] == expected_event.get_id()
         return True
     except AssertionError as assert_error:
         debug_msg = f"failed at: {assert_error}, resp json: {response.json()}"
@@ -35,12 +38,20 @@ def check_search_events_response_valid(  # pylint: disable=invalid-name
         return False
 
 
+def get_event_ids_from_response(response: HTTPResponse) -> List[str]:
+    """
+    Returns the list of event ids in the response, in order.
+    """
+    return [event["event_id"] for event in response.json()["events"]]
+
+
 def search_events_endpoint_url() -> str:
     """
     Returns endpoint url string
     """
     return "/events/search"
 
+
 class TestSearchEvents:
     def test_search_events_by_title(self,
                                     registered_event: event_models.Event):
@@ -51,11 +62,11 @@ class TestSearchEvents:
         search_form = event_models.EventSearchForm(
             keyword=registered_event.title)
         endpoint_url = search_events_endpoint_url()
-        response = client.post(endpoint_url, json = search_form.dict())
-        assert check_search_events_response_valid(response, search_form.dict())
+        response = client.post(endpoint_url, json=search_form.dict())
+        assert check_search_events_response_valid(response, registered_event)
 
     def test_search_events_description(self,
-                                    registered_event: event_models.Event):
+                                       registered_event: event_models.Event):
         """
         Registers a random event, then tries to search it back by its
         description and check it, expecting success.
@@ -63,18 +74,52 @@ class TestSearchEvents:
         search_form = event_models.EventSearchForm(
             keyword=registered_event.description)
         endpoint_url = search_events_endpoint_url()
-        response = client.post(endpoint_url, json = search_form.dict())
-        assert check_search_events_response_valid(response, search_form.dict())
+        response = client.post(endpoint_url, json=search_form.dict())
+        assert check_search_events_response_valid(response, registered_event)
 
     def test_search_events_not_found(self):
         """
         Tries to search for an event with a random string, expecting
         an empty response.
         """
-        search_form = event_models.EventSearchForm(
-            keyword="Random string")
+        search_form = event_models.EventSearchForm(keyword="Random string")
         endpoint_url = search_events_endpoint_url()
-        response = client.post(endpoint_url, json = search_form.dict())
+        response = client.post(endpoint_url, json=search_form.dict())
         logging.debug(response.json())
         assert response.status_code == 200
         assert len(response.json()["events"]) == 0
+
+    def test_search_events_limit_and_offset(
+            self, registered_event_factory: Callable[[], event_models.Event]):
+        """
+        Registers a few events and searches for all of them at once, then
+        pages through the results, expecting disjoint, limit-sized pages.
+        """
+        events = [registered_event_factory() for _ in range(4)]
+        keyword = " ".join(event.title for event in events)
+        endpoint_url = search_events_endpoint_url()
+
+        first_page_form = event_models.EventSearchForm(keyword=keyword,
+                                                       limit=2)
+        first_page = client.post(endpoint_url, json=first_page_form.dict())
+
+        second_page_form = event_models.EventSearchForm(keyword=keyword,
+                                                        limit=2,
+                                                        offset=2)
+        second_page = client.post(endpoint_url, json=second_page_form.dict())
+
+        first_page_ids = get_event_ids_from_response(first_page)
+        second_page_ids = get_event_ids_from_response(second_page)
+
+        assert len(first_page_ids) == 2
+        assert len(second_page_ids) == 2
+        assert not set(first_page_ids).intersection(second_page_ids)
+
+    def test_search_events_invalid_limit(self):
+        """
+        Tries to search with a limit of zero, expecting failure.
+        """
+        search_json = {"keyword": "Random string", "limit": 0}
+        endpoint_url = search_events_endpoint_url()
+        response = client.post(endpoint_url, json=search_json)
+        assert response.status_code == 422
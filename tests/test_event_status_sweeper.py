@@ -0,0 +1,345 @@
+# pylint: disable=no-self-use
+#       - pylint test classes must pass self, even if unused.
+# pylint: disable=invalid-name
+#       - this module has some pretty verbose names,
+#         shrinking them feels worse than disabling this lint.
+"""
+Tests for the background sweeper that moves events along their
+lifecycle statuses, and for reads staying free of writes.
+"""
+import asyncio
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List
+
+from asgiref.sync import async_to_sync
+from fastapi.testclient import TestClient
+
+from app import app
+import models.events as event_models
+import models.users as user_models
+import util.events as event_utils
+import util.users as user_utils
+import util.leases as lease_utils
+
+client = TestClient(app)
+
+EventFactory = Callable[
+    [event_models.EventStatusEnum, datetime, datetime], event_models.Event]
+
+
+def get_stored_status(event: event_models.Event) -> str:
+    """
+    Returns the raw status string stored in the database for the event.
+    """
+    event_document = async_to_sync(event_utils.events_collection().find_one)(
+        {"_id": event.get_id()})
+    return event_document["status"]
+
+
+def get_past_date_range() -> tuple:
+    """
+    Returns a (start, end) date range that already ended.
+    """
+    present = datetime.utcnow()
+    return present - timedelta(days=2), present - timedelta(days=1)
+
+
+def get_current_date_range() -> tuple:
+    """
+    Returns a (start, end) date range that is happening right now.
+    """
+    present = datetime.utcnow()
+    return present - timedelta(hours=1), present + timedelta(days=1)
+
+
+def get_future_date_range() -> tuple:
+    """
+    Returns a (start, end) date range that hasn't started yet.
+    """
+    present = datetime.utcnow()
+    return present + timedelta(days=1), present + timedelta(days=2)
+
+
+async def run_sweeper_briefly() -> None:
+    """
+    Starts the sweeper on the current loop, lets it sweep
+    once and then stops it.
+    """
+    await event_utils.start_event_status_sweeper()
+    await asyncio.sleep(0.5)
+    await event_utils.stop_event_status_sweeper()
+
+
+def hold_sweeper_lease_elsewhere(expires_at: datetime) -> None:
+    """
+    Stores the sweeper's lease as held by some other
+    process until the given time.
+    """
+    async_to_sync(lease_utils.leases_collection().update_one)(
+        {"_id": event_utils.EVENT_STATUS_SWEEPER_LEASE},
+        {"$set": {
+            "holder_id": "other-host:1",
+            "expires_at": expires_at
+        }},
+        upsert=True)
+
+
+def get_stored_user(user: user_models.User) -> user_models.User:
+    identifier = user_models.UserIdentifier(user_id=user.get_id())
+    return async_to_sync(user_utils.get_user_info_by_identifier)(identifier)
+
+
+class TestEventStatusSweeper:
+    def test_sweep_moves_events_along_lifecycle(
+            self, event_with_dates_factory: EventFactory):
+        """
+        Inserts events whose dates call for every status change and sweeps,
+        expecting each one to end up with the status its dates call for.
+        """
+        status_enum = event_models.EventStatusEnum
+        ended_active = event_with_dates_factory(
+            status_enum.active, *get_past_date_range())
+        ended_ongoing = event_with_dates_factory(
+            status_enum.ongoing, *get_past_date_range())
+        started_active = event_with_dates_factory(
+            status_enum.active, *get_current_date_range())
+        upcoming_active = event_with_dates_factory(
+            status_enum.active, *get_future_date_range())
+        ended_cancelled = event_with_dates_factory(
+            status_enum.cancelled, *get_past_date_range())
+
+        sweep_counts = async_to_sync(event_utils.sweep_event_statuses)()
+
+        assert sweep_counts == {"expired": 2, "ongoing": 1, "archived": 0}
+        assert get_stored_status(ended_active) == "expired"
+        assert get_stored_status(ended_ongoing) == "expired"
+        assert get_stored_status(started_active) == "ongoing"
+        assert get_stored_status(upcoming_active) == "active"
+        assert get_stored_status(ended_cancelled) == "cancelled"
+
+    def test_get_event_by_id_does_not_write(
+            self, event_with_dates_factory: EventFactory):
+        """
+        Reads an event that ended but wasn't swept yet, expecting the
+        expired status back while the stored status stays untouched.
+        """
+        event = event_with_dates_factory(
+            event_models.EventStatusEnum.active, *get_past_date_range())
+
+        found_event = async_to_sync(event_utils.get_event_by_id)(
+            event.get_id())
+
+        assert found_event.status == "expired"
+        assert get_stored_status(event) == "active"
+
+    def test_status_at_time_is_always_a_name(
+            self, registered_event: event_models.Event):
+        """
+        Computes the status of a constructed response holding the stored
+        status name, and of an event holding the enum member, while both
+        are going on, expecting the `ongoing` name for both.
+        """
+        event_document = async_to_sync(
+            event_utils.events_collection().find_one)(
+                {"_id": registered_event.get_id()})
+        event_response = event_models.EventQueryResponse.from_database_document(
+            {
+                **event_document, "status": "active"
+            })
+        registered_event.status = event_models.EventStatusEnum.active
+        moment = registered_event.date_time_start + (
+            registered_event.date_time_end -
+            registered_event.date_time_start) / 2
+
+        for event in (event_response, registered_event):
+            status = async_to_sync(event_utils.get_event_status_at_time)(
+                event, moment)
+            assert status == "ongoing"
+
+    def test_sweeper_task_sweeps_until_stopped(
+            self, event_with_dates_factory: EventFactory):
+        """
+        Runs the sweeper task briefly, expecting it to have swept
+        and to be gone after stopping it.
+        """
+        event = event_with_dates_factory(
+            event_models.EventStatusEnum.active, *get_past_date_range())
+
+        async_to_sync(run_sweeper_briefly)()
+
+        assert get_stored_status(event) == "expired"
+        assert event_utils.EVENT_STATUS_SWEEPER_TASK is None
+
+    def test_sweeper_skips_without_lease(
+            self, event_with_dates_factory: EventFactory):
+        """
+        Runs the sweeper task briefly while another process holds the
+        sweeper's lease, expecting nothing to be swept.
+        """
+        event = event_with_dates_factory(
+            event_models.EventStatusEnum.active, *get_past_date_range())
+        hold_sweeper_lease_elsewhere(datetime.utcnow() + timedelta(hours=1))
+
+        async_to_sync(run_sweeper_briefly)()
+
+        assert get_stored_status(event) == "active"
+
+    def test_sweeper_takes_over_expired_lease(
+            self, event_with_dates_factory: EventFactory):
+        """
+        Runs the sweeper task briefly after another process' lease ran
+        out, expecting it to sweep and give the lease up once stopped.
+        """
+        event = event_with_dates_factory(
+            event_models.EventStatusEnum.active, *get_past_date_range())
+        hold_sweeper_lease_elsewhere(datetime.utcnow() - timedelta(seconds=1))
+
+        async_to_sync(run_sweeper_briefly)()
+
+        assert get_stored_status(event) == "expired"
+        assert not async_to_sync(
+            lease_utils.leases_collection().count_documents)({})
+
+    def test_lease_held_by_one_process(self):
+        """
+        Takes a lease, renews it, and then tries to take it while another
+        process holds it, expecting only the last attempt to fail.
+        """
+        lease_name = event_utils.EVENT_STATUS_SWEEPER_LEASE
+        try_acquire_lease = async_to_sync(lease_utils.try_acquire_lease)
+
+        assert try_acquire_lease(lease_name, 60)
+        assert try_acquire_lease(lease_name, 60)
+
+        hold_sweeper_lease_elsewhere(datetime.utcnow() + timedelta(hours=1))
+        assert not try_acquire_lease(lease_name, 60)
+
+    def test_sweep_archives_ended_events_for_users(
+            self, event_with_dates_factory: EventFactory,
+            registered_user_factory: Callable[[], user_models.User]):
+        """
+        Sweeps an ended event that two users have visible (next to one
+        that's still going), expecting only the ended one archived for both.
+        """
+        status_enum = event_models.EventStatusEnum
+        ended_event = event_with_dates_factory(status_enum.active,
+                                               *get_past_date_range())
+        current_event = event_with_dates_factory(status_enum.active,
+                                                 *get_current_date_range())
+        users = [registered_user_factory() for _ in range(2)]
+        add_event_to_user_visible = async_to_sync(
+            user_utils.add_event_to_user_visible)
+        for user in users:
+            add_event_to_user_visible(user.get_id(), ended_event.get_id())
+            add_event_to_user_visible(user.get_id(), current_event.get_id())
+
+        sweep_counts = async_to_sync(event_utils.sweep_event_statuses)()
+        repeat_sweep_counts = async_to_sync(event_utils.sweep_event_statuses)()
+
+        assert sweep_counts["archived"] == 2
+        assert repeat_sweep_counts["archived"] == 0
+        for user in users:
+            stored_user = get_stored_user(user)
+            assert stored_user.events_visible == [current_event.get_id()]
+            assert stored_user.events_archived == [ended_event.get_id()]
+
+    def test_sweep_expires_in_bounded_batches(
+            self, event_with_dates_factory: EventFactory,
+            registered_user: user_models.User, monkeypatch: Any):
+        """
+        Sweeps five ended events with a batch size of two, expecting
+        them archived and expired in batches of at most two ids.
+        """
+        monkeypatch.setattr(event_utils, "EVENTS_EXPORT_BATCH_SIZE", 2)
+        ended_events = [
+            event_with_dates_factory(event_models.EventStatusEnum.active,
+                                     *get_past_date_range())
+            for _ in range(5)
+        ]
+        for event in ended_events:
+            async_to_sync(user_utils.add_event_to_user_visible)(
+                registered_user.get_id(), event.get_id())
+
+        archived_batch_sizes = []
+        archive_events_for_all_users = user_utils.archive_events_for_all_users
+
+        async def count_archived_batch(event_ids: List[str]) -> int:
+            archived_batch_sizes.append(len(event_ids))
+            return await archive_events_for_all_users(event_ids)
+
+        monkeypatch.setattr(user_utils, "archive_events_for_all_users",
+                            count_archived_batch)
+
+        sweep_counts = async_to_sync(event_utils.sweep_event_statuses)()
+
+        assert sorted(archived_batch_sizes) == [1, 2, 2]
+        assert sweep_counts["expired"] == 5
+        assert sweep_counts["archived"] == 5
+        assert all(
+            get_stored_status(event) == "expired" for event in ended_events)
+        assert not get_stored_user(registered_user).events_visible
+
+    def test_archive_ended_events_reconciles_unarchived(
+            self, event_with_dates_factory: EventFactory,
+            registered_user: user_models.User):
+        """
+        Seeds an already expired and an already cancelled event that the
+        user still has visible, next to an active one, expecting startup
+        reconciliation to archive only the ended ones, once.
+        """
+        status_enum = event_models.EventStatusEnum
+        expired_event = event_with_dates_factory(status_enum.expired,
+                                                 *get_past_date_range())
+        cancelled_event = event_with_dates_factory(status_enum.cancelled,
+                                                   *get_future_date_range())
+        active_event = event_with_dates_factory(status_enum.active,
+                                                *get_future_date_range())
+        for event in (expired_event, cancelled_event, active_event):
+            async_to_sync(user_utils.add_event_to_user_visible)(
+                registered_user.get_id(), event.get_id())
+
+        async_to_sync(event_utils.archive_ended_events)()
+        async_to_sync(event_utils.archive_ended_events)()
+
+        stored_user = get_stored_user(registered_user)
+        assert stored_user.events_visible == [active_event.get_id()]
+        assert sorted(stored_user.events_archived) == sorted(
+            [expired_event.get_id(),
+             cancelled_event.get_id()])
+
+    def test_get_event_endpoint_does_not_touch_users(
+            self, event_with_dates_factory: EventFactory,
+            registered_user: user_models.User,
+            get_header_dict_from_user: Callable[[user_models.User],
+                                                Dict[str, Any]],
+            counting_users_collection: Any):
+        """
+        Gets an ended (but not yet swept) event the user has visible while
+        sending the user's token, expecting no user reads or archiving.
+        """
+        event = event_with_dates_factory(
+            event_models.EventStatusEnum.active, *get_past_date_range())
+        async_to_sync(user_utils.add_event_to_user_visible)(
+            registered_user.get_id(), event.get_id())
+        header_dict = get_header_dict_from_user(registered_user)
+        counting_users_collection.find_one_calls = 0
+
+        response = client.get(f"/events/get/{event.get_id()}",
+                              headers=header_dict)
+
+        assert response.json()["status"] == "expired"
+        assert counting_users_collection.find_one_calls == 0
+        assert event.get_id() in get_stored_user(
+            registered_user).events_visible
+
+    def test_get_event_endpoint_rejects_invalid_token(
+            self, registered_event: event_models.Event,
+            invalid_token_header_dict: Dict[str, Any]):
+        """
+        Gets an event while sending a token that can't be decoded,
+        expecting a 401 rather than the token being ignored.
+        """
+        response = client.get(f"/events/get/{registered_event.get_id()}",
+                              headers=invalid_token_header_dict)
+
+        assert response.status_code == 401
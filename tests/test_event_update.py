@@ -40,7 +40,7 @@ class TestEventUpdate:
         time.sleep(1)
 
         updated_event = async_to_sync(util_events.get_event_by_id)(event_id)
-        assert updated_event.status == event_models.EventStatusEnum.expired
+        assert updated_event.status == "expired"
 
         new_user_data = async_to_sync(
             user_utils.get_user_info_by_identifier)(identifier)
@@ -48,12 +48,12 @@ class TestEventUpdate:
         assert event_id in new_user_data.events_visible
         assert event_id not in new_user_data.events_archived
 
-        async_to_sync(user_utils.archive_user_event)(new_user_data.get_id(),
-                                                     updated_event)
+        sweep_counts = async_to_sync(util_events.sweep_event_statuses)()
 
         new_user_data = async_to_sync(
             user_utils.get_user_info_by_identifier)(identifier)
 
+        assert sweep_counts["archived"] == 1
         assert event_id not in new_user_data.events_visible
         assert event_id in new_user_data.events_archived
 
@@ -9,12 +9,15 @@
 Endpoint tests for get event by location query.
 """
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, Callable, List
+from asgiref.sync import async_to_sync
 from fastapi.testclient import TestClient
 from requests.models import Response as HTTPResponse
 
 from app import app
+import util.events as event_utils
 import models.events as event_models
+from config.db import get_database, get_database_client_name
 
 client = TestClient(app)
 
@@ -73,6 +76,13 @@ def get_invalid_query_from_event(event_form: event_models.Event,
     return bad_query_data
 
 
+def get_event_ids_from_response(response: HTTPResponse) -> List[str]:
+    """
+    Returns the list of event ids in the response, in order.
+    """
+    return [event["event_id"] for event in response.json()["events"]]
+
+
 class TestEventsLocation:
     def test_events_location_success(self,
                                      registered_event: event_models.Event):
@@ -125,3 +135,63 @@ class TestEventsLocation:
 
         assert not check_event_locations_response_valid(response)
         assert response.status_code == 422
+
+    def test_events_location_excludes_far_events(
+            self, registered_event_factory: Callable[[], event_models.Event]):
+        """
+        Registers two events at random places and queries around the first
+        one with a small radius, expecting only the first one back.
+        """
+        nearby_event = registered_event_factory()
+        registered_event_factory()
+
+        radius = 10
+        query_data = get_location_query_from_event(nearby_event, radius)
+        endpoint_url = get_query_event_location_url()
+        response = client.get(endpoint_url, params=query_data)
+
+        assert check_event_locations_response_valid(response)
+        assert get_event_ids_from_response(response) == [nearby_event.id]
+
+    def test_events_location_negative_radius_failure(
+            self, registered_event: event_models.Event):
+        """
+        Tries to query with a negative radius, expecting failure
+        """
+        negative_radius = -1
+        query_data = get_location_query_from_event(registered_event,
+                                                   negative_radius)
+
+        endpoint_url = get_query_event_location_url()
+        response = client.get(endpoint_url, params=query_data)
+
+        assert response.status_code == 422
+
+    def test_legacy_event_found_after_backfill(
+            self, registered_event: event_models.Event):
+        """
+        Strips an event back to it's legacy form without a GeoJSON point,
+        expecting location queries to miss it until the backfill runs.
+        """
+        events_collection = get_database()[get_database_client_name()].events
+        events_collection.update_one({"_id": registered_event.get_id()},
+                                     {"$unset": {
+                                         "location_point": ""
+                                     }})
+        query_data = get_location_query_from_event(registered_event, 10)
+        endpoint_url = get_query_event_location_url()
+
+        legacy_response = client.get(endpoint_url, params=query_data)
+        async_to_sync(event_utils.backfill_event_location_points)()
+        response = client.get(endpoint_url, params=query_data)
+
+        assert not legacy_response.json()["events"]
+        assert get_event_ids_from_response(response) == [
+            registered_event.get_id()
+        ]
+        stored_event = events_collection.find_one(
+            {"_id": registered_event.get_id()})
+        assert stored_event["location_point"]["coordinates"] == [
+            registered_event.location.longitude,
+            registered_event.location.latitude
+        ]
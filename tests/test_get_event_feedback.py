@@ -0,0 +1,209 @@
+# pylint: disable=no-self-use
+#       - pylint test classes must pass self, even if unused.
+# pylint: disable=invalid-name
+#       - this module has some pretty verbose names,
+#         shrinking them feels worse than disabling this lint.
+"""
+Endpoint tests for listing the feedback on an event.
+"""
+from datetime import datetime, timedelta
+from typing import Any, Dict, List
+
+from asgiref.sync import async_to_sync
+from fastapi.testclient import TestClient
+
+from app import app
+import models.events as event_models
+import models.feedback as feedback_models
+import util.feedback as feedback_utils
+from config.db import get_database, get_database_client_name
+
+client = TestClient(app)
+
+
+def get_event_feedback_endpoint_url(event_id: str) -> str:
+    return f"/events/{event_id}/feedback"
+
+
+def register_feedback_on_event(event: event_models.Event,
+                               feedback_count: int) -> List[str]:
+    """
+    Registers the amount of feedback on the event,
+    returning the feedback ids.
+    """
+    register_feedback = async_to_sync(feedback_utils.register_feedback)
+    return [
+        register_feedback(
+            feedback_models.FeedbackRegistrationRequest(
+                event_id=event.get_id(),
+                comment=f"comment {index}",
+                creator_id=event.creator_id))
+        for index in range(feedback_count)
+    ]
+
+
+def get_event_feedback(event_id: str, **params) -> Any:
+    return client.get(get_event_feedback_endpoint_url(event_id),
+                      params=params)
+
+
+def get_all_listed_feedback_ids(event_id: str, limit: int) -> List[str]:
+    """
+    Pages through the event's feedback, returning every listed id in order.
+    """
+    listed_feedback_ids = []
+    params = {"limit": limit}
+    while True:
+        response = get_event_feedback(event_id, **params)
+        assert response.status_code == 200
+        listed_feedback_ids.extend(
+            feedback["feedback_id"] for feedback in response.json()["feedback"])
+
+        if not response.json()["continuation_token"]:
+            return listed_feedback_ids
+        params["continuation_token"] = response.json()["continuation_token"]
+
+
+def set_feedback_created_at(feedback_id: str, created_at: Any) -> None:
+    """
+    Overwrites the stored creation time of the feedback,
+    unsetting it for `None` to make it look like legacy feedback.
+    """
+    feedback_collection = get_database()[get_database_client_name()].feedback
+    if created_at is None:
+        update_dict = {"$unset": {"created_at": ""}}
+    else:
+        update_dict = {"$set": {"created_at": created_at}}
+    feedback_collection.update_one({"_id": feedback_id}, update_dict)
+
+
+class TestGetEventFeedback:
+    def test_get_all_pages(self, registered_event: event_models.Event):
+        """
+        Pages through 25 pieces of feedback 10 at a time, expecting
+        three pages holding every piece exactly once.
+        """
+        feedback_ids = register_feedback_on_event(registered_event, 25)
+
+        pages: List[Dict[str, Any]] = []
+        continuation_token = None
+        while not pages or continuation_token:
+            params = {"limit": 10}
+            if continuation_token:
+                params["continuation_token"] = continuation_token
+            response = get_event_feedback(registered_event.get_id(),
+                                          **params)
+            assert response.status_code == 200
+            pages.append(response.json())
+            continuation_token = response.json()["continuation_token"]
+
+        listed_feedback_ids = [
+            feedback["feedback_id"] for page in pages
+            for feedback in page["feedback"]
+        ]
+        assert [len(page["feedback"]) for page in pages] == [10, 10, 5]
+        assert sorted(listed_feedback_ids) == sorted(feedback_ids)
+
+    def test_pages_in_creation_order(self,
+                                     registered_event: event_models.Event):
+        """
+        Gives some feedback creation times in the reverse of their id order,
+        expecting the pages to follow the creation times.
+        """
+        feedback_ids = sorted(register_feedback_on_event(registered_event, 5))
+        created_at = datetime(2021, 3, 1)
+        for index, feedback_id in enumerate(reversed(feedback_ids)):
+            set_feedback_created_at(feedback_id,
+                                    created_at + timedelta(minutes=index))
+
+        listed_feedback_ids = get_all_listed_feedback_ids(
+            registered_event.get_id(), limit=2)
+
+        assert listed_feedback_ids == list(reversed(feedback_ids))
+
+    def test_legacy_feedback_listed_first(
+            self, registered_event: event_models.Event):
+        """
+        Strips the creation time from some feedback, expecting it first
+        and paging to carry on into the feedback that has one.
+        """
+        feedback_ids = register_feedback_on_event(registered_event, 4)
+        legacy_feedback_ids = sorted(feedback_ids[:2])
+        for feedback_id in legacy_feedback_ids:
+            set_feedback_created_at(feedback_id, None)
+
+        listed_feedback_ids = get_all_listed_feedback_ids(
+            registered_event.get_id(), limit=1)
+
+        assert listed_feedback_ids[:2] == legacy_feedback_ids
+        assert sorted(listed_feedback_ids) == sorted(feedback_ids)
+
+    def test_feedback_fields(self, registered_event: event_models.Event):
+        """
+        Lists a single piece of feedback, expecting all of it's
+        public facing data.
+        """
+        feedback_id = register_feedback_on_event(registered_event, 1)[0]
+
+        response = get_event_feedback(registered_event.get_id())
+
+        assert response.status_code == 200
+        assert response.json()["feedback"] == [{
+            "feedback_id": feedback_id,
+            "event_id": registered_event.get_id(),
+            "comment": "comment 0",
+            "creator_id": registered_event.creator_id,
+        }]
+        assert response.json()["continuation_token"] is None
+
+    def test_other_events_feedback_excluded(
+            self, registered_event_factory: Any):
+        """
+        Registers feedback on two events, expecting each
+        event to only list it's own.
+        """
+        first_event = registered_event_factory()
+        second_event = registered_event_factory()
+        register_feedback_on_event(first_event, 3)
+        register_feedback_on_event(second_event, 2)
+
+        response = get_event_feedback(second_event.get_id())
+
+        assert len(response.json()["feedback"]) == 2
+
+    def test_event_without_feedback(self,
+                                    registered_event: event_models.Event):
+        """
+        Lists the feedback of an event that has none,
+        expecting an empty page.
+        """
+        response = get_event_feedback(registered_event.get_id())
+
+        assert response.status_code == 200
+        assert response.json()["feedback"] == []
+
+    def test_nonexistent_event(self, unregistered_event: event_models.Event):
+        """
+        Lists the feedback of an event that doesn't exist, expecting a 404.
+        """
+        response = get_event_feedback(unregistered_event.get_id())
+
+        assert response.status_code == 404
+
+    def test_bad_continuation_token(self,
+                                    registered_event: event_models.Event):
+        """
+        Sends a malformed continuation token, expecting a 422.
+        """
+        response = get_event_feedback(registered_event.get_id(),
+                                      continuation_token="not-a-token")
+
+        assert response.status_code == 422
+
+    def test_limit_too_large(self, registered_event: event_models.Event):
+        """
+        Asks for a page bigger than the max page size, expecting a 422.
+        """
+        response = get_event_feedback(registered_event.get_id(), limit=101)
+
+        assert response.status_code == 422
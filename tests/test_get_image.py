@@ -2,14 +2,22 @@
 #       - pylint test classes must pass self, even if unused.
 # pylint: disable=logging-fstring-interpolation
 #       - honestly just annoying to use lazy(%) interpolation.
+# pylint: disable=invalid-name
+#       - this module has some pretty verbose names,
+#         shrinking them feels worse than disabling this lint.
 """
 Endpoint tests for the get image endpoint
 """
+import io
 import logging
-from typing import Any, Dict
+from uuid import uuid4
+from typing import Any, Dict, List
+from PIL import Image
+from asgiref.sync import async_to_sync
 from fastapi.testclient import TestClient
 from requests.models import Response as HTTPResponse
 from app import app
+import util.images as image_utils
 
 client = TestClient(app)
 
@@ -44,6 +52,38 @@ def check_image_data_same(response: HTTPResponse,
     return original_image_data == response_image_data
 
 
+def get_original_image_bytes(image_data: Dict[str, Any]) -> bytes:
+    """
+    Returns the raw bytes of the originally uploaded image.
+    """
+    image_file = image_data["image_data"].file
+    image_file.seek(0)
+    return image_file.read()
+
+
+async def read_all_image_chunks(image_id: str) -> List[bytes]:
+    """
+    Streams the whole image through the chunk iterator,
+    returning every chunk yielded.
+    """
+    image_file = await image_utils.get_image_by_id(image_id)
+    chunk_iterator = image_utils.iterate_image_chunks(image_file)
+    return [chunk async for chunk in chunk_iterator]
+
+
+def register_wide_image() -> str:
+    """
+    Stores a 600x300 image straight into GridFS, returning it's id.
+    """
+    image_id = str(uuid4())
+    image_data_buffer = io.BytesIO()
+    Image.new('RGB', (600, 300), color='blue').save(image_data_buffer,
+                                                    format="PNG")
+    image_utils.grid_fs_client().put(image_data_buffer.getvalue(),
+                                     _id=image_id)
+    return image_id
+
+
 def get_image_endpoint_url() -> str:
     return "/images/get"
 
@@ -95,3 +135,237 @@ class TestImageQueryEndpoint:
         assert not check_get_image_resp_valid(response,
                                               nonexistent_image_data_and_id)
         assert response.status_code == 404
+
+    def test_get_image_sends_cache_headers(
+            self, registered_image_data_and_id: Dict[str, Any]):
+        """
+        Gets an image, expecting an ETag and caching headers.
+        """
+        params_dict = get_params_from_image_data(registered_image_data_and_id)
+        response = client.get(get_image_endpoint_url(), params=params_dict)
+
+        assert response.status_code == 200
+        assert response.headers["ETag"].startswith('"')
+        assert "max-age" in response.headers["Cache-Control"]
+        assert response.headers["Accept-Ranges"] == "bytes"
+
+    def test_get_image_if_none_match_not_modified(
+            self, registered_image_data_and_id: Dict[str, Any]):
+        """
+        Gets an image again sending back it's ETag,
+        expecting an empty 304.
+        """
+        params_dict = get_params_from_image_data(registered_image_data_and_id)
+        endpoint_url = get_image_endpoint_url()
+        etag = client.get(endpoint_url, params=params_dict).headers["ETag"]
+
+        response = client.get(endpoint_url,
+                              params=params_dict,
+                              headers={"If-None-Match": etag})
+
+        assert response.status_code == 304
+        assert not response.content
+        assert response.headers["ETag"] == etag
+
+    def test_get_image_stale_etag_sends_image(
+            self, registered_image_data_and_id: Dict[str, Any]):
+        """
+        Gets an image with an ETag that doesn't match, expecting the image.
+        """
+        params_dict = get_params_from_image_data(registered_image_data_and_id)
+        response = client.get(get_image_endpoint_url(),
+                              params=params_dict,
+                              headers={"If-None-Match": '"stale"'})
+
+        assert check_get_image_resp_valid(response,
+                                          registered_image_data_and_id)
+
+    def test_get_image_byte_range(
+            self, registered_image_data_and_id: Dict[str, Any]):
+        """
+        Asks for the first ten bytes of an image, expecting
+        a 206 with just those bytes.
+        """
+        params_dict = get_params_from_image_data(registered_image_data_and_id)
+        original_bytes = get_original_image_bytes(registered_image_data_and_id)
+
+        response = client.get(get_image_endpoint_url(),
+                              params=params_dict,
+                              headers={"Range": "bytes=0-9"})
+
+        assert response.status_code == 206
+        assert response.content == original_bytes[:10]
+        assert response.headers[
+            "Content-Range"] == f"bytes 0-9/{len(original_bytes)}"
+
+    def test_get_image_suffix_byte_range(
+            self, registered_image_data_and_id: Dict[str, Any]):
+        """
+        Asks for the last five bytes of an image, expecting a 206
+        with just those bytes.
+        """
+        params_dict = get_params_from_image_data(registered_image_data_and_id)
+        original_bytes = get_original_image_bytes(registered_image_data_and_id)
+
+        response = client.get(get_image_endpoint_url(),
+                              params=params_dict,
+                              headers={"Range": "bytes=-5"})
+
+        assert response.status_code == 206
+        assert response.content == original_bytes[-5:]
+
+    def test_get_image_unsatisfiable_range(
+            self, registered_image_data_and_id: Dict[str, Any]):
+        """
+        Asks for a range past the end of the image, expecting a 416.
+        """
+        params_dict = get_params_from_image_data(registered_image_data_and_id)
+        response = client.get(get_image_endpoint_url(),
+                              params=params_dict,
+                              headers={"Range": "bytes=999999-"})
+
+        assert response.status_code == 416
+
+    def test_get_image_malformed_range_ignored(
+            self, registered_image_data_and_id: Dict[str, Any]):
+        """
+        Sends a range header that can't be understood,
+        expecting the whole image back.
+        """
+        params_dict = get_params_from_image_data(registered_image_data_and_id)
+        response = client.get(get_image_endpoint_url(),
+                              params=params_dict,
+                              headers={"Range": "lines=1-2"})
+
+        assert check_get_image_resp_valid(response,
+                                          registered_image_data_and_id)
+
+    def test_image_streamed_one_chunk_at_a_time(self):
+        """
+        Stores a file spanning many small GridFS chunks, expecting the
+        iterator to yield it back chunk by chunk.
+        """
+        image_id = str(uuid4())
+        file_bytes = bytes(range(100))
+        image_utils.grid_fs_client().put(file_bytes,
+                                         _id=image_id,
+                                         chunkSize=16)
+
+        chunks = async_to_sync(read_all_image_chunks)(image_id)
+
+        assert b"".join(chunks) == file_bytes
+        assert max(len(chunk) for chunk in chunks) == 16
+
+    def test_get_resized_image_webp(self):
+        """
+        Asks for the small size of an image while accepting WebP, expecting
+        a WebP image shrunk to fit, keeping it's aspect ratio.
+        """
+        image_id = register_wide_image()
+        response = client.get(get_image_endpoint_url(),
+                              params={
+                                  "image_id": image_id,
+                                  "size": 128
+                              },
+                              headers={"Accept": "image/webp,*/*"})
+
+        assert response.status_code == 200
+        assert response.headers["Content-Type"] == "image/webp"
+        assert response.headers["Vary"] == "Accept"
+        with Image.open(io.BytesIO(response.content)) as resized_image:
+            assert resized_image.format == "WEBP"
+            assert resized_image.size == (128, 64)
+
+    def test_get_resized_image_jpeg_fallback(self):
+        """
+        Asks for a resized image without accepting WebP, expecting a JPEG.
+        """
+        image_id = register_wide_image()
+        response = client.get(get_image_endpoint_url(),
+                              params={
+                                  "image_id": image_id,
+                                  "size": 512
+                              })
+
+        assert response.status_code == 200
+        assert response.headers["Content-Type"] == "image/jpeg"
+        with Image.open(io.BytesIO(response.content)) as resized_image:
+            assert resized_image.format == "JPEG"
+            assert resized_image.size == (512, 256)
+
+    def test_get_resized_image_generated_once(self):
+        """
+        Asks for the same resized image twice, expecting the copy stored
+        the first time to be sent back the second time.
+        """
+        image_id = register_wide_image()
+        params_dict = {"image_id": image_id, "size": 128}
+
+        first_response = client.get(get_image_endpoint_url(),
+                                    params=params_dict)
+        stored_files_count = len(list(image_utils.grid_fs_client().find({})))
+        second_response = client.get(get_image_endpoint_url(),
+                                     params=params_dict)
+
+        assert first_response.content == second_response.content
+        assert first_response.headers["ETag"] == second_response.headers[
+            "ETag"]
+        stored_files = list(image_utils.grid_fs_client().find({}))
+        assert len(stored_files) == stored_files_count
+
+    def test_get_resized_image_not_enlarged(
+            self, registered_image_data_and_id: Dict[str, Any]):
+        """
+        Asks for a size bigger than the (60x30) image,
+        expecting it's dimensions to stay the same.
+        """
+        params_dict = get_params_from_image_data(registered_image_data_and_id)
+        params_dict["size"] = 1024
+        response = client.get(get_image_endpoint_url(), params=params_dict)
+
+        assert response.status_code == 200
+        with Image.open(io.BytesIO(response.content)) as resized_image:
+            assert resized_image.size == (60, 30)
+
+    def test_get_resized_image_bad_size(
+            self, registered_image_data_and_id: Dict[str, Any]):
+        """
+        Asks for a size that isn't offered, expecting a 422.
+        """
+        params_dict = get_params_from_image_data(registered_image_data_and_id)
+        params_dict["size"] = 100
+        response = client.get(get_image_endpoint_url(), params=params_dict)
+
+        assert response.status_code == 422
+
+    def test_get_resized_nonexistent_image(
+            self, nonexistent_image_data_and_id: Dict[str, Any]):
+        """
+        Asks for a resized copy of an image that doesn't exist,
+        expecting a 404.
+        """
+        params_dict = get_params_from_image_data(nonexistent_image_data_and_id)
+        params_dict["size"] = 128
+        response = client.get(get_image_endpoint_url(), params=params_dict)
+
+        assert response.status_code == 404
+
+    def test_resizing_pool_not_forked(self):
+        """
+        Starts the resizing pool the way app startup does, expecting
+        it's processes to be started without a plain fork.
+        """
+        image_utils.shutdown_image_resizing_pool()
+        image_utils.start_image_resizing_pool()
+
+        pool = image_utils.IMAGE_RESIZING_POOL
+        start_method = pool._mp_context.get_start_method()  # pylint: disable=protected-access
+        assert start_method in {"forkserver", "spawn"}
+
+        image_id = register_wide_image()
+        response = client.get(get_image_endpoint_url(),
+                              params={
+                                  "image_id": image_id,
+                                  "size": 128
+                              })
+        assert response.status_code == 200
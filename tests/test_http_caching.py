@@ -0,0 +1,154 @@
+# pylint: disable=no-self-use
+#       - pylint test classes must pass self, even if unused.
+# pylint: disable=invalid-name
+#       - this module has some pretty verbose names,
+#         shrinking them feels worse than disabling this lint.
+"""
+Tests for the write stamps on documents and the caching headers
+(ETag, Last-Modified and 304s) sent by read endpoints.
+"""
+from datetime import datetime, timedelta
+from typing import Callable
+
+from asgiref.sync import async_to_sync
+from fastapi.testclient import TestClient
+
+from app import app
+import util.events as event_utils
+import models.users as user_models
+import models.events as event_models
+import models.feedback as feedback_models
+
+client = TestClient(app)
+
+
+def get_event_url(event: event_models.Event) -> str:
+    return f"/events/get/{event.get_id()}"
+
+
+def get_stored_event(event_id: event_models.EventId) -> event_models.Event:
+    return async_to_sync(event_utils.get_event_by_id)(event_id)
+
+
+class TestWriteStamps:
+    def test_insert_stamps_document(self,
+                                    registered_event: event_models.Event):
+        """
+        Registers an event, expecting it to be stored as written once.
+        """
+        stored_event = get_stored_event(registered_event.get_id())
+
+        assert stored_event.version == 1
+        assert stored_event.updated_at
+
+    def test_update_bumps_stamp(self, unapproved_event_factory):
+        """
+        Approves an event, expecting it's version and
+        update time to move along.
+        """
+        event = unapproved_event_factory()
+        old_event = get_stored_event(event.get_id())
+
+        async_to_sync(event_utils.change_event_approval)(event.get_id(), True)
+        new_event = get_stored_event(event.get_id())
+
+        assert new_event.version == old_event.version + 1
+        assert new_event.updated_at >= old_event.updated_at
+
+
+class TestConditionalReads:
+    def test_event_read_has_caching_headers(
+            self, registered_event: event_models.Event):
+        """
+        Reads an event, expecting a strong ETag, a Last-Modified
+        date and a Cache-Control that makes clients revalidate.
+        """
+        response = client.get(get_event_url(registered_event))
+
+        assert response.status_code == 200
+        assert response.headers["ETag"].startswith('"')
+        assert response.headers["Last-Modified"].endswith("GMT")
+        assert response.headers["Cache-Control"] == "no-cache"
+
+    def test_event_read_not_modified(self,
+                                     registered_event: event_models.Event):
+        """
+        Reads an event again with it's ETag, expecting an empty 304.
+        """
+        first_response = client.get(get_event_url(registered_event))
+        etag = first_response.headers["ETag"]
+
+        response = client.get(get_event_url(registered_event),
+                              headers={"If-None-Match": etag})
+
+        assert response.status_code == 304
+        assert not response.content
+        assert response.headers["ETag"] == etag
+
+    def test_event_write_changes_etag(
+            self, event_with_dates_factory: Callable[..., event_models.Event]):
+        """
+        Reads an upcoming event, cancels it and revalidates, expecting
+        the full event back under a new ETag.
+        """
+        start_time = datetime.utcnow() + timedelta(days=1)
+        event = event_with_dates_factory(event_models.EventStatusEnum.active,
+                                         start_time,
+                                         start_time + timedelta(hours=2))
+        first_response = client.get(get_event_url(event))
+        etag = first_response.headers["ETag"]
+
+        async_to_sync(event_utils.update_event_status_enum_in_db)(
+            event, event_models.EventStatusEnum.cancelled)
+        response = client.get(get_event_url(event),
+                              headers={"If-None-Match": etag})
+
+        assert response.status_code == 200
+        assert response.headers["ETag"] != etag
+        assert response.json()["status"] == "cancelled"
+
+    def test_feedback_read_not_modified(
+            self, registered_feedback: feedback_models.Feedback):
+        """
+        Reads a feedback twice, the second time with it's ETag,
+        expecting a 304.
+        """
+        feedback_url = f"/feedback/{registered_feedback.get_id()}"
+        etag = client.get(feedback_url).headers["ETag"]
+
+        response = client.get(feedback_url, headers={"If-None-Match": etag})
+
+        assert response.status_code == 304
+
+    def test_event_feedback_page_not_modified(
+            self, registered_feedback: feedback_models.Feedback):
+        """
+        Lists an event's feedback twice, the second time with the
+        page's ETag, expecting a 304.
+        """
+        feedback_url = f"/events/{registered_feedback.event_id}/feedback"
+        first_response = client.get(feedback_url)
+        etag = first_response.headers["ETag"]
+
+        response = client.get(feedback_url, headers={"If-None-Match": etag})
+
+        assert len(first_response.json()["feedback"]) == 1
+        assert response.status_code == 304
+
+    def test_user_find_never_not_modified(
+            self, registered_user: user_models.User):
+        """
+        Finds a user with it's ETag, expecting the caching headers
+        but a full response, since the endpoint is a POST.
+        """
+        json_dict = {"user_id": registered_user.get_id()}
+        etag = client.post("/users/find", json=json_dict).headers["ETag"]
+
+        response = client.post("/users/find",
+                               json=json_dict,
+                               headers={"If-None-Match": etag})
+
+        assert response.status_code == 200
+        assert response.headers["ETag"] == etag
+        assert response.headers["Last-Modified"].endswith("GMT")
+        assert response.json()["first_name"] == registered_user.first_name
@@ -0,0 +1,241 @@
+# pylint: disable=no-self-use
+#       - pylint test classes must pass self, even if unused.
+# pylint: disable=invalid-name
+#       - this module has some pretty verbose names,
+#         shrinking them feels worse than disabling this lint.
+"""
+Tests for the in-process LRU cache of image data.
+"""
+from typing import Any, Dict
+
+from asgiref.sync import async_to_sync
+from fastapi.testclient import TestClient
+
+from app import app
+from config.db import get_database, get_database_client_name
+import util.images as image_utils
+import models.images as image_models
+from util.image_cache import ImageCache, IMAGE_CACHE, get_image_cache_key
+
+client = TestClient(app)
+
+
+def get_cached_image_of_size(length: int) -> image_models.CachedImage:
+    return image_models.CachedImage(data=b"x" * length, headers={})
+
+
+def get_image(image_id: str, **kwargs) -> Any:
+    return client.get("/images/get", params={"image_id": image_id, **kwargs})
+
+
+def get_image_cache_stats(header_dict: Dict[str, Any]) -> Any:
+    return client.get("/admin/image_cache/stats", headers=header_dict)
+
+
+class TestImageCache:
+    def test_evicts_least_recently_used_by_bytes(self):
+        """
+        Fills a 100 byte cache past it's limit after reading the oldest
+        entry, expecting the least recently read entry to be evicted.
+        """
+        image_cache = ImageCache(max_bytes=100)
+        image_cache.put(("first", None, None), get_cached_image_of_size(40))
+        image_cache.put(("second", None, None), get_cached_image_of_size(40))
+        image_cache.get(("first", None, None))
+
+        image_cache.put(("third", None, None), get_cached_image_of_size(40))
+
+        assert image_cache.get(("first", None, None))
+        assert not image_cache.get(("second", None, None))
+        assert image_cache.current_bytes == 80
+        assert image_cache.get_stats()["evictions"] == 1
+
+    def test_image_bigger_than_cache_not_cached(self):
+        """
+        Caches an image bigger than the whole cache, expecting it to be
+        skipped instead of evicting everything else.
+        """
+        image_cache = ImageCache(max_bytes=100)
+        image_cache.put(("small", None, None), get_cached_image_of_size(10))
+
+        image_cache.put(("huge", None, None), get_cached_image_of_size(101))
+
+        assert image_cache.get(("small", None, None))
+        assert not image_cache.get(("huge", None, None))
+
+    def test_invalidate_drops_resized_copies(self):
+        """
+        Invalidates an image with resized copies cached, expecting
+        all of them (and no other image) to be dropped.
+        """
+        image_cache = ImageCache(max_bytes=100)
+        image_cache.put(("image", None, None), get_cached_image_of_size(10))
+        image_cache.put(("image", 128, "WEBP"), get_cached_image_of_size(10))
+        image_cache.put(("other", None, None), get_cached_image_of_size(10))
+
+        image_cache.invalidate_image("image")
+
+        assert image_cache.get_stats()["entries"] == 1
+        assert image_cache.current_bytes == 10
+
+    def test_hit_miss_metrics(self, registered_image_data_and_id: Dict[str,
+                                                                      Any]):
+        """
+        Gets the same image twice, expecting a miss and then a hit.
+        """
+        image_id = registered_image_data_and_id["image_id"]
+        get_image(image_id)
+        get_image(image_id)
+
+        cache_stats = IMAGE_CACHE.get_stats()
+        assert cache_stats["misses"] == 1
+        assert cache_stats["hits"] == 1
+
+    def test_cached_image_served_without_database(
+            self, registered_image_data_and_id: Dict[str, Any]):
+        """
+        Gets an image, wipes the stored image data and gets it again,
+        expecting the same image served from the cache.
+        """
+        image_id = registered_image_data_and_id["image_id"]
+        first_response = get_image(image_id)
+
+        get_database()[get_database_client_name()]["fs.chunks"].delete_many(
+            {})
+        second_response = get_image(image_id)
+
+        assert second_response.status_code == 200
+        assert second_response.content == first_response.content
+        assert second_response.headers["ETag"] == first_response.headers[
+            "ETag"]
+
+    def test_cached_image_byte_range(
+            self, registered_image_data_and_id: Dict[str, Any]):
+        """
+        Asks for a byte range of a cached image, expecting only those bytes.
+        """
+        image_id = registered_image_data_and_id["image_id"]
+        full_image_bytes = get_image(image_id).content
+
+        response = client.get("/images/get",
+                              params={"image_id": image_id},
+                              headers={"Range": "bytes=2-5"})
+
+        assert response.status_code == 206
+        assert response.content == full_image_bytes[2:6]
+
+    def test_delete_invalidates_cache(
+            self, registered_image_data_and_id: Dict[str, Any]):
+        """
+        Gets an image and it's resized copy, then deletes the image,
+        expecting both to be dropped from the cache.
+        """
+        image_id = registered_image_data_and_id["image_id"]
+        get_image(image_id)
+        get_image(image_id, size=128)
+
+        async_to_sync(image_utils.delete_image)(image_id)
+
+        assert not IMAGE_CACHE.get(get_image_cache_key(image_id))
+        assert get_image(image_id).status_code == 404
+        assert get_image(image_id, size=128).status_code == 404
+
+    def test_large_image_streamed_not_cached(
+            self, monkeypatch: Any, registered_image_data_and_id: Dict[str,
+                                                                       Any]):
+        """
+        Gets an image bigger than the largest cacheable image, expecting
+        it to be streamed from GridFS and left out of the cache.
+        """
+        monkeypatch.setattr(image_utils, "IMAGE_CACHE_MAX_ITEM_BYTES", 0)
+        image_id = registered_image_data_and_id["image_id"]
+
+        response = client.get("/images/get",
+                              params={"image_id": image_id},
+                              headers={"Range": "bytes=0-3"})
+
+        assert response.status_code == 206
+        assert len(response.content) == 4
+        assert IMAGE_CACHE.get_stats()["entries"] == 0
+
+
+class TestImageCacheEndpoints:
+    def test_stats_endpoint(self, registered_image_data_and_id: Dict[str,
+                                                                      Any],
+                            valid_admin_header: Dict[str, Any]):
+        """
+        Gets an image twice, expecting the admin stats endpoint to
+        report one miss, one hit and the cached image.
+        """
+        image_id = registered_image_data_and_id["image_id"]
+        image_bytes = get_image(image_id).content
+        get_image(image_id)
+
+        response = get_image_cache_stats(valid_admin_header)
+
+        assert response.status_code == 200
+        assert response.json() == {
+            "hits": 1,
+            "misses": 1,
+            "evictions": 0,
+            "entries": 1,
+            "bytes": len(image_bytes),
+        }
+
+    def test_stats_endpoint_not_admin_failure(
+            self, valid_header_dict_with_user_id: Dict[str, Any]):
+        """
+        Asks for the stats with a regular user's token, expecting a 401.
+        """
+        response = get_image_cache_stats(valid_header_dict_with_user_id)
+
+        assert response.status_code == 401
+
+    def test_delete_endpoint_evicts_cached_image(
+            self, valid_image_data_byte_buffer: bytes,
+            valid_header_dict_with_user_id: Dict[str, Any]):
+        """
+        Uploads and gets an image, then deletes it through the endpoint,
+        expecting it to be evicted from the cache.
+        """
+        upload_response = client.post(
+            "/images/upload",
+            files={"file": valid_image_data_byte_buffer},
+            headers=valid_header_dict_with_user_id)
+        image_id = upload_response.json()["image_id"]
+        get_image(image_id)
+
+        delete_response = client.delete("/images/delete",
+                                        params={"image_id": image_id},
+                                        headers=valid_header_dict_with_user_id)
+
+        assert delete_response.status_code == 204
+        assert IMAGE_CACHE.get_stats()["entries"] == 0
+        assert get_image(image_id).status_code == 404
+
+    def test_other_worker_cache_stops_serving_deleted_image(
+            self, valid_image_data_byte_buffer: bytes,
+            valid_header_dict_with_user_id: Dict[str, Any], monkeypatch):
+        """
+        Caches an image, then deletes it while another cache instance
+        stands in for the one of the worker handling the delete,
+        expecting the first cache to stop serving the image.
+        """
+        upload_response = client.post(
+            "/images/upload",
+            files={"file": valid_image_data_byte_buffer},
+            headers=valid_header_dict_with_user_id)
+        image_id = upload_response.json()["image_id"]
+        get_image(image_id)
+
+        with monkeypatch.context() as patch:
+            patch.setattr(image_utils, "IMAGE_CACHE", ImageCache(1000))
+            delete_response = client.delete(
+                "/images/delete",
+                params={"image_id": image_id},
+                headers=valid_header_dict_with_user_id)
+
+        assert delete_response.status_code == 204
+        assert IMAGE_CACHE.get(get_image_cache_key(image_id))
+        assert get_image(image_id).status_code == 404
+        assert IMAGE_CACHE.get_stats()["entries"] == 0
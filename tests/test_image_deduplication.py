@@ -0,0 +1,241 @@
+# pylint: disable=no-self-use
+#       - pylint test classes must pass self, even if unused.
+# pylint: disable=invalid-name
+#       - this module has some pretty verbose names,
+#         shrinking them feels worse than disabling this lint.
+"""
+Tests for storing uploaded image data once per content hash.
+"""
+import hashlib
+from typing import Any, Callable, Dict
+
+from asgiref.sync import async_to_sync
+from fastapi.testclient import TestClient
+
+from app import app
+import util.images as image_utils
+import models.users as user_models
+
+client = TestClient(app)
+
+
+def upload_image_bytes(image_bytes: bytes, header_dict: Dict[str,
+                                                             Any]) -> str:
+    """
+    Uploads the image data through the endpoint, returning the image id.
+    """
+    response = client.post("/images/upload",
+                           files={"file": image_bytes},
+                           headers=header_dict)
+    assert response.status_code == 201
+    return response.json()["image_id"]
+
+
+def get_image(image_id: str, **kwargs) -> Any:
+    return client.get("/images/get", params={"image_id": image_id, **kwargs})
+
+
+def delete_image(image_id: str, header_dict: Dict[str, Any]) -> Any:
+    return client.delete("/images/delete",
+                         params={"image_id": image_id},
+                         headers=header_dict)
+
+
+def count_stored_files() -> int:
+    """
+    Returns the amount of files currently stored in GridFS.
+    """
+    return len(list(image_utils.grid_fs_client().find({})))
+
+
+def get_ref_count(image_bytes: bytes) -> int:
+    """
+    Returns how many images point to the stored copy of the data,
+    or 0 if there is no stored copy.
+    """
+    content_hash = hashlib.sha256(image_bytes).hexdigest()
+    image_content_document = async_to_sync(
+        image_utils.image_contents_collection().find_one)({
+            "_id": content_hash
+        })
+    return image_content_document["ref_count"] if image_content_document else 0
+
+
+class TestImageDeduplication:
+    def test_same_data_stored_once(self, valid_image_data_byte_buffer: bytes,
+                                   valid_header_dict_with_user_id: Dict[str,
+                                                                        Any]):
+        """
+        Uploads the same image twice, expecting two image ids
+        pointing to a single stored copy of the data.
+        """
+        first_image_id = upload_image_bytes(valid_image_data_byte_buffer,
+                                            valid_header_dict_with_user_id)
+        second_image_id = upload_image_bytes(valid_image_data_byte_buffer,
+                                             valid_header_dict_with_user_id)
+
+        assert first_image_id != second_image_id
+        assert count_stored_files() == 1
+        assert get_ref_count(valid_image_data_byte_buffer) == 2
+        assert get_image(first_image_id).content == get_image(
+            second_image_id).content
+
+    def test_content_hash_etag_immutable(
+            self, valid_image_data_byte_buffer: bytes,
+            valid_header_dict_with_user_id: Dict[str, Any]):
+        """
+        Gets an uploaded image, expecting it's SHA-256 as the ETag
+        and an immutable, long-lived Cache-Control.
+        """
+        image_id = upload_image_bytes(valid_image_data_byte_buffer,
+                                      valid_header_dict_with_user_id)
+        response = get_image(image_id)
+
+        content_hash = hashlib.sha256(valid_image_data_byte_buffer).hexdigest()
+        assert response.headers["ETag"] == f'"{content_hash}"'
+        assert "immutable" in response.headers["Cache-Control"]
+
+    def test_resized_copies_shared(self, valid_image_data_byte_buffer: bytes,
+                                   valid_header_dict_with_user_id: Dict[str,
+                                                                        Any]):
+        """
+        Asks for the same size of two images with the same data,
+        expecting only one resized copy to be made.
+        """
+        first_image_id = upload_image_bytes(valid_image_data_byte_buffer,
+                                            valid_header_dict_with_user_id)
+        second_image_id = upload_image_bytes(valid_image_data_byte_buffer,
+                                             valid_header_dict_with_user_id)
+
+        get_image(first_image_id, size=128)
+        get_image(second_image_id, size=128)
+
+        assert count_stored_files() == 2
+
+    def test_delete_keeps_shared_data(
+            self, valid_image_data_byte_buffer: bytes,
+            valid_header_dict_with_user_id: Dict[str, Any]):
+        """
+        Deletes one of two images with the same data, expecting
+        the other one to still be served.
+        """
+        first_image_id = upload_image_bytes(valid_image_data_byte_buffer,
+                                            valid_header_dict_with_user_id)
+        second_image_id = upload_image_bytes(valid_image_data_byte_buffer,
+                                             valid_header_dict_with_user_id)
+
+        async_to_sync(image_utils.delete_image)(first_image_id)
+
+        assert get_image(first_image_id).status_code == 404
+        assert get_image(second_image_id).status_code == 200
+        assert get_ref_count(valid_image_data_byte_buffer) == 1
+
+    def test_delete_last_reference_deletes_data(
+            self, valid_image_data_byte_buffer: bytes,
+            valid_header_dict_with_user_id: Dict[str, Any]):
+        """
+        Deletes the only image pointing to some data (after resizing
+        it), expecting the data and it's resized copy to be deleted.
+        """
+        image_id = upload_image_bytes(valid_image_data_byte_buffer,
+                                      valid_header_dict_with_user_id)
+        get_image(image_id, size=128)
+
+        async_to_sync(image_utils.delete_image)(image_id)
+
+        assert count_stored_files() == 0
+        assert get_ref_count(valid_image_data_byte_buffer) == 0
+
+    def test_reupload_after_delete(self, valid_image_data_byte_buffer: bytes,
+                                   valid_header_dict_with_user_id: Dict[str,
+                                                                        Any]):
+        """
+        Uploads some data again after it was deleted, expecting it
+        to be stored again.
+        """
+        image_id = upload_image_bytes(valid_image_data_byte_buffer,
+                                      valid_header_dict_with_user_id)
+        async_to_sync(image_utils.delete_image)(image_id)
+
+        new_image_id = upload_image_bytes(valid_image_data_byte_buffer,
+                                          valid_header_dict_with_user_id)
+
+        assert get_image(new_image_id).content == valid_image_data_byte_buffer
+        assert get_ref_count(valid_image_data_byte_buffer) == 1
+
+    def test_delete_image_stored_before_hashing(
+            self, valid_image_data_byte_buffer: bytes):
+        """
+        Deletes an image stored as a plain GridFS file (as they were
+        before content hashing), expecting it to be gone.
+        """
+        image_id = "pre-hashing-image-id"
+        image_utils.grid_fs_client().put(valid_image_data_byte_buffer,
+                                         _id=image_id)
+        assert get_image(image_id).status_code == 200
+
+        async_to_sync(image_utils.delete_image)(image_id)
+
+        assert get_image(image_id).status_code == 404
+
+
+class TestImageDeleteEndpoint:
+    def test_shared_data_kept_until_last_delete(
+            self, valid_image_data_byte_buffer: bytes,
+            valid_header_dict_with_user_id: Dict[str, Any]):
+        """
+        Uploads the same image twice and deletes both through the endpoint,
+        expecting the data to only go away with the last image.
+        """
+        first_image_id = upload_image_bytes(valid_image_data_byte_buffer,
+                                            valid_header_dict_with_user_id)
+        second_image_id = upload_image_bytes(valid_image_data_byte_buffer,
+                                             valid_header_dict_with_user_id)
+
+        first_response = delete_image(first_image_id,
+                                      valid_header_dict_with_user_id)
+
+        assert first_response.status_code == 204
+        assert get_image(second_image_id).content == \
+            valid_image_data_byte_buffer
+        assert count_stored_files() == 1
+
+        second_response = delete_image(second_image_id,
+                                       valid_header_dict_with_user_id)
+
+        assert second_response.status_code == 204
+        assert get_image(second_image_id).status_code == 404
+        assert count_stored_files() == 0
+        assert get_ref_count(valid_image_data_byte_buffer) == 0
+
+    def test_delete_by_other_user_failure(
+            self, valid_image_data_byte_buffer: bytes,
+            registered_user_factory: Callable[[], user_models.User],
+            get_header_dict_from_user: Callable[[user_models.User],
+                                                Dict[str, Any]]):
+        """
+        Tries to delete an image uploaded by someone else,
+        expecting a 401 and the image to still be served.
+        """
+        uploader_header = get_header_dict_from_user(registered_user_factory())
+        other_user_header = get_header_dict_from_user(
+            registered_user_factory())
+        image_id = upload_image_bytes(valid_image_data_byte_buffer,
+                                      uploader_header)
+
+        response = delete_image(image_id, other_user_header)
+
+        assert response.status_code == 401
+        assert get_image(image_id).status_code == 200
+        assert get_ref_count(valid_image_data_byte_buffer) == 1
+
+    def test_delete_nonexistent_image(
+            self, random_valid_uuid4_str: str,
+            valid_header_dict_with_user_id: Dict[str, Any]):
+        """
+        Tries to delete an image that doesn't exist, expecting a 404.
+        """
+        response = delete_image(random_valid_uuid4_str,
+                                valid_header_dict_with_user_id)
+
+        assert response.status_code == 404
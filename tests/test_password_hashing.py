@@ -0,0 +1,132 @@
+# pylint: disable=no-self-use
+#       - pylint test classes must pass self, even if unused.
+# pylint: disable=invalid-name
+#       - this module has some pretty verbose names,
+#         shrinking them feels worse than disabling this lint.
+"""
+Tests for the password hashing service in `util.passwords`.
+"""
+import asyncio
+from typing import List
+
+from asgiref.sync import async_to_sync
+from fastapi.testclient import TestClient
+
+from app import app
+from models import exceptions
+import util.passwords as password_utils
+import models.users as user_models
+
+client = TestClient(app)
+
+
+async def hash_passwords_concurrently(amount: int) -> List[object]:
+    """
+    Hashes `amount` passwords at once, returning every
+    result or exception raised.
+    """
+    return await asyncio.gather(
+        *[password_utils.hash_password("password") for _ in range(amount)],
+        return_exceptions=True)
+
+
+async def count_ticks_while_hashing() -> int:
+    """
+    Hashes a password while a ticker task runs on the event loop,
+    returning how many times the ticker ran.
+    """
+    ticks = 0
+
+    async def _ticker():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.001)
+
+    ticker_task = asyncio.ensure_future(_ticker())
+    await password_utils.hash_password("password")
+    ticker_task.cancel()
+
+    return ticks
+
+
+class TestPasswordHashing:
+    def test_hash_and_check_round_trip(self):
+        """
+        Hashes a password on the pool and checks both the right
+        and a wrong password against it.
+        """
+        stored_password = async_to_sync(password_utils.hash_password)("secret")
+
+        assert async_to_sync(password_utils.check_password_matches)(
+            "secret", stored_password)
+        assert not async_to_sync(password_utils.check_password_matches)(
+            "wrong", stored_password)
+
+    def test_hash_compatible_with_user_model(self,
+                                             unregistered_user:
+                                             user_models.User):
+        """
+        Hashes a password on the pool and stores it on a user, expecting
+        the model's own check to accept it.
+        """
+        unregistered_user.password = async_to_sync(
+            password_utils.hash_password)("secret")
+
+        assert unregistered_user.check_password("secret")
+
+    def test_pool_processes_not_forked(self):
+        """
+        Starts the pool the way app startup does, expecting it's
+        processes to be started without a plain fork.
+        """
+        password_utils.shutdown_password_hashing_pool()
+        password_utils.start_password_hashing_pool()
+
+        pool = password_utils.PASSWORD_HASHING_POOL
+        start_method = pool._mp_context.get_start_method()  # pylint: disable=protected-access
+        assert start_method in {"forkserver", "spawn"}
+        assert async_to_sync(password_utils.hash_password)("secret")
+
+    def test_hashing_does_not_block_event_loop(self):
+        """
+        Hashes a password, expecting other tasks on the event
+        loop to keep running meanwhile.
+        """
+        ticks = async_to_sync(count_ticks_while_hashing)()
+        assert ticks > 1
+
+    def test_saturated_pool_rejects_calls(self, monkeypatch):
+        """
+        Fires more hashing calls than the pool may hold at once,
+        expecting the overflow to be turned away as busy.
+        """
+        max_pending = 2
+        monkeypatch.setattr(password_utils, "PASSWORD_HASHING_MAX_PENDING",
+                            max_pending)
+
+        results = async_to_sync(hash_passwords_concurrently)(5)
+        rejected = [
+            result for result in results
+            if isinstance(result, exceptions.ServiceBusyException)
+        ]
+
+        assert len(rejected) == 5 - max_pending
+        assert password_utils.PENDING_PASSWORD_CALLS == 0
+
+    def test_saturated_pool_login_returns_429(
+            self, registered_user: user_models.User, monkeypatch):
+        """
+        Tries to log in while the pool is saturated, expecting a 429.
+        """
+        monkeypatch.setattr(password_utils, "PASSWORD_HASHING_MAX_PENDING", 0)
+
+        login_json = {
+            "identifier": {
+                "email": registered_user.email
+            },
+            "password": "whatever"
+        }
+        response = client.post("/users/login", json=login_json)
+
+        assert response.status_code == 429
@@ -0,0 +1,116 @@
+# pylint: disable=no-self-use
+#       - pylint test classes must pass self, even if unused.
+# pylint: disable=invalid-name
+#       - this module has some pretty verbose names,
+#         shrinking them feels worse than disabling this lint.
+"""
+Tests for the request-scoped user identity map, counting the user
+document reads made by each endpoint call.
+"""
+from typing import Dict, Any, Callable
+
+from asgiref.sync import async_to_sync
+from fastapi.testclient import TestClient
+
+from app import app
+import util.users as user_utils
+import models.users as user_models
+import models.events as event_models
+
+client = TestClient(app)
+
+
+def get_event_registration_json(
+        form: event_models.EventRegistrationForm) -> Dict[str, Any]:
+    """
+    Returns the json-safe dict of the registration form.
+    """
+    form_dict = form.dict()
+    form_dict["date_time_start"] = str(form_dict["date_time_start"])
+    form_dict["date_time_end"] = str(form_dict["date_time_end"])
+    return form_dict
+
+
+class TestRequestUserIdentityMap:
+    def test_register_event_reads_creator_once(
+        self, event_registration_form: event_models.EventRegistrationForm,
+        get_header_dict_from_user_id: Callable[[user_models.UserId],
+                                               Dict[str, Any]],
+        counting_users_collection: Any):
+        """
+        Registers an event, expecting the creator to be read from the
+        database once even though it's looked up all over the request.
+        """
+        headers = get_header_dict_from_user_id(
+            event_registration_form.creator_id)
+
+        response = client.post("/events/register",
+                               json=get_event_registration_json(
+                                   event_registration_form),
+                               headers=headers)
+
+        assert response.status_code == 201
+        assert counting_users_collection.find_one_calls == 1
+
+    def test_cancel_event_reads_user_once(
+        self, registered_admin_user: user_models.User,
+        registered_active_event_factory: Callable[[], event_models.Event],
+        get_header_dict_from_user: Callable[[user_models.User], Dict[str,
+                                                                     Any]],
+        counting_users_collection: Any):
+        """
+        Cancels an event as an admin, expecting the admin to be read
+        from the database once.
+        """
+        event = registered_active_event_factory()
+        header_dict = get_header_dict_from_user(registered_admin_user)
+        counting_users_collection.find_one_calls = 0
+
+        response = client.patch("/events/cancel",
+                                json={"event_id": event.get_id()},
+                                headers=header_dict)
+
+        assert response.status_code == 204
+        assert counting_users_collection.find_one_calls == 1
+
+    def test_no_caching_outside_of_requests(
+            self, registered_user: user_models.User,
+            counting_users_collection: Any):
+        """
+        Looks the same user up twice outside of a request, expecting
+        both lookups to reach the database.
+        """
+        identifier = user_models.UserIdentifier(user_id=registered_user.id)
+
+        async_to_sync(user_utils.get_user_info_by_identifier)(identifier)
+        async_to_sync(user_utils.get_user_info_by_identifier)(identifier)
+
+        assert counting_users_collection.find_one_calls == 2
+
+    def test_writes_clear_identity_map(
+            self, registered_user: user_models.User,
+            counting_users_collection: Any):
+        """
+        Reads a user, writes to it and reads it again within one scope,
+        expecting the second read to hit the database and see the write.
+        """
+        identifier = user_models.UserIdentifier(user_id=registered_user.id)
+        event_id = "some-event-id"
+
+        async def _read_write_read() -> user_models.User:
+            await user_utils.start_request_user_identity_map()
+            try:
+                await user_utils.get_user_info_by_identifier(identifier)
+                await user_utils.get_user_info_by_identifier(identifier)
+                await user_utils.add_event_to_user_visible(
+                    registered_user.id, event_id)
+                return await user_utils.get_user_info_by_identifier(
+                    identifier)
+            finally:
+                # `async_to_sync` copies context changes back to the caller
+                user_utils.REQUEST_USER_IDENTITY_MAP.set(None)
+
+        user = async_to_sync(_read_write_read)()
+
+        assert counting_users_collection.find_one_calls == 2
+        assert event_id in user.events_visible
@@ -5,11 +5,15 @@
 """
 Endpoint tests for the upload image endpoint
 """
+import io
+import os
 import logging
 from typing import Any, Dict
+from PIL import Image
 from fastapi.testclient import TestClient
 from requests.models import Response as HTTPResponse
 from app import app
+import util.images as image_utils
 
 client = TestClient(app)
 
@@ -24,6 +28,25 @@ def check_upload_image_resp_valid(response: HTTPResponse) -> bool:
         return False
 
 
+def get_multi_chunk_image_bytes() -> bytes:
+    """
+    Generates a noisy (so barely compressible) PNG image big enough
+    to span several GridFS chunks.
+    """
+    image_data_buffer = io.BytesIO()
+    noise_bytes = os.urandom(600 * 600 * 3)
+    image_data = Image.frombytes('RGB', (600, 600), noise_bytes)
+    image_data.save(image_data_buffer, format="PNG")
+    return image_data_buffer.getvalue()
+
+
+def count_stored_images() -> int:
+    """
+    Returns the amount of files currently stored in GridFS.
+    """
+    return len(list(image_utils.grid_fs_client().find({})))
+
+
 def get_upload_image_endpoint_url() -> str:
     return "/images/upload"
 
@@ -94,3 +117,57 @@ class TestImageUploadEndpoint:
                                headers=valid_header_dict_with_user_id)
         assert not check_upload_image_resp_valid(response)
         assert response.status_code == 422
+
+    def test_upload_multi_chunk_image(
+            self, valid_header_dict_with_user_id: Dict[str, Any]):
+        """
+        Uploads an image spanning several GridFS chunks, expecting
+        the exact same bytes back when getting it.
+        """
+        image_bytes = get_multi_chunk_image_bytes()
+        assert len(image_bytes) > 2 * image_utils.IMAGE_UPLOAD_CHUNK_SIZE
+
+        response = client.post(get_upload_image_endpoint_url(),
+                               files={"file": image_bytes},
+                               headers=valid_header_dict_with_user_id)
+        assert check_upload_image_resp_valid(response)
+
+        image_id = response.json()["image_id"]
+        get_response = client.get("/images/get",
+                                  params={"image_id": image_id})
+        assert get_response.content == image_bytes
+
+    def test_upload_too_large_fail(self, monkeypatch: Any,
+                                   valid_header_dict_with_user_id: Dict[str,
+                                                                        Any]):
+        """
+        Uploads an image bigger than the max upload size, expecting
+        a 413 and nothing left behind in GridFS.
+        """
+        image_bytes = get_multi_chunk_image_bytes()
+        monkeypatch.setattr(image_utils, "IMAGE_UPLOAD_MAX_BYTES",
+                            image_utils.IMAGE_UPLOAD_CHUNK_SIZE)
+        images_before_upload = count_stored_images()
+
+        response = client.post(get_upload_image_endpoint_url(),
+                               files={"file": image_bytes},
+                               headers=valid_header_dict_with_user_id)
+
+        assert response.status_code == 413
+        assert count_stored_images() == images_before_upload
+
+    def test_upload_bad_header_fail(
+            self, valid_header_dict_with_user_id: Dict[str, Any]):
+        """
+        Uploads data that starts like a PNG but has a broken header,
+        expecting failure and nothing left behind in GridFS.
+        """
+        bad_header_bytes = b"\x89PNG\r\n\x1a\n" + os.urandom(1024)
+        images_before_upload = count_stored_images()
+
+        response = client.post(get_upload_image_endpoint_url(),
+                               files={"file": bad_header_bytes},
+                               headers=valid_header_dict_with_user_id)
+
+        assert response.status_code == 422
+        assert count_stored_images() == images_before_upload
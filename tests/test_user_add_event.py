@@ -86,13 +86,18 @@ def check_event_add_success(old_user: user_models.User,
     """
     Compares an old user object with a new one, returns if
     the new object is identical but with one instance of
-    the parameterized event's id in the events_visible field
+    the parameterized event's id in the events_visible field,
+    and a write stamp moved along by one write
     """
     events_visible = new_user.dict().get("events_visible")
     if event.id not in events_visible:
         return False
+    if new_user.version != old_user.version + 1:
+        return False
     events_visible.remove(event.id)
     new_user.events_visible = events_visible
+    new_user.version = old_user.version
+    new_user.updated_at = old_user.updated_at
     return old_user.dict() == new_user.dict()
 
 
@@ -0,0 +1,119 @@
+# pylint: disable=no-self-use
+#       - pylint test classes must pass self, even if unused.
+# pylint: disable=invalid-name
+#       - this module has some pretty verbose names,
+#         shrinking them feels worse than disabling this lint.
+"""
+Tests for tokens carrying the user type and token version, which let
+auth checks skip the database.
+"""
+from typing import Dict, Any
+
+from asgiref.sync import async_to_sync
+from fastapi.testclient import TestClient
+
+from app import app
+from models.auth import Token
+import util.users as user_utils
+import models.users as user_models
+
+client = TestClient(app)
+
+
+def get_versioned_header_dict(user: user_models.User) -> Dict[str, str]:
+    """
+    Mints a token for the user the same way login does,
+    and returns it wrapped in a header dict.
+    """
+    token_str = async_to_sync(user_utils.get_auth_token_from_user_id)(
+        user.get_id())
+    return {"token": token_str}
+
+
+def change_user_password(user: user_models.User) -> None:
+    """
+    Changes the user's password through the update util.
+    """
+    identifier = user_models.UserIdentifier(user_id=user.get_id())
+    update_form = user_models.UserUpdateForm(identifier=identifier,
+                                             password="newpassword")
+    async_to_sync(user_utils.update_user)(update_form)
+
+
+class TestVersionedTokens:
+    def test_token_carries_user_type_and_version(
+            self, registered_admin_user: user_models.User):
+        """
+        Mints a token for an admin, expecting the user type
+        and token version in it's claims.
+        """
+        token_str = get_versioned_header_dict(registered_admin_user)["token"]
+        token_claims = Token.verify(token_str)
+
+        assert token_claims.user_id == registered_admin_user.get_id()
+        assert token_claims.user_type == "ADMIN"
+        assert token_claims.token_version == 0
+
+    def test_admin_route_skips_database_for_auth(
+            self, registered_admin_user: user_models.User,
+            counting_users_collection: Any):
+        """
+        Calls an admin route twice with a versioned token, expecting
+        no user reads at all once the token version is cached.
+        """
+        header_dict = get_versioned_header_dict(registered_admin_user)
+        client.get("/admin/events_queue", headers=header_dict)
+        counting_users_collection.find_one_calls = 0
+
+        response = client.get("/admin/events_queue", headers=header_dict)
+
+        assert response.status_code == 200
+        assert counting_users_collection.find_one_calls == 0
+
+    def test_non_admin_versioned_token_rejected(
+            self, registered_user: user_models.User):
+        """
+        Calls an admin route with a regular user's versioned
+        token, expecting a 401.
+        """
+        header_dict = get_versioned_header_dict(registered_user)
+        response = client.get("/admin/events_queue", headers=header_dict)
+
+        assert response.status_code == 401
+
+    def test_password_change_revokes_tokens(
+            self, registered_admin_user: user_models.User):
+        """
+        Changes the admin's password after minting a token, expecting
+        the old token to be rejected and a new one to work.
+        """
+        old_header_dict = get_versioned_header_dict(registered_admin_user)
+        client.get("/admin/events_queue", headers=old_header_dict)
+
+        change_user_password(registered_admin_user)
+
+        old_token_response = client.get("/admin/events_queue",
+                                        headers=old_header_dict)
+        new_header_dict = get_versioned_header_dict(registered_admin_user)
+        new_token_response = client.get("/admin/events_queue",
+                                        headers=new_header_dict)
+
+        assert old_token_response.status_code == 401
+        assert new_token_response.status_code == 200
+
+    def test_deleted_user_token_rejected(
+            self, registered_user: user_models.User):
+        """
+        Deletes a user after minting it's token, expecting the token
+        to point to a user that no longer exists.
+        """
+        header_dict = get_versioned_header_dict(registered_user)
+        identifier = user_models.UserIdentifier(
+            user_id=registered_user.get_id())
+        async_to_sync(user_utils.delete_user)(identifier)
+
+        response = client.put("/users/add_event",
+                              json={"event_id": "some-event-id"},
+                              headers=header_dict)
+
+        assert response.status_code == 404
@@ -11,7 +11,8 @@ from typing import Dict, Any, Optional
 
 from fastapi import Header
 
-from models.auth import Token
+from models.auth import Token, TokenClaims, TokenError
+from models.users import UserTypeEnum
 from models import exceptions
 import util.users as user_utils
 import models.commons as common_models
@@ -23,11 +24,22 @@ async def check_header_token_is_admin(token: str = Header(
     Will check for valid token and existing user, as well as
     making sure that the user is an admin.
 
+    Tokens carrying the user type and token version are trusted as signed,
+    only checking the (cached) token version, so that admin checks don't
+    need the database.
+
     Returns 404 if user not found, 401 if other error.
     """
-    user_id = await get_user_id_from_header_and_check_existence(token)
+    token_claims = await get_claims_from_token_header(token)
+
+    if await check_claims_are_versioned(token_claims):
+        user_id = await get_user_id_from_versioned_claims(token_claims)
+        # pylint: disable=no-member
+        is_admin = token_claims.user_type == UserTypeEnum.ADMIN.name
+    else:
+        user_id = await get_user_id_from_header_and_check_existence(token)
+        is_admin = await user_utils.check_if_admin_by_id(user_id)
 
-    is_admin = await user_utils.check_if_admin_by_id(user_id)
     if is_admin:
         return user_id
 
@@ -43,8 +55,11 @@ async def get_user_id_from_header_and_check_existence(  # pylint: disable=invali
 
     If valid and existent, returns the value of the UserId.
     """
-    payload_dict = await get_payload_from_token_header(token)
-    user_id = payload_dict.get("user_id")
+    token_claims = await get_claims_from_token_header(token)
+    if await check_claims_are_versioned(token_claims):
+        return await get_user_id_from_versioned_claims(token_claims)
+
+    user_id = token_claims.user_id
     if not user_id:
         detail = "User ID not in JWT header payload dict."
         raise exceptions.InvalidDataException(detail=detail)
@@ -52,6 +67,37 @@ async def get_user_id_from_header_and_check_existence(  # pylint: disable=invali
     return user_id
 
 
+async def check_claims_are_versioned(token_claims: TokenClaims) -> bool:
+    """
+    Checks if the token was minted with the user id, user type and token
+    version claims; older tokens only carry the user id.
+    """
+    return None not in {
+        token_claims.user_id, token_claims.user_type,
+        token_claims.token_version
+    }
+
+
+async def get_user_id_from_versioned_claims(  # pylint: disable=invalid-name
+        token_claims: TokenClaims) -> common_models.UserId:
+    """
+    Checks the token version in the claims against the user's current one,
+    returning the user id if they match.
+
+    Raises 404 if the user no longer exists and 401 if the token was revoked.
+    """
+    user_id = token_claims.user_id
+    current_token_version = await user_utils.get_token_version_by_id(user_id)
+
+    if current_token_version is None:
+        raise exceptions.UserNotFoundException
+    if current_token_version != token_claims.token_version:
+        detail = "Authorization token in header has been revoked"
+        raise exceptions.InvalidAuthHeaderException(detail=detail)
+
+    return user_id
+
+
 async def get_auth_token_from_header(token: str = Header(None)) -> str:
     """
     Attempts to get the auth token string from the request header,
@@ -69,7 +115,7 @@ async def get_token_from_optional_header(token: Optional[str] = Header(
     returning it if available, else returns None
     """
     if token:
-        await check_token_str_is_decodable(token)
+        await get_verified_token_claims(token)
         return token
     return
 
@@ -81,9 +127,20 @@ async def get_payload_from_token_header(token: str = Header(None)) -> Dict[
     and, in the process, decodes the token, returning the payload if valid,
     else raising an authorization exception
     """
+    token_claims = await get_claims_from_token_header(token)
+    return token_claims.dict(exclude_unset=True)
+
+
+async def get_claims_from_token_header(token: str = Header(
+    None)) -> TokenClaims:
+    """
+    Attempts to get the auth token string from the request header,
+    verifying it and returning it's claims if valid, else raising
+    an authorization exception.
+    """
     await check_token_data_passed_in(token)
-    token_payload = await get_payload_from_optional_token_header(token)
-    return token_payload
+    token_claims = await get_verified_token_claims(token)
+    return token_claims
 
 
 async def get_payload_from_optional_token_header(  # pylint: disable=invalid-name
@@ -93,9 +150,8 @@ async def get_payload_from_optional_token_header(  # pylint: disable=invalid-nam
     if not header is passed in, returns None.
     """
     if token:
-        await check_token_str_is_decodable(token)
-        token_payload = Token.get_dict_from_enc_token_str(token)
-        return token_payload
+        token_claims = await get_verified_token_claims(token)
+        return token_claims.dict(exclude_unset=True)
 
 
 async def get_user_id_from_optional_token_header_check_existence(  # pylint: disable=invalid-name
@@ -119,13 +175,19 @@ async def check_token_data_passed_in(token_str: str) -> None:
         raise exceptions.InvalidDataException(detail=detail)
 
 
-async def check_token_str_is_decodable(token_str: str) -> None:
+async def get_verified_token_claims(token_str: str) -> TokenClaims:
     """
-    Checks if encoded token string passed in is valid
-    and decodable.
+    Verifies the encoded token string, decoding it only once.
 
-    If not, raises an authentication error.
+    Returns the token's claims if valid, else raises an authentication
+    error saying if the token was expired or invalid.
     """
-    invalid_token_data = not Token.check_if_valid(token_str)
-    if invalid_token_data:
+    token_claims = Token.verify(token_str)
+
+    if token_claims is TokenError.expired:
+        detail = "Authorization token in header has expired"
+        raise exceptions.InvalidAuthHeaderException(detail=detail)
+    if isinstance(token_claims, TokenError):
         raise exceptions.InvalidAuthHeaderException
+
+    return token_claims
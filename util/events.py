@@ -2,24 +2,49 @@
 #       - this is actually a pylint bug that hasn't been resolved.
 # pylint: disable=cyclic-import
 #       - weird cyclic import that seems harmless
+# pylint: disable=too-many-lines
+#       - (needs refactor) ...
 """
 Handler for event operations.
 """
+import json
+import asyncio
+import logging
 from datetime import timedelta, datetime
-from typing import Dict, List, Any, Tuple, Optional
-from geopy import distance
+from typing import Dict, List, Any, Tuple, Optional, AsyncIterator
+from pymongo import ASCENDING, UpdateOne
 
 from models import exceptions
 import util.users as user_utils
+import util.leases as lease_utils
 import models.events as event_models
 import models.users as user_models
 import models.commons as common_models
-from config.db import get_database, get_database_client_name
+from config.db import get_async_database, AsyncCollection
+from config.main import EVENT_STATUS_SWEEP_INTERVAL_SECONDS, \
+    EVENT_STATUS_SWEEPER_LEASE_SECONDS, EVENTS_EXPORT_BATCH_SIZE
+from util.response_cache import EVENT_RESPONSE_CACHE
+
+METERS_PER_MILE = 1609.344
+
+BATCH_QUERY_SORT = [("date_time_start", ASCENDING), ("_id", ASCENDING)]
+
+# how many legacy events get their GeoJSON point per write
+LOCATION_BACKFILL_BATCH_SIZE = 500
+
+# media type of the streamed export, one JSON event per line
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+# background task that moves events along their lifecycle
+EVENT_STATUS_SWEEPER_TASK: Optional[asyncio.Future] = None
+
+# lease only the one worker running the sweeps holds, see `util.leases`
+EVENT_STATUS_SWEEPER_LEASE = "event_status_sweeper"
 
 
 # create column for insertion in database_client
-def events_collection():
-    return get_database()[get_database_client_name()]["events"]
+def events_collection() -> AsyncCollection:
+    return get_async_database()["events"]
 
 
 async def register_event(
@@ -35,6 +60,7 @@ async def register_event(
     # form validation followed by database insertion
     event = await get_event_from_event_reg_form(event_registration_form)
     await insert_event_to_database(event)
+    await invalidate_event_listings()
 
     # add registered event id to user's list of created event
     event_id = event.get_id()
@@ -101,30 +127,70 @@ async def insert_event_to_database(event: event_models.Event):
     """
     Registers an event into the database
     """
-    events_collection().insert_one(event.dict())
+    event.mark_written()
+    await events_collection().insert_one(event.dict())
 
 
 async def get_event_by_id(
-        event_id: common_models.EventId,
-        user_id: Optional[user_models.UserId] = None) -> event_models.Event:
+        event_id: common_models.EventId) -> event_models.Event:
     """
     Returns an Event object from the database by it's id.
 
+    This is a single read and never writes; ended events are archived
+    for users in bulk by the status sweeper instead.
+
     Throws 404 if nothing is found
     """
-    event_document = events_collection().find_one({"_id": event_id})
+    event_document = await events_collection().find_one({"_id": event_id})
     if not event_document:
         raise exceptions.EventNotFoundException
 
     event = event_models.Event(**event_document)
-    await update_event_status_if_expired(event)
-
-    if user_id:
-        await user_utils.archive_user_event(user_id, event)
+    event.status = await get_event_status_at_time(event, datetime.utcnow())
 
     return event
 
 
+async def get_events_by_ids(
+    event_ids: List[common_models.EventId]
+) -> event_models.BulkEventQueryResponse:
+    """
+    Fetches every event with one of the given ids in a single `$in` query.
+
+    Events come back in the order their ids were given (repeated ids
+    only once), and ids that don't match any event are listed as missing.
+    Nothing is written to the database.
+    """
+    unique_event_ids = list(dict.fromkeys(event_ids))
+    projection_dict = event_models.EventQueryResponse.get_projection_dict()
+    event_documents = await events_collection().find(
+        {
+            "_id": {
+                "$in": unique_event_ids
+            }
+        }, projection_dict).to_list()
+
+    events_by_id = {
+        event_document["_id"]:
+        event_models.EventQueryResponse.from_database_document(event_document)
+        for event_document in event_documents
+    }
+
+    now = datetime.utcnow()
+    events_found = []
+    missing_ids = []
+    for event_id in unique_event_ids:
+        event = events_by_id.get(event_id)
+        if not event:
+            missing_ids.append(event_id)
+            continue
+        event.status = await get_event_status_at_time(event, now)
+        events_found.append(event)
+
+    return event_models.BulkEventQueryResponse(events=events_found,
+                                               missing_ids=missing_ids)
+
+
 async def get_creator_id_from_event_id(event_id: common_models.EventId) -> str:
     event = await get_event_by_id(event_id)
     event_creator_id = event.creator_id
@@ -134,35 +200,174 @@ async def get_creator_id_from_event_id(event_id: common_models.EventId) -> str:
 async def events_by_location(origin: Tuple[float, float],
                              radius: float) -> event_models.ListOfEvents:
     """
-    Given an origin point and a radius, finds all events
-    within that radius.
+    Given an origin point and a radius (in miles), finds all events
+    within that radius, closest first.
     """
-    def within_radius(event):
-        """
-        Given an event dict, checks if the event is within the
-        given distance radius
-        """
-        event_location = event.get("location", {})
-        event_lat = event_location.get("latitude", 0)
-        event_lon = event_location.get("longitude", 0)
+    await check_location_query_valid(origin, radius)
+
+    pipeline = await get_location_query_pipeline(origin, radius)
+    events = await events_collection().aggregate(pipeline)
 
-        destination = (event_lat, event_lon)
-        try:
-            distance_mi = distance.distance(origin, destination).miles
-        except ValueError as coord_error:
-            detail = f"Error with querying event by location: {coord_error}"
-            raise exceptions.InvalidDataException(
-                detail=detail) from coord_error
-        return distance_mi <= radius
-
-    events = events_collection().find()
     valid_events = [
-        event_models.EventQueryResponse(**event, event_id=event["_id"])
-        for event in filter(within_radius, events)
+        event_models.EventQueryResponse.from_database_document(event)
+        async for event in events
     ]
     return event_models.ListOfEvents(events=valid_events)
 
 
+async def check_location_query_valid(origin: Tuple[float, float],
+                                     radius: float) -> None:
+    """
+    Checks that the origin is a valid (lat, long) pair and that the radius
+    isn't negative, raising a 422 if not, else returns silently.
+    """
+    latitude, longitude = origin
+
+    latitude_valid = -90 <= latitude <= 90
+    longitude_valid = -180 <= longitude <= 180
+    radius_valid = radius >= 0
+
+    if not (latitude_valid and longitude_valid and radius_valid):
+        detail = "Error with querying event by location: " \
+                 f"invalid origin {origin} or radius {radius}"
+        raise exceptions.InvalidDataException(detail=detail)
+
+
+async def get_location_query_pipeline(origin: Tuple[float, float],
+                                      radius: float) -> List[Dict[str, Any]]:
+    """
+    Returns the aggregation pipeline that finds the events within
+    `radius` miles of the origin using the `2dsphere` index.
+    """
+    latitude, longitude = origin
+    origin_point = event_models.GeoJsonPoint(
+        coordinates=[longitude, latitude])
+
+    geo_near_stage = {
+        "$geoNear": {
+            "near": origin_point.dict(),
+            "key": "location_point",
+            "distanceField": "distance_mi",
+            "distanceMultiplier": 1 / METERS_PER_MILE,
+            "maxDistance": radius * METERS_PER_MILE,
+            "spherical": True,
+        }
+    }
+    project_stage = {
+        "$project": event_models.EventQueryResponse.get_projection_dict()
+    }
+    return [geo_near_stage, project_stage]
+
+
+async def backfill_event_location_points() -> None:
+    """
+    Startup handler that stores the GeoJSON point of every event written
+    before `location_point` existed, so location queries can find them.
+
+    Only events still missing the point are read and written,
+    so it's safe to run on every startup.
+    """
+    legacy_filter_dict = {
+        "location_point": {
+            "$exists": False
+        },
+        "location": {
+            "$exists": True
+        },
+    }
+    legacy_events_cursor = events_collection().find(
+        legacy_filter_dict,
+        {"location": True}).batch_size(LOCATION_BACKFILL_BATCH_SIZE)
+
+    backfill_operations = []
+    modified_count = 0
+    async for legacy_event in legacy_events_cursor:
+        location = event_models.Location(**legacy_event["location"])
+        location_point = event_models.GeoJsonPoint.from_location(location)
+        backfill_operations.append(
+            UpdateOne({
+                "_id": legacy_event["_id"],
+                "location_point": {
+                    "$exists": False
+                }
+            }, {"$set": {
+                "location_point": location_point.dict()
+            }}))
+
+        if len(backfill_operations) == LOCATION_BACKFILL_BATCH_SIZE:
+            modified_count += await write_location_backfill(
+                backfill_operations)
+            backfill_operations = []
+
+    if backfill_operations:
+        modified_count += await write_location_backfill(backfill_operations)
+
+    if modified_count:
+        logging.info("Backfilled the location point of %d events",
+                     modified_count)
+        await invalidate_event_listings()
+
+
+async def write_location_backfill(backfill_operations: List[UpdateOne]) -> int:
+    """
+    Writes a batch of location point backfills,
+    returning how many events were modified.
+    """
+    backfill_result = await events_collection().bulk_write(
+        backfill_operations, ordered=False)
+    return backfill_result.modified_count
+
+
+async def archive_ended_events() -> None:
+    """
+    Startup handler that archives every event already stored as `expired`
+    or `cancelled` for the users that still have it visible, e.g. events
+    that ended before the status sweeper archived the events it expires.
+
+    Archiving only matches users still holding the event as visible,
+    so it's safe to run on every startup.
+    """
+    # pylint: disable=no-member
+    status_enum = event_models.EventStatusEnum
+    ended_filter = {
+        "status": {
+            "$in": [status_enum.expired.name, status_enum.cancelled.name]
+        }
+    }
+
+    archived_count = 0
+    async for ended_event_ids in iterate_event_id_batches(ended_filter):
+        archived_count += await user_utils.archive_events_for_all_users(
+            ended_event_ids)
+
+    if archived_count:
+        logging.info("Archived %d ended events across users", archived_count)
+
+
+async def iterate_event_id_batches(
+        filter_dict: Dict[str, Any]
+) -> AsyncIterator[List[common_models.EventId]]:
+    """
+    Yields the ids of the events matching the filter in lists of up to
+    `EVENTS_EXPORT_BATCH_SIZE`, so that no single write filtering
+    on them grows with the amount of events matched.
+    """
+    event_ids_cursor = events_collection().find(
+        filter_dict, {
+            "_id": True
+        }).batch_size(EVENTS_EXPORT_BATCH_SIZE)
+
+    event_ids = []
+    async for event_document in event_ids_cursor:
+        event_ids.append(event_document["_id"])
+        if len(event_ids) == EVENTS_EXPORT_BATCH_SIZE:
+            yield event_ids
+            event_ids = []
+
+    if event_ids:
+        yield event_ids
+
+
 async def get_event_by_status(_event_id) -> None:
     """
     Returns all events with a matching status tag.
@@ -177,7 +382,7 @@ async def get_all_events() -> Dict[str, List[Dict[str, Any]]]:
     Returns a dict with a list of all of the events
     in the database.
     """
-    events = list(events_collection().find())
+    events = await events_collection().find().to_list()
 
     # change the "_id" field to a "event_id" field
     for event in events:
@@ -186,6 +391,32 @@ async def get_all_events() -> Dict[str, List[Dict[str, Any]]]:
     return {"events": events}
 
 
+async def check_accept_wants_ndjson(
+        accept_header: Optional[str]) -> bool:
+    """
+    Checks if the client asked for the streamed, newline-delimited export.
+    """
+    return bool(accept_header) and NDJSON_MEDIA_TYPE in accept_header
+
+
+async def iterate_all_events_as_ndjson() -> AsyncIterator[str]:
+    """
+    Yields every event in the database as one line of JSON at a time.
+
+    Events are read off the cursor `EVENTS_EXPORT_BATCH_SIZE` at a time
+    and serialized as they come, so memory stays flat no matter how
+    big the collection is and the first line goes out right away.
+    """
+    projection_dict = event_models.EventQueryResponse.get_projection_dict()
+    event_cursor = events_collection().find(
+        {}, projection_dict).batch_size(EVENTS_EXPORT_BATCH_SIZE)
+
+    async for event_document in event_cursor:
+        event = event_models.EventQueryResponse.from_database_document(
+            event_document)
+        yield event.json() + "\n"
+
+
 async def cancel_event(event_cancel_form: event_models.CancelEventForm,
                        user_id: user_models.UserId) -> None:
     """
@@ -205,6 +436,8 @@ async def cancel_event(event_cancel_form: event_models.CancelEventForm,
     if user_authorized:
         await update_event_status_enum_in_db(
             event, event_models.EventStatusEnum.cancelled)
+        await invalidate_event_listings()
+        await user_utils.archive_events_for_all_users([event_id])
     else:
         raise exceptions.ForbiddenUserAction
 
@@ -216,19 +449,53 @@ async def generate_event_id_dict(event: event_models.Event) -> Dict[str, Any]:
     return {"_id": event.id}
 
 
-async def get_list_events_to_approve() -> event_models.ListOfEvents:
+async def get_events_to_approve_page(
+        limit: int,
+        continuation_token: Optional[str] = None
+) -> event_models.ApprovalQueueResponse:
     """
-    Returns the list of events to be approved or denied by the admin
+    Returns a page of the events to be approved or denied by the admin,
+    oldest start time first, along with the continuation token for the
+    next page (if any).
+
+    Pages follow the (`approval`, `date_time_start`, `_id`) index,
+    so no page needs a collection scan or an in-memory sort.
     """
     filter_dict = await get_event_approval_filter_dict()
-    event_query_response = events_collection().find(filter_dict)
+    if continuation_token:
+        continuation_filter_dict = await get_continuation_filter_dict(
+            continuation_token)
+        filter_dict = {"$and": [filter_dict, continuation_filter_dict]}
+
+    projection_dict = event_models.EventQueryResponse.get_projection_dict()
+    event_query_response = events_collection().find(
+        filter_dict, projection_dict).sort(BATCH_QUERY_SORT).limit(limit + 1)
 
     list_of_events = [
-        event_models.EventQueryResponse(**event_document,
-                                        event_id=event_document["_id"])
-        for event_document in event_query_response
+        event_models.EventQueryResponse.from_database_document(event_document)
+        async for event_document in event_query_response
     ]
-    return event_models.ListOfEvents(events=list_of_events)
+
+    # one extra event is fetched just to know if there's a next page
+    has_next_page = len(list_of_events) > limit
+    list_of_events = list_of_events[:limit]
+
+    next_continuation_token = None
+    if has_next_page:
+        next_continuation_token = await get_continuation_token_after_event(
+            list_of_events[-1])
+
+    return event_models.ApprovalQueueResponse(
+        events=list_of_events, continuation_token=next_continuation_token)
+
+
+async def count_events_to_approve() -> int:
+    """
+    Returns how many events are waiting for an approval decision,
+    counted off the approval queue index alone.
+    """
+    filter_dict = await get_event_approval_filter_dict()
+    return await events_collection().count_documents(filter_dict)
 
 
 async def get_event_approval_filter_dict() -> Dict[str, Any]:
@@ -248,62 +515,165 @@ async def change_event_approval(event_id: event_models.EventId,
     """
     Changes an event's approval status enum in-place, and also
     removes it from the approve/deny queue.
+
+    The update only matches while the event is still unapproved,
+    so no read is needed beforehand.
     """
-    # pylint: disable=no-member
-    event = await get_event_by_id(event_id)
-    if event.approval != event_models.EventApprovalEnum.unapproved.name:
+    decision_enum_value = await get_decision_enum_value(approved)
+    update_result = await events_collection().update_one(
+        await get_undecided_event_filter_dict(event_id),
+        common_models.add_write_stamp(
+            {"$set": {
+                "approval": decision_enum_value
+            }}))
+
+    if not update_result.matched_count:
         detail = "Event not found or already had an approval decision taken."
         raise exceptions.EventNotFoundException(detail=detail)
 
-    if approved:
-        decision_enum = event_models.EventApprovalEnum.approved.name
-    else:
-        decision_enum = event_models.EventApprovalEnum.denied.name
+    await invalidate_event_listings()
 
-    await find_and_update_event_approval(event_id, decision_enum)
 
+async def decide_events_approval(
+    decisions: List[event_models.EventApprovalDecision]
+) -> event_models.BulkEventApprovalResponse:
+    """
+    Applies many approval decisions at once, returning the outcome of
+    each one in the order they were given.
+
+    Events are read once to sort out the ones that don't exist or were
+    already decided, then every other decision is applied in a single
+    conditional `bulk_write` that only matches still-unapproved events.
+    Only the first decision for an event is applied, repeats are
+    reported as duplicates.
+    """
+    # pylint: disable=no-member
+    outcome_enum = event_models.EventApprovalOutcomeEnum
+
+    first_decisions = {}
+    for decision in decisions:
+        first_decisions.setdefault(decision.event_id, decision)
+
+    approvals_before_write = await get_event_approvals_by_id(
+        list(first_decisions))
+    unapproved_name = event_models.EventApprovalEnum.unapproved.name
+    pending_decisions = [
+        decision for event_id, decision in first_decisions.items()
+        if approvals_before_write.get(event_id) == unapproved_name
+    ]
 
-async def find_and_update_event_approval(event_id: event_models.EventId,
-                                         decision_enum_value: str) -> None:
+    # what each pending event's approval is after the write
+    approvals_after_write = {}
+    if pending_decisions:
+        decision_operations = []
+        for decision in pending_decisions:
+            decision_enum_value = await get_decision_enum_value(
+                decision.approve)
+            approvals_after_write[decision.event_id] = decision_enum_value
+            decision_operations.append(
+                UpdateOne(
+                    await get_undecided_event_filter_dict(decision.event_id),
+                    common_models.add_write_stamp(
+                        {"$set": {
+                            "approval": decision_enum_value
+                        }})))
+
+        decision_result = await events_collection().bulk_write(
+            decision_operations, ordered=False)
+        await invalidate_event_listings()
+
+        # another admin decided some of the events in between,
+        # so re-read them to see which decisions didn't land
+        if decision_result.matched_count < len(pending_decisions):
+            approvals_after_write = await get_event_approvals_by_id(
+                list(approvals_after_write))
+
+    outcomes = []
+    for decision in decisions:
+        decision_enum_value = await get_decision_enum_value(
+            decision.approve)
+        approval_before_write = approvals_before_write.get(decision.event_id)
+        approval_after_write = approvals_after_write.get(decision.event_id)
+
+        if first_decisions[decision.event_id] is not decision:
+            outcome = outcome_enum.duplicate
+        elif approval_before_write is None:
+            outcome = outcome_enum.not_found
+        elif approval_before_write != unapproved_name:
+            outcome = outcome_enum.already_decided
+        elif approval_after_write is None:
+            outcome = outcome_enum.not_found
+        elif approval_after_write != decision_enum_value:
+            outcome = outcome_enum.already_decided
+        else:
+            outcome = outcome_enum[decision_enum_value]
+
+        outcomes.append(
+            event_models.EventApprovalOutcome(event_id=decision.event_id,
+                                              outcome=outcome))
+
+    return event_models.BulkEventApprovalResponse(outcomes=outcomes)
+
+
+async def get_event_approvals_by_id(
+        event_ids: List[event_models.EventId]) -> Dict[str, str]:
     """
-    Finds and updates (in-place) the found event to change the approval enum.
+    Returns the approval enum value of each existing event, by id.
     """
-    query_dict = {"_id": event_id}
-    update_dict = {"$set": {'approval': decision_enum_value}}
-    events_collection().find_one_and_update(filter=query_dict,
-                                            update=update_dict)
+    event_documents = await events_collection().find(
+        {
+            "_id": {
+                "$in": event_ids
+            }
+        }, {
+            "approval": True
+        }).to_list()
+    return {
+        event_document["_id"]: event_document["approval"]
+        for event_document in event_documents
+    }
 
 
-async def find_and_update_event_status(
-        event_id: event_models.EventId,
-        status_enum: event_models.EventStatusEnum) -> None:
+async def get_undecided_event_filter_dict(
+        event_id: event_models.EventId) -> Dict[str, Any]:
     """
-    Finds and updates (in-place) the found event to change the status enum.
+    Returns the filter matching the event only if it's still unapproved.
     """
-    query_dict = {"_id": event_id}
-    update_dict = {"$set": {'status': status_enum.name}}
-    events_collection().find_one_and_update(filter=query_dict,
-                                            update=update_dict)
+    filter_dict = await get_event_approval_filter_dict()
+    filter_dict["_id"] = event_id
+    return filter_dict
+
+
+async def get_decision_enum_value(approved: bool) -> str:
+    """
+    Returns the approval enum value an admin decision sets.
+    """
+    # pylint: disable=no-member
+    if approved:
+        return event_models.EventApprovalEnum.approved.name
+    return event_models.EventApprovalEnum.denied.name
 
 
 async def search_events(
         form: event_models.EventSearchForm) -> event_models.ListOfEvents:
     """
-    Returns events from the database based on a key word
-    and a date range
+    Returns the events whose title or description match the keyword(s),
+    most relevant first, using the events text index.
     """
-    events = events_collection().find()
-    result_events = []
+    query_dict = {"$text": {"$search": form.keyword}}
+    text_score = {"$meta": "textScore"}
 
-    event_matches_query = lambda event: form.keyword in {
-        event["title"], event["description"]
-    }
-    for event in events:
-        if event_matches_query(event):
-            event_data = event_models.EventQueryResponse(**event,
-                                                         event_id=event["_id"])
-            result_events.append(event_data)
+    projection_dict = event_models.EventQueryResponse.get_projection_dict()
+    projection_dict["score"] = text_score
+
+    events = events_collection().find(query_dict, projection_dict).sort([
+        ("score", text_score), ("_id", ASCENDING)
+    ]).skip(form.offset).limit(form.limit)
 
+    result_events = [
+        event_models.EventQueryResponse.from_database_document(event)
+        async for event in events
+    ]
     return event_models.ListOfEvents(events=result_events)
 
 
@@ -311,19 +681,76 @@ async def batch_event_query(
     query_form: event_models.BatchEventQueryModel
 ) -> event_models.BatchEventQueryResponse:
     """
-    Returns a list of events filtered by datetimes and
-    event tags.
+    Returns a page of events filtered by datetimes and event tags,
+    along with the continuation token for the next page (if any).
     """
     filter_dict = await get_db_filter_dict_for_query(query_form)
 
     list_of_events_found = await get_events_from_filtered_query(
         filter_dict, query_form)
 
+    # one extra event is fetched just to know if there's a next page
+    has_next_page = len(list_of_events_found) > query_form.limit
+    list_of_events_found = list_of_events_found[:query_form.limit]
+
+    continuation_token = None
+    if has_next_page:
+        continuation_token = await get_continuation_token_after_event(
+            list_of_events_found[-1])
+
     response = event_models.BatchEventQueryResponse(
-        events=list_of_events_found)
+        events=list_of_events_found, continuation_token=continuation_token)
     return response
 
 
+async def get_batch_event_query_json(
+        query_form: event_models.BatchEventQueryModel) -> str:
+    """
+    Returns the batch query response as JSON, served from the
+    event response cache if the same query was answered recently.
+    """
+    query_dict = json.loads(query_form.json())
+    # the order tags are filtered by in doesn't change the results
+    query_dict["event_tag_filter"] = sorted(query_dict["event_tag_filter"]
+                                            or [])
+    return await EVENT_RESPONSE_CACHE.get_or_compute(
+        "batch", query_dict, lambda: batch_event_query(query_form))
+
+
+async def get_events_by_location_json(origin: Tuple[float, float],
+                                      radius: float) -> str:
+    """
+    Returns the events by location response as JSON, served from the
+    event response cache if the same query was answered recently.
+    """
+    query_dict = {"origin": list(origin), "radius": radius}
+    return await EVENT_RESPONSE_CACHE.get_or_compute(
+        "location", query_dict, lambda: events_by_location(origin, radius))
+
+
+async def get_search_events_json(form: event_models.EventSearchForm) -> str:
+    """
+    Returns the search response as JSON, served from the event
+    response cache if the same search was answered recently.
+    """
+    # text search ignores case and extra whitespace
+    query_dict = form.dict()
+    query_dict["keyword"] = " ".join(form.keyword.lower().split())
+    return await EVENT_RESPONSE_CACHE.get_or_compute(
+        "search", query_dict, lambda: search_events(form))
+
+
+async def invalidate_event_listings() -> None:
+    """
+    Drops every cached event listing; called after any write
+    that can change what a listing returns.
+
+    Feedback only changes the `comment_ids` of an event,
+    so it's left to the cache's TTL instead.
+    """
+    await EVENT_RESPONSE_CACHE.invalidate()
+
+
 async def get_db_filter_dict_for_query(
         query_form: event_models.BatchEventQueryModel) -> Dict[str, Any]:
     """
@@ -336,6 +763,11 @@ async def get_db_filter_dict_for_query(
     filter_dict.update(datetime_filter_dict)
     filter_dict.update(event_tags_filter_dict)
 
+    if query_form.continuation_token:
+        continuation_filter_dict = await get_continuation_filter_dict(
+            query_form.continuation_token)
+        filter_dict = {"$and": [filter_dict, continuation_filter_dict]}
+
     return filter_dict
 
 
@@ -343,26 +775,62 @@ async def get_events_from_filtered_query(
     filter_dict: Dict[str, Any], query_form: event_models.BatchEventQueryModel
 ) -> List[event_models.EventQueryResponse]:
     """
-    Executes a batch database query given the filter, and returns the list of
-    events found by pages.
-    """
-    events_found = []
-    query_limit = query_form.limit * (query_form.index + 1)
-    event_query_response = events_collection().find(filter_dict).limit(
-        query_limit)
+    Executes a batch database query given the filter, and returns up to
+    `limit + 1` events in (`date_time_start`, `_id`) order.
 
-    for _ in range(query_form.index * query_form.limit):
-        next(event_query_response, None)
+    Pages should be walked with the continuation token, which turns into a
+    range filter; the `index` field is only honored without a token, and
+    is skipped over on the server.
+    """
+    projection_dict = event_models.EventQueryResponse.get_projection_dict()
+    event_query_response = events_collection().find(
+        filter_dict,
+        projection_dict).sort(BATCH_QUERY_SORT).limit(query_form.limit + 1)
 
-    for event_document in event_query_response:
-        event = event_models.Event(**event_document)
-        events_found.append(
-            event_models.EventQueryResponse(**event.dict(),
-                                            event_id=event.get_id()))
+    if query_form.index and not query_form.continuation_token:
+        event_query_response.skip(query_form.index * query_form.limit)
 
+    events_found = [
+        event_models.EventQueryResponse.from_database_document(event_document)
+        async for event_document in event_query_response
+    ]
     return events_found
 
 
+async def get_continuation_filter_dict(
+        encoded_token_str: str) -> Dict[str, Any]:
+    """
+    Decodes the continuation token and returns the range filter that
+    matches only the events sorted after the one it points to.
+    """
+    token = common_models.ContinuationToken.decode(encoded_token_str)
+
+    filter_dict = {
+        "$or": [{
+            "date_time_start": {
+                "$gt": token.last_date_time
+            }
+        }, {
+            "date_time_start": token.last_date_time,
+            "_id": {
+                "$gt": token.last_id
+            }
+        }]
+    }
+    return filter_dict
+
+
+async def get_continuation_token_after_event(  # pylint: disable=invalid-name
+        event: event_models.EventQueryResponse) -> str:
+    """
+    Returns the encoded continuation token that points right after
+    the given event in the batch query order.
+    """
+    token = common_models.ContinuationToken(
+        last_id=event.event_id, last_date_time=event.date_time_start)
+    return token.encode()
+
+
 async def get_date_filter_dict_for_query(
         query_form: event_models.BatchEventQueryModel) -> Dict[str, Any]:
     """
@@ -471,20 +939,148 @@ async def update_event_status_enum_in_db(
     Update an event's status in the database
     """
     identifier_dict = await generate_event_id_dict(event_model)
-    update_dict = {"$set": {"status": status.name}}
-    events_collection().update_one(identifier_dict, update_dict)
+    update_dict = common_models.add_write_stamp(
+        {"$set": {
+            "status": status.name
+        }})
+    await events_collection().update_one(identifier_dict, update_dict)
+
+
+async def get_event_status_at_time(event: event_models.EventSchedule,
+                                   moment: datetime) -> str:
+    """
+    Returns the name of the status the event has at the given moment, the
+    same one the status sweeper would give it, without writing anything
+    to the database.
 
+    Always a name, like the stored status, so it can be set on
+    models built with `construct()` as well as validated ones.
 
-async def update_event_status_if_expired(event: event_models.Event) -> None:
+    Lets reads be accurate in between sweeps.
     """
-    Checks Event for any updates due to time changes.
-    Changes status of event if expired in-place, else does nothing.
+    # pylint: disable=no-member
+    status_enum = event_models.EventStatusEnum
+    time_based_statuses = {status_enum.active.name, status_enum.ongoing.name}
+
+    status_name = event.status if isinstance(event.status,
+                                             str) else event.status.name
+    if status_name not in time_based_statuses:
+        return status_name
+    if event.date_time_end <= moment:
+        return status_enum.expired.name
+    if event.date_time_start <= moment:
+        return status_enum.ongoing.name
+    return status_name
+
+
+async def sweep_event_statuses() -> Dict[str, int]:
     """
+    Moves every event whose time has come along its lifecycle in bulk:
+    `active`/`ongoing` events that ended become `expired`, and
+    `active` events that started become `ongoing`.
+
+    Events about to expire are handled `EVENTS_EXPORT_BATCH_SIZE` at a
+    time, keeping every write's id list bounded however many are due.
+    Each batch is archived for every user that had them visible first,
+    so that a sweep failing in between is simply finished by the next one.
+
+    Returns the amount of events moved to each status,
+    and the amount of events archived across users.
+    """
+    # pylint: disable=no-member
+    status_enum = event_models.EventStatusEnum
     present = datetime.utcnow()
-    date_end = event.date_time_end
-    has_expired = date_end <= present
 
-    if has_expired:
-        new_event_status = event_models.EventStatusEnum.expired
-        await find_and_update_event_status(event.get_id(), new_event_status)
-        event.status = new_event_status
+    expiring_filter = {
+        "status": {
+            "$in": [status_enum.active.name, status_enum.ongoing.name]
+        },
+        "date_time_end": {
+            "$lte": present
+        }
+    }
+    expired_count = 0
+    archived_count = 0
+    # expire first so events past both dates skip straight to expired
+    async for expiring_event_ids in iterate_event_id_batches(expiring_filter):
+        archived_count += await user_utils.archive_events_for_all_users(
+            expiring_event_ids)
+
+        expired_result = await events_collection().update_many(
+            {
+                "_id": {
+                    "$in": expiring_event_ids
+                },
+                **expiring_filter
+            }, common_models.add_write_stamp(
+                {"$set": {
+                    "status": status_enum.expired.name
+                }}))
+        expired_count += expired_result.modified_count
+
+    ongoing_result = await events_collection().update_many(
+        {
+            "status": status_enum.active.name,
+            "date_time_start": {
+                "$lte": present
+            }
+        }, common_models.add_write_stamp(
+            {"$set": {
+                "status": status_enum.ongoing.name
+            }}))
+
+    if expired_count or ongoing_result.modified_count:
+        await invalidate_event_listings()
+
+    return {
+        status_enum.expired.name: expired_count,
+        status_enum.ongoing.name: ongoing_result.modified_count,
+        "archived": archived_count,
+    }
+
+
+async def run_event_status_sweeper(interval_seconds: float) -> None:
+    """
+    Sweeps the event statuses every `interval_seconds` until cancelled.
+
+    Every worker runs this, but only the one holding the sweeper's lease
+    sweeps; the rest just check on the lease in case it's given up or
+    runs out. A failed sweep is logged and retried on the next interval.
+    """
+    while True:
+        try:
+            is_lease_held = await lease_utils.try_acquire_lease(
+                EVENT_STATUS_SWEEPER_LEASE, EVENT_STATUS_SWEEPER_LEASE_SECONDS)
+            if is_lease_held:
+                sweep_counts = await sweep_event_statuses()
+                logging.debug("Event status sweep done: %s", sweep_counts)
+        except Exception:  # pylint: disable=broad-except
+            logging.exception("Event status sweep failed")
+
+        await asyncio.sleep(interval_seconds)
+
+
+async def start_event_status_sweeper() -> None:
+    """
+    Startup handler that schedules the status sweeper on the running loop.
+    """
+    global EVENT_STATUS_SWEEPER_TASK  # pylint: disable=global-statement
+    if EVENT_STATUS_SWEEPER_TASK is None:
+        EVENT_STATUS_SWEEPER_TASK = asyncio.ensure_future(
+            run_event_status_sweeper(EVENT_STATUS_SWEEP_INTERVAL_SECONDS))
+
+
+async def stop_event_status_sweeper() -> None:
+    """
+    Shutdown handler that cancels the status sweeper and waits for it,
+    then gives up it's lease so another worker can take over the sweeps.
+    """
+    global EVENT_STATUS_SWEEPER_TASK  # pylint: disable=global-statement
+    if EVENT_STATUS_SWEEPER_TASK is not None:
+        EVENT_STATUS_SWEEPER_TASK.cancel()
+        try:
+            await EVENT_STATUS_SWEEPER_TASK
+        except asyncio.CancelledError:
+            pass
+        EVENT_STATUS_SWEEPER_TASK = None
+        await lease_utils.release_lease(EVENT_STATUS_SWEEPER_LEASE)
@@ -1,20 +1,28 @@
+# pylint: disable=unsubscriptable-object
+#       - this is actually a pylint bug that hasn't been resolved.
 """
 Handlers for feedback operations.
 """
-from config.db import get_database, get_database_client_name
+from typing import Any, Dict, Optional
+
+from pymongo import ASCENDING
+
+from config.db import get_async_database, AsyncCollection
 from models import exceptions
 import models.users as user_models
 import models.commons as common_models
 import models.feedback as feedback_models
 
+EVENT_FEEDBACK_SORT = [("created_at", ASCENDING), ("_id", ASCENDING)]
+
 
 # instanciate the main collection to use for this util file for convenience
-def feedback_collection():
-    return get_database()[get_database_client_name()]["feedback"]
+def feedback_collection() -> AsyncCollection:
+    return get_async_database()["feedback"]
 
 
-def events_collection():
-    return get_database()[get_database_client_name()]["events"]
+def events_collection() -> AsyncCollection:
+    return get_async_database()["events"]
 
 
 async def delete_feedback(event_id: common_models.EventId,
@@ -23,29 +31,35 @@ async def delete_feedback(event_id: common_models.EventId,
     """
     Given an event id and feedback id, attempt to delete the feedback from
     the event's comment_ids array as well as from the feedback collection
-    """
-    found_event = events_collection().find_one({"_id": event_id})
-
-    if not found_event:
-        raise exceptions.EventNotFoundException
-    if feedback_id not in found_event["comment_ids"]:
-        raise exceptions.FeedbackNotFoundException
 
+    The id is pulled from the event atomically, filtering on it still being
+    in the array, so concurrent comments are never lost and the same
+    feedback can't be deleted twice.
+    """
     feedback_query = {"_id": feedback_id}
-    found_comment_document = feedback_collection().find_one(feedback_query)
+    found_comment_document = await feedback_collection().find_one(
+        feedback_query)
 
     if not found_comment_document:
-        raise exceptions.FeedbackNotFoundException
+        await raise_missing_event_or_feedback(event_id)
     if found_comment_document["creator_id"] != user_id_from_token:
         detail = "User ID does not match creator ID for the comment"
         raise exceptions.UnauthorizedIdentifierData(detail=detail)
 
-    # remove the feedback ID from the event then update the DB document to match
-    found_event["comment_ids"].remove(feedback_id)
-    events_collection().update_one({"_id": event_id}, {"$set": found_event})
+    # remove the feedback ID from the event, if it's still there
+    pull_result = await events_collection().update_one(
+        {
+            "_id": event_id,
+            "comment_ids": feedback_id
+        }, common_models.add_write_stamp(
+            {"$pull": {
+                "comment_ids": feedback_id
+            }}))
+    if not pull_result.matched_count:
+        await raise_missing_event_or_feedback(event_id)
 
     # remove feedback from the feedback collection
-    feedback_collection().delete_one(feedback_query)
+    await feedback_collection().delete_one(feedback_query)
 
 
 async def register_feedback(
@@ -53,25 +67,44 @@ async def register_feedback(
 ) -> common_models.FeedbackId:
     """
     Given an event id, create a feedback id and add the feedback to the event
-    """
-    # attempt to find given event
-    event_id = registration_form.event_id
-    found_event = events_collection().find_one({"_id": event_id})
-    if not found_event:
-        raise exceptions.EventNotFoundException
 
+    The feedback is inserted first and it's id then pushed onto the event
+    atomically, so that every id in `comment_ids` points to a feedback
+    document and concurrent comments are never lost.
+    """
     # insert the feedback into the feedback collection
     valid_feedback = await get_feedback_from_reg_form(registration_form)
-    feedback_collection().insert_one(valid_feedback.dict())
+    valid_feedback.mark_written()
+    valid_feedback.created_at = valid_feedback.updated_at
+    await feedback_collection().insert_one(valid_feedback.dict())
 
-    # add feedback id to event and update it in the database
+    # add feedback id to the event, undoing the insert if there is no event
+    event_id = registration_form.event_id
     feedback_id = valid_feedback.get_id()
-    found_event["comment_ids"].append(feedback_id)
-    events_collection().update_one({"_id": event_id}, {"$set": found_event})
+    push_result = await events_collection().update_one(
+        {"_id": event_id},
+        common_models.add_write_stamp({"$push": {
+            "comment_ids": feedback_id
+        }}))
+    if not push_result.matched_count:
+        await feedback_collection().delete_one({"_id": feedback_id})
+        raise exceptions.EventNotFoundException
 
     return feedback_id
 
 
+async def raise_missing_event_or_feedback(
+        event_id: common_models.EventId) -> None:
+    """
+    Raises a 404 for the event if it doesn't exist, else for the feedback.
+    """
+    event_count = await events_collection().count_documents({"_id": event_id},
+                                                            limit=1)
+    if not event_count:
+        raise exceptions.EventNotFoundException
+    raise exceptions.FeedbackNotFoundException
+
+
 async def get_feedback_from_reg_form(
     reg_form: feedback_models.FeedbackRegistrationRequest
 ) -> feedback_models.Feedback:
@@ -88,9 +121,94 @@ async def get_feedback(
     """
     Returns the feedback document as a Feedback object given it's id.
     """
-    feedback = feedback_collection().find_one({"_id": feedback_id})
+    feedback = await feedback_collection().find_one({"_id": feedback_id})
 
     if not feedback:
         raise exceptions.FeedbackNotFoundException
 
     return feedback_models.Feedback(**feedback)
+
+
+async def get_event_feedback(
+        event_id: common_models.EventId,
+        limit: int,
+        continuation_token: Optional[str] = None
+) -> feedback_models.EventFeedbackListResponse:
+    """
+    Returns a page of the feedback on the event in a single query,
+    served by the `(event_id, created_at, _id)` index on the
+    feedback collection.
+
+    Pages are ordered by creation time, then feedback id; the continuation
+    token points right after the last feedback of the previous page.
+
+    Raises 404 if the page is empty because the event doesn't exist.
+    """
+    filter_dict = {"event_id": event_id}
+    if continuation_token:
+        token = common_models.ContinuationToken.decode(continuation_token)
+        filter_dict.update(await get_feedback_page_filter_dict(token))
+
+    feedback_documents = await feedback_collection().find(filter_dict).sort(
+        EVENT_FEEDBACK_SORT).limit(limit + 1).to_list()
+
+    if not feedback_documents:
+        event_count = await events_collection().count_documents(
+            {"_id": event_id}, limit=1)
+        if not event_count:
+            raise exceptions.EventNotFoundException
+
+    # the extra document fetched only tells if there is a next page
+    has_next_page = len(feedback_documents) > limit
+    feedback_documents = feedback_documents[:limit]
+    feedback_list = [
+        feedback_models.FeedbackListItem(feedback_id=feedback_document["_id"],
+                                         **feedback_document)
+        for feedback_document in feedback_documents
+    ]
+
+    next_continuation_token = None
+    if has_next_page:
+        next_continuation_token = common_models.ContinuationToken(
+            last_id=feedback_documents[-1]["_id"],
+            last_date_time=feedback_documents[-1].get("created_at")).encode()
+
+    return feedback_models.EventFeedbackListResponse(
+        feedback=feedback_list, continuation_token=next_continuation_token)
+
+
+async def get_feedback_page_filter_dict(
+        token: common_models.ContinuationToken) -> Dict[str, Any]:
+    """
+    Returns the filter dict matching the feedback that comes after the
+    token's position in `EVENT_FEEDBACK_SORT` order.
+
+    Feedback without a creation time sorts first, so a token pointing at
+    one of them also lets through everything that has a creation time.
+    """
+    if token.last_date_time is None:
+        return {
+            "$or": [{
+                "created_at": None,
+                "_id": {
+                    "$gt": token.last_id
+                }
+            }, {
+                "created_at": {
+                    "$ne": None
+                }
+            }]
+        }
+
+    return {
+        "$or": [{
+            "created_at": {
+                "$gt": token.last_date_time
+            }
+        }, {
+            "created_at": token.last_date_time,
+            "_id": {
+                "$gt": token.last_id
+            }
+        }]
+    }
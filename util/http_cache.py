@@ -0,0 +1,74 @@
+# pylint: disable=unsubscriptable-object
+#       - this is actually a pylint bug that hasn't been resolved.
+"""
+HTTP caching helpers shared by the read endpoints.
+
+Responses carry a strong `ETag` (and a `Last-Modified` date when the document
+knows when it was last written), so clients and CDNs can revalidate a cached
+copy and get a header-only 304 back if it's still good.
+"""
+import hashlib
+from email.utils import format_datetime
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+from pydantic import BaseModel
+from fastapi.responses import Response
+
+# documents can change at any time, so caches have to revalidate every use
+DOCUMENT_CACHE_CONTROL = "no-cache"
+
+
+def get_strong_etag(data: bytes) -> str:
+    """
+    Returns a strong ETag for the exact bytes of a representation.
+    """
+    return f'"{hashlib.sha256(data).hexdigest()}"'
+
+
+def get_last_modified_header(updated_at: datetime) -> str:
+    """
+    Returns the HTTP date for a (naive, UTC) datetime
+    read from the database.
+    """
+    return format_datetime(updated_at.replace(tzinfo=timezone.utc),
+                           usegmt=True)
+
+
+async def check_etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Checks if the `If-None-Match` header value matches the ETag,
+    meaning the client's cached copy is still good.
+    """
+    if not if_none_match:
+        return False
+
+    client_etags = {
+        client_etag.strip().replace("W/", "", 1)
+        for client_etag in if_none_match.split(",")
+    }
+    return "*" in client_etags or etag in client_etags
+
+
+async def get_conditional_json_response(
+        content: BaseModel,
+        if_none_match: Optional[str],
+        updated_at: Optional[datetime] = None) -> Response:
+    """
+    Returns the model as a JSON response with caching headers,
+    or a header-only 304 if the client's copy is still good.
+
+    The ETag hashes the serialized body itself, since some fields
+    (like an event's status) are worked out at read time.
+    """
+    body = content.json().encode()
+    headers: Dict[str, str] = {
+        "ETag": get_strong_etag(body),
+        "Cache-Control": DOCUMENT_CACHE_CONTROL,
+    }
+    if updated_at:
+        headers["Last-Modified"] = get_last_modified_header(updated_at)
+
+    if await check_etag_matches(if_none_match, headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+    return Response(body, media_type="application/json", headers=headers)
@@ -0,0 +1,121 @@
+# pylint: disable=unsubscriptable-object
+#       - this is actually a pylint bug that hasn't been resolved.
+"""
+In-process cache of image data.
+
+Each worker keeps the most recently served images in memory, bounded by
+their total size in bytes, evicting the least recently used ones first.
+Images never change under the same id, so entries only need to be dropped
+when the image is deleted. Deletes only invalidate the cache of the worker
+handling them; every other worker checks the image is still stored before
+serving it from its cache (see `util.images.get_image_to_serve`).
+"""
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+import models.images as image_models
+from config.main import IMAGE_CACHE_MAX_BYTES
+
+# image id, plus size and format for resized copies
+ImageCacheKey = Tuple[image_models.ImageId, Optional[int], Optional[str]]
+
+
+def get_image_cache_key(
+    image_id: image_models.ImageId,
+    size: Optional[image_models.ImageSizeEnum] = None,
+    image_format: Optional[image_models.ImageFormatEnum] = None
+) -> ImageCacheKey:
+    """
+    Returns the key the image (or it's resized copy) is cached under.
+    """
+    return (image_id, size.value if size else None,
+            image_format.value if image_format else None)
+
+
+class ImageCache:
+    """
+    Least recently used cache of images, bounded by the total
+    amount of bytes of image data held.
+
+    Not thread safe; it's only used from the event loop.
+    """
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.entries: "OrderedDict[ImageCacheKey, image_models.CachedImage]" = \
+            OrderedDict()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self,
+            key: ImageCacheKey) -> Optional[image_models.CachedImage]:
+        """
+        Returns the cached image, marking it as the most recently used,
+        or None if it isn't cached.
+        """
+        cached_image = self.entries.get(key)
+
+        if cached_image is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return cached_image
+
+    def put(self, key: ImageCacheKey,
+            cached_image: image_models.CachedImage) -> None:
+        """
+        Caches the image, evicting the least recently used
+        images until everything fits.
+
+        Images bigger than the whole cache are never cached.
+        """
+        if cached_image.length > self.max_bytes:
+            return
+
+        self.__remove(key)
+        self.entries[key] = cached_image
+        self.current_bytes += cached_image.length
+
+        while self.current_bytes > self.max_bytes:
+            evicted_key = next(iter(self.entries))
+            self.__remove(evicted_key)
+            self.evictions += 1
+
+    def invalidate_image(self, image_id: image_models.ImageId) -> None:
+        """
+        Drops the image and every resized copy of it from the cache.
+        """
+        keys_to_remove = [key for key in self.entries if key[0] == image_id]
+        for key in keys_to_remove:
+            self.__remove(key)
+
+    def clear(self) -> None:
+        """
+        Drops every cached image and resets the metrics.
+        """
+        self.entries.clear()
+        self.current_bytes = 0
+        self.hits = self.misses = self.evictions = 0
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Returns the cache's hit/miss metrics and current size.
+        """
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self.entries),
+            "bytes": self.current_bytes,
+        }
+
+    def __remove(self, key: ImageCacheKey) -> None:
+        cached_image = self.entries.pop(key, None)
+        if cached_image is not None:
+            self.current_bytes -= cached_image.length
+
+
+IMAGE_CACHE = ImageCache(IMAGE_CACHE_MAX_BYTES)
@@ -1,26 +1,64 @@
+# pylint: disable=unsubscriptable-object
+#       - this is actually a pylint bug that hasn't been resolved.
 """
 Handlers for image operations.
 """
 import io
+import re
+import asyncio
+import hashlib
 from uuid import uuid4
+from concurrent.futures import ProcessPoolExecutor
+from typing import AsyncIterator, Dict, Optional, Union
 
 import gridfs
-import pymongo
+import gridfs.errors
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+from gridfs.grid_file import GridIn, GridOut, DEFAULT_CHUNK_SIZE
 from PIL import Image
 from fastapi import UploadFile
 
 from models import exceptions
 import models.images as image_models
-from config.db import get_database, get_database_client_name, get_grid_fs_client
+import models.commons as common_models
+import util.passwords as password_utils
+from config.db import get_async_database, get_grid_fs_client, \
+    run_in_database_executor, AsyncCollection
+from config.main import IMAGE_UPLOAD_MAX_BYTES, IMAGE_RESIZING_WORKERS, \
+    IMAGE_CACHE_MAX_ITEM_BYTES
+from util.image_cache import IMAGE_CACHE, get_image_cache_key
 
+IMAGE_CACHE_CONTROL = "public, max-age=86400"
 
-def images_collection() -> pymongo.collection.Collection:
+# content-hashed images can never change under the same id
+IMMUTABLE_IMAGE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+# a single `bytes=start-end` range, either end optional (but not both)
+SINGLE_BYTE_RANGE_REGEX = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+# uploads are read (and written to GridFS) one GridFS chunk at a time
+IMAGE_UPLOAD_CHUNK_SIZE = DEFAULT_CHUNK_SIZE
+
+# how much of the start of an upload is kept around to identify the image;
+# if PIL can't make out an image header within it, the upload is rejected
+IMAGE_HEADER_MAX_BYTES = 64 * 1024
+
+# created on startup, see `start_image_resizing_pool`
+IMAGE_RESIZING_POOL: Optional[ProcessPoolExecutor] = None
+
+
+def images_collection() -> AsyncCollection:
     """
     Function-based replacement for accessing the database collection for images
 
     Returns the image collection on the current database.
     """
-    return get_database()[get_database_client_name()]["images"]
+    return get_async_database()["images"]
+
+
+def image_contents_collection() -> AsyncCollection:
+    return get_async_database()["image_contents"]
 
 
 def grid_fs_client() -> gridfs.GridFS:
@@ -31,58 +69,550 @@ def grid_fs_client() -> gridfs.GridFS:
     return get_grid_fs_client()
 
 
-async def get_image_by_id(image_id: image_models.ImageId) -> bytes:
+async def get_image_to_serve(
+    image_id: image_models.ImageId,
+    size: Optional[image_models.ImageSizeEnum] = None,
+    image_format: Optional[image_models.ImageFormatEnum] = None
+) -> Union[image_models.CachedImage, GridOut]:
+    """
+    Returns the image (or it's resized copy) from the worker's image cache.
+
+    On a hit, the image is first checked to still be stored, since it may
+    have been deleted through another worker; if it isn't, the image is
+    dropped from this worker's cache too and 404 is raised.
+
+    On a miss, gets it from GridFS and caches it, unless it's bigger than
+    `IMAGE_CACHE_MAX_ITEM_BYTES`; then the GridFS file handle is returned
+    so it can be streamed instead.
+    """
+    cache_key = get_image_cache_key(image_id, size, image_format)
+    cached_image = IMAGE_CACHE.get(cache_key)
+    if cached_image:
+        if not await check_image_is_stored(image_id):
+            IMAGE_CACHE.invalidate_image(image_id)
+            raise exceptions.ImageNotFoundException()
+        return cached_image
+
+    if size:
+        image_file = await get_image_derivative(image_id, size, image_format)
+    else:
+        image_file = await get_image_by_id(image_id)
+
+    if image_file.length > IMAGE_CACHE_MAX_ITEM_BYTES:
+        return image_file
+
+    cached_image = image_models.CachedImage(
+        data=await run_in_database_executor(image_file.read),
+        content_type=image_file.content_type,
+        headers=await get_image_cache_headers(image_file))
+    IMAGE_CACHE.put(cache_key, cached_image)
+    return cached_image
+
+
+async def check_image_is_stored(image_id: image_models.ImageId) -> bool:
+    """
+    Returns whether the image hasn't been deleted, without reading any
+    of it's data: either it's record or, for images from before content
+    hashing, it's GridFS file still exists.
+    """
+    image_filter_dict = {"_id": image_id}
+    if await images_collection().count_documents(image_filter_dict,
+                                                  limit=1):
+        return True
+
+    grid_files_collection = get_async_database()["fs.files"]
+    return bool(await grid_files_collection.count_documents(image_filter_dict,
+                                                             limit=1))
+
+
+async def get_image_by_id(image_id: image_models.ImageId) -> GridOut:
+    """
+    Retrieves the GridFS file handle for the given image if it exists,
+    else raises 404.
+
+    Only the file's metadata is read here, it's data can then
+    be streamed with `iterate_image_chunks`.
+    """
+    stored_image = await get_stored_image(image_id)
+    return await get_grid_file_by_id(stored_image.file_id)
+
+
+async def get_stored_image(
+        image_id: image_models.ImageId) -> image_models.StoredImage:
     """
-    Retrieves the given image from the database and returns it as binary data
-    if it exists, else raises 404.
+    Returns where the image's content is stored. Images uploaded before
+    content hashing have no record, and are their own GridFS file.
     """
-    file = grid_fs_client().find_one(image_id)
+    stored_image_document = await images_collection().find_one(
+        {"_id": image_id})
+
+    if not stored_image_document:
+        return image_models.StoredImage(_id=image_id, file_id=image_id)
+
+    return image_models.StoredImage(**stored_image_document)
 
-    if not file:
+
+async def get_grid_file_by_id(file_id: str) -> GridOut:
+    """
+    Retrieves the GridFS file handle with the given id,
+    raising 404 if there is none.
+    """
+    grid_file = await run_in_database_executor(grid_fs_client().find_one,
+                                               file_id)
+
+    if not grid_file:
         raise exceptions.ImageNotFoundException
 
-    return file.read()
+    return grid_file
+
+
+async def get_image_derivative(
+        image_id: image_models.ImageId, size: image_models.ImageSizeEnum,
+        image_format: image_models.ImageFormatEnum) -> GridOut:
+    """
+    Retrieves the GridFS file handle for a resized copy of the image,
+    generating and storing it first if this is the first time it's asked for.
+
+    Copies are keyed by the image's content, so images uploaded with the
+    same data share them.
+
+    Raises 404 if the original image doesn't exist.
+    """
+    stored_image = await get_stored_image(image_id)
+    derivative_id = image_models.get_derivative_image_id(
+        stored_image.get_content_key(), size, image_format)
+    derivative_file = await run_in_database_executor(
+        grid_fs_client().find_one, derivative_id)
+
+    if derivative_file:
+        return derivative_file
+
+    await generate_image_derivative(stored_image, size, image_format)
+    return await get_grid_file_by_id(derivative_id)
+
+
+async def generate_image_derivative(
+        stored_image: image_models.StoredImage,
+        size: image_models.ImageSizeEnum,
+        image_format: image_models.ImageFormatEnum) -> None:
+    """
+    Resizes the original image on the image resizing pool and stores
+    the result in GridFS alongside it.
+
+    Two requests racing to generate the same copy is harmless,
+    the second one to store it just keeps the first one's.
+    """
+    original_file = await get_grid_file_by_id(stored_image.file_id)
+    original_bytes = await run_in_database_executor(original_file.read)
+
+    loop = asyncio.get_running_loop()
+    derivative_bytes = await loop.run_in_executor(get_image_resizing_pool(),
+                                                  resize_image_data,
+                                                  original_bytes, size.value,
+                                                  image_format.value)
+
+    derivative_id = image_models.get_derivative_image_id(
+        stored_image.get_content_key(), size, image_format)
+    try:
+        await run_in_database_executor(
+            grid_fs_client().put,
+            derivative_bytes,
+            _id=derivative_id,
+            contentType=image_format.get_media_type(),
+            sha256=hashlib.sha256(derivative_bytes).hexdigest(),
+            metadata={
+                "original_image_id": stored_image.get_id(),
+                "size": size.value
+            })
+    except gridfs.errors.FileExists:
+        pass
+
+
+def resize_image_data(image_bytes: bytes, size: int,
+                      image_format: str) -> bytes:
+    """
+    Shrinks the image so it's longest side is at most `size` pixels
+    (never enlarging it) and re-encodes it in the given PIL format.
+
+    Runs on the image resizing pool, so must stay a picklable
+    module-level function.
+    """
+    with Image.open(io.BytesIO(image_bytes)) as image:
+        # JPEG has no alpha channel or palette
+        target_mode = "RGBA" if image_format == "WEBP" else "RGB"
+        resized_image = image.convert(target_mode)
+        resized_image.thumbnail((size, size))
+
+    resized_image_buffer = io.BytesIO()
+    resized_image.save(resized_image_buffer, format=image_format, quality=80)
+    return resized_image_buffer.getvalue()
+
+
+def start_image_resizing_pool() -> None:
+    """
+    Startup handler that creates the process pool for resizing images.
+
+    Like the password hashing pool, it's started before the database
+    executor's threads exist, and never with a plain fork.
+    """
+    global IMAGE_RESIZING_POOL  # pylint: disable=global-statement
+    if IMAGE_RESIZING_POOL is None:
+        IMAGE_RESIZING_POOL = ProcessPoolExecutor(
+            max_workers=IMAGE_RESIZING_WORKERS,
+            mp_context=password_utils.get_process_start_context())
+
+
+def get_image_resizing_pool() -> ProcessPoolExecutor:
+    """
+    Returns the process pool for resizing images, creating it
+    first if the app was run without its startup handlers.
+    """
+    start_image_resizing_pool()
+    return IMAGE_RESIZING_POOL
+
+
+def shutdown_image_resizing_pool() -> None:
+    """
+    Shuts the process pool down, if it was ever created.
+    """
+    global IMAGE_RESIZING_POOL  # pylint: disable=global-statement
+    if IMAGE_RESIZING_POOL is not None:
+        IMAGE_RESIZING_POOL.shutdown(wait=True)
+        IMAGE_RESIZING_POOL = None
+
+
+async def get_image_format_from_accept_header(  # pylint: disable=invalid-name
+        accept_header: Optional[str]) -> image_models.ImageFormatEnum:
+    """
+    Picks the format to send resized images in: WebP if the client
+    says it accepts it, else JPEG which every client can show.
+    """
+    # pylint: disable=no-member
+    webp_media_type = image_models.ImageFormatEnum.WEBP.get_media_type()
+    if accept_header and webp_media_type in accept_header:
+        return image_models.ImageFormatEnum.WEBP
+    return image_models.ImageFormatEnum.JPEG
+
+
+async def iterate_image_chunks(
+        image_file: Union[image_models.CachedImage, GridOut],
+        byte_range: Optional[image_models.ByteRange] = None
+) -> AsyncIterator[bytes]:
+    """
+    Yields the image data (or only the bytes in the range) one GridFS
+    chunk at a time, so that only one chunk is ever held in memory.
+
+    Cached images are already in memory, so are yielded in one go.
+    """
+    start = byte_range.start if byte_range else 0
+    bytes_left = byte_range.get_length() if byte_range else image_file.length
+
+    if isinstance(image_file, image_models.CachedImage):
+        yield image_file.data[start:start + bytes_left]
+        return
+
+    await run_in_database_executor(image_file.seek, start)
+
+    while bytes_left > 0:
+        chunk = await run_in_database_executor(
+            image_file.read, min(image_file.chunk_size, bytes_left))
+        if not chunk:
+            break
+        bytes_left -= len(chunk)
+        yield chunk
+
+
+async def get_image_etag(image_file: GridOut) -> str:
+    """
+    Returns the strong ETag for the image: it's SHA-256 hash if it was
+    content hashed, else the GridFS md5 checksum if the file has one,
+    else it's id, upload date and length.
+    """
+    content_hash = await get_image_content_hash(image_file)
+    if content_hash:
+        return f'"{content_hash}"'
+
+    if image_file.md5:
+        return f'"{image_file.md5}"'
+
+    upload_timestamp = int(image_file.upload_date.timestamp() * 1000)
+    image_id = image_file._id  # pylint: disable=protected-access
+    return f'"{image_id}-{upload_timestamp}-{image_file.length}"'
+
+
+async def get_image_content_hash(image_file: GridOut) -> Optional[str]:
+    """
+    Returns the SHA-256 hash the file was stored with,
+    or None if it was stored before content hashing.
+    """
+    return getattr(image_file, "sha256", None)
+
+
+async def get_image_cache_headers(
+        image_file: Union[image_models.CachedImage, GridOut]) -> Dict[str, str]:
+    """
+    Returns the caching headers sent along with every image response.
+
+    Content hashed images are marked immutable, since the data
+    behind their id can never change.
+    """
+    if isinstance(image_file, image_models.CachedImage):
+        return dict(image_file.headers)
+
+    is_content_hashed = bool(await get_image_content_hash(image_file))
+    return {
+        "ETag": await get_image_etag(image_file),
+        "Cache-Control": IMMUTABLE_IMAGE_CACHE_CONTROL
+                         if is_content_hashed else IMAGE_CACHE_CONTROL,
+        "Accept-Ranges": "bytes",
+    }
 
 
-async def image_upload(upload_file: UploadFile) -> image_models.ImageId:
+async def get_byte_range_from_header(
+        range_header: Optional[str],
+        total_length: int) -> Optional[image_models.ByteRange]:
+    """
+    Parses a `Range` header for a single byte range within the file.
+
+    Returns None if there is no header or it can't be understood (so the
+    whole file is sent), and raises 416 if the range lies outside the file.
+    """
+    if not range_header:
+        return None
+
+    range_match = SINGLE_BYTE_RANGE_REGEX.match(range_header.strip())
+    if not range_match or range_match.groups() == ("", ""):
+        return None
+
+    start_str, end_str = range_match.groups()
+    last_byte = total_length - 1
+
+    if not start_str:
+        # suffix range, i.e. the last `end_str` bytes
+        suffix_length = int(end_str)
+        if suffix_length == 0:
+            raise exceptions.RangeNotSatisfiableException
+        start, end = max(total_length - suffix_length, 0), last_byte
+    else:
+        start = int(start_str)
+        end = min(int(end_str), last_byte) if end_str else last_byte
+
+    if start > end or start >= total_length:
+        raise exceptions.RangeNotSatisfiableException
+
+    return image_models.ByteRange(start=start,
+                                  end=end,
+                                  total_length=total_length)
+
+
+async def image_upload(
+        upload_file: UploadFile,
+        uploader_id: Optional[common_models.UserId] = None
+) -> image_models.ImageId:
     """
     Validates and uploads the file data within the upload file
     into GridFS, returning the UUID.
+
+    The data is streamed into GridFS one chunk at a time, checking the
+    image header and size as it goes; if either check fails the chunks
+    written so far are deleted.
+
+    Every upload gets it's own image id, but the data itself is only kept
+    once per SHA-256 hash: if the same data was already stored, the new
+    copy is deleted and the image points to the existing one.
     """
-    await validate_incoming_file_data(upload_file)
-    file_data = upload_file.file
+    file_id = str(uuid4())
+    grid_file = await run_in_database_executor(grid_fs_client().new_file,
+                                               _id=file_id)
 
-    image_id = str(uuid4())
-    grid_fs_client().put(file_data, _id=image_id)
+    try:
+        content_hash = await write_upload_to_grid_file(upload_file, grid_file)
+    except BaseException:
+        await run_in_database_executor(grid_file.abort)
+        raise
 
-    return image_id
+    # stored on the GridFS file document when it's closed
+    grid_file.sha256 = content_hash
+    await run_in_database_executor(grid_file.close)
 
+    stored_file_id = await add_image_content_reference(content_hash, file_id)
+    if stored_file_id != file_id:
+        await run_in_database_executor(grid_fs_client().delete, file_id)
 
-async def validate_incoming_file_data(file: UploadFile) -> None:
+    stored_image = image_models.StoredImage(content_hash=content_hash,
+                                            file_id=stored_file_id,
+                                            uploader_id=uploader_id)
+    await images_collection().insert_one(stored_image.dict())
+    return stored_image.get_id()
+
+
+async def write_upload_to_grid_file(upload_file: UploadFile,
+                                    grid_file: GridIn) -> str:
     """
-    Does some simple data validation on the incoming file data,
-    trying to assert that it is a valid image.
+    Writes each chunk of the upload into the GridFS file, validating
+    the image header from the first bytes that come in.
 
-    Raises the appropriate error if invalid, or returning
-    None if valid.
+    Returns the SHA-256 hash of all of the data written.
     """
-    await check_file_data_is_valid_image(file)
+    header_bytes = b""
+    is_header_valid = False
+    content_hash = hashlib.sha256()
+
+    async for chunk in iterate_upload_chunks(upload_file):
+        if not is_header_valid:
+            header_bytes = (header_bytes + chunk)[:IMAGE_HEADER_MAX_BYTES]
+            is_header_valid = await check_image_header_is_valid(
+                header_bytes,
+                is_complete=len(header_bytes) >= IMAGE_HEADER_MAX_BYTES)
+
+        content_hash.update(chunk)
+        await run_in_database_executor(grid_file.write, chunk)
 
+    if not is_header_valid:
+        await check_image_header_is_valid(header_bytes, is_complete=True)
 
-async def check_file_data_is_valid_image(file: UploadFile) -> None:
+    return content_hash.hexdigest()
+
+
+async def add_image_content_reference(content_hash: str, file_id: str) -> str:
     """
-    Uses PIL to verify the integrity of the image data.
-    Raises exceptions if invalid, else returns none.
+    Adds a reference to the content with the given hash, recording
+    `file_id` as it's GridFS file if it's new content.
+
+    Returns the id of the GridFS file the content is stored in,
+    which is a different one if the content was already stored.
+    """
+    query = {"_id": content_hash}
+    update = {"$inc": {"ref_count": 1}, "$setOnInsert": {"file_id": file_id}}
+
+    try:
+        image_content_document = await image_contents_collection(
+        ).find_one_and_update(query,
+                              update,
+                              upsert=True,
+                              return_document=ReturnDocument.AFTER)
+    except DuplicateKeyError:
+        # lost an upsert race with the same content, which now exists
+        image_content_document = await image_contents_collection(
+        ).find_one_and_update(query,
+                              update,
+                              return_document=ReturnDocument.AFTER)
+
+    return image_content_document["file_id"]
+
+
+async def delete_image(
+        image_id: image_models.ImageId,
+        uploader_id: Optional[common_models.UserId] = None) -> None:
     """
-    image_byte_data = io.BytesIO(await file.read())
+    Deletes the image, raising 404 if it doesn't exist.
+
+    If `uploader_id` is given, the image is only deleted if that user
+    uploaded it, raising 401 otherwise; images uploaded before uploaders
+    were kept can then never match.
+
+    The stored content (and it's resized copies) is only deleted
+    once no other image points to it anymore.
+
+    Only this worker's image cache is invalidated here; other workers
+    notice the image is gone the next time they serve it from theirs,
+    see `get_image_to_serve`.
+    """
+    image_filter_dict = {"_id": image_id}
+    if uploader_id is not None:
+        image_filter_dict["uploader_id"] = uploader_id
+
+    stored_image_document = await images_collection().find_one_and_delete(
+        image_filter_dict)
+
+    if not stored_image_document and uploader_id is not None:
+        await get_image_by_id(image_id)
+        detail = "Only the user who uploaded an image can delete it"
+        raise exceptions.UnauthorizedIdentifierData(detail=detail)
+
+    IMAGE_CACHE.invalidate_image(image_id)
+
+    if not stored_image_document:
+        # images from before content hashing are only a GridFS file
+        await get_grid_file_by_id(image_id)
+        await delete_image_files(image_id, image_id)
+        return
+
+    stored_image = image_models.StoredImage(**stored_image_document)
+    content_hash = stored_image.content_hash
+    await image_contents_collection().update_one({"_id": content_hash},
+                                                 {"$inc": {
+                                                     "ref_count": -1
+                                                 }})
+
+    # only matches if no upload added a reference back in the meantime
+    delete_result = await image_contents_collection().delete_one({
+        "_id": content_hash,
+        "ref_count": {
+            "$lte": 0
+        }
+    })
+    if delete_result.deleted_count:
+        await delete_image_files(stored_image.file_id, content_hash)
 
-    # reset cursor position post-read
-    await file.seek(0)
 
+async def delete_image_files(file_id: str, content_key: str) -> None:
+    """
+    Deletes the GridFS file holding an image's data along with
+    every resized copy made from it.
+    """
+    file_ids_to_delete = [file_id] + [
+        image_models.get_derivative_image_id(content_key, size, image_format)
+        for size in image_models.ImageSizeEnum
+        for image_format in image_models.ImageFormatEnum
+    ]
+
+    for file_id_to_delete in file_ids_to_delete:
+        await run_in_database_executor(grid_fs_client().delete,
+                                       file_id_to_delete)
+
+
+async def iterate_upload_chunks(
+        upload_file: UploadFile) -> AsyncIterator[bytes]:
+    """
+    Yields the upload's data one chunk at a time, raising 413 as soon
+    as it grows past `IMAGE_UPLOAD_MAX_BYTES`.
+    """
+    total_bytes = 0
+
+    while True:
+        chunk = await upload_file.read(IMAGE_UPLOAD_CHUNK_SIZE)
+        if not chunk:
+            break
+
+        total_bytes += len(chunk)
+        if total_bytes > IMAGE_UPLOAD_MAX_BYTES:
+            detail = f"Image is larger than {IMAGE_UPLOAD_MAX_BYTES} bytes"
+            raise exceptions.PayloadTooLargeException(detail=detail)
+
+        yield chunk
+
+
+async def check_image_header_is_valid(header_bytes: bytes,
+                                      is_complete: bool) -> bool:
+    """
+    Uses PIL to identify the image from the first bytes of the data,
+    which only parses the header instead of decoding the whole image.
+
+    Returns True if the header is valid, and False if more data is needed
+    to tell. Once `is_complete` is set (no more header data is coming),
+    raises exceptions if the header is invalid instead.
+    """
     try:
-        image_to_verify = Image.open(image_byte_data)
-        image_to_verify.verify()
+        with Image.open(io.BytesIO(header_bytes)):
+            return True
+    except Image.DecompressionBombError as image_verification_error:
+        detail = f"Invalid or unreadable image data: {image_verification_error}"
+        raise exceptions.InvalidDataException(
+            detail=detail) from image_verification_error
     except Exception as image_verification_error:
+        if not is_complete:
+            return False
         detail = f"Invalid or unreadable image data: {image_verification_error}"
         raise exceptions.InvalidDataException(
             detail=detail) from image_verification_error
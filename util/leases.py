@@ -0,0 +1,75 @@
+"""
+Leases kept in the database, so that a background job (like the event status
+sweeper) only runs in one process at a time, however many workers are up.
+
+A lease is a single document naming the process that holds it and when it
+runs out. The holder renews it every time it runs the job; if it stops
+doing so (e.g. it crashed), any other process can take it once it expires.
+"""
+import os
+import socket
+from datetime import datetime, timedelta
+
+from pymongo.errors import DuplicateKeyError
+
+from config.db import get_async_database, AsyncCollection
+
+
+def leases_collection() -> AsyncCollection:
+    return get_async_database()["leases"]
+
+
+def get_lease_holder_id() -> str:
+    """
+    Returns the id this process holds leases under, unique
+    to every worker process on every machine.
+    """
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+async def try_acquire_lease(lease_name: str, duration_seconds: float) -> bool:
+    """
+    Takes (or renews) the lease for `duration_seconds` from now,
+    returning whether this process holds it.
+
+    Fails if another process holds the lease and it hasn't expired yet.
+    """
+    present = datetime.utcnow()
+    holder_id = get_lease_holder_id()
+
+    lease_filter_dict = {
+        "_id": lease_name,
+        "$or": [{
+            "holder_id": holder_id
+        }, {
+            "expires_at": {
+                "$lte": present
+            }
+        }]
+    }
+    lease_update_dict = {
+        "$set": {
+            "holder_id": holder_id,
+            "expires_at": present + timedelta(seconds=duration_seconds)
+        }
+    }
+
+    try:
+        await leases_collection().update_one(lease_filter_dict,
+                                             lease_update_dict,
+                                             upsert=True)
+    except DuplicateKeyError:
+        # the lease exists but is held by someone else
+        return False
+    return True
+
+
+async def release_lease(lease_name: str) -> None:
+    """
+    Gives the lease up if this process holds it,
+    so another process can take it right away.
+    """
+    await leases_collection().delete_one({
+        "_id": lease_name,
+        "holder_id": get_lease_holder_id()
+    })
@@ -0,0 +1,111 @@
+# pylint: disable=unsubscriptable-object
+#       - this is actually a pylint bug that hasn't been resolved.
+"""
+Password hashing service.
+
+bcrypt is slow on purpose, so hashing and checking passwords is done on a
+process pool instead of the event loop. The amount of calls running or
+waiting on the pool is bounded; once it's full, new calls are turned away
+with a 429 instead of queueing up behind a login storm.
+
+The pool's processes are started through a forkserver (or spawned, where
+there is none) rather than forked, so they never inherit the database
+executor's threads or the Mongo client's sockets.
+"""
+import asyncio
+import multiprocessing
+from typing import Callable, Any, Optional
+from concurrent.futures import ProcessPoolExecutor
+
+from models import exceptions
+import models.users as user_models
+from config.main import PASSWORD_HASHING_WORKERS, PASSWORD_HASHING_MAX_PENDING
+
+# created on startup, see `start_password_hashing_pool`
+PASSWORD_HASHING_POOL: Optional[ProcessPoolExecutor] = None
+
+# calls currently running or queued on the pool
+PENDING_PASSWORD_CALLS = 0
+
+
+def start_password_hashing_pool() -> None:
+    """
+    Startup handler that creates the process pool for password hashing.
+
+    Registered before any handler that touches the database, so the
+    pool is set up before the database executor's threads exist.
+    """
+    global PASSWORD_HASHING_POOL  # pylint: disable=global-statement
+    if PASSWORD_HASHING_POOL is None:
+        PASSWORD_HASHING_POOL = ProcessPoolExecutor(
+            max_workers=PASSWORD_HASHING_WORKERS,
+            mp_context=get_process_start_context())
+
+
+def get_password_hashing_pool() -> ProcessPoolExecutor:
+    """
+    Returns the process pool for password hashing, creating it
+    first if the app was run without its startup handlers.
+    """
+    start_password_hashing_pool()
+    return PASSWORD_HASHING_POOL
+
+
+def get_process_start_context() -> multiprocessing.context.BaseContext:
+    """
+    Returns the forkserver context where the platform has one, else spawn;
+    never plain fork, which would copy the parent's threads' locks.
+    """
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("forkserver")
+    return multiprocessing.get_context("spawn")
+
+
+def shutdown_password_hashing_pool() -> None:
+    """
+    Shuts the process pool down, if it was ever created.
+    """
+    global PASSWORD_HASHING_POOL  # pylint: disable=global-statement
+    if PASSWORD_HASHING_POOL is not None:
+        PASSWORD_HASHING_POOL.shutdown(wait=True)
+        PASSWORD_HASHING_POOL = None
+
+
+async def run_on_password_hashing_pool(function: Callable[..., Any],
+                                       *args) -> Any:
+    """
+    Runs the (picklable) function on the password hashing pool.
+
+    Raises 429 if the pool already has `PASSWORD_HASHING_MAX_PENDING`
+    calls running or queued.
+    """
+    global PENDING_PASSWORD_CALLS  # pylint: disable=global-statement
+    if PENDING_PASSWORD_CALLS >= PASSWORD_HASHING_MAX_PENDING:
+        raise exceptions.ServiceBusyException(
+            detail="Too many password operations in progress, try again later")
+
+    PENDING_PASSWORD_CALLS += 1
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(get_password_hashing_pool(),
+                                          function, *args)
+    finally:
+        PENDING_PASSWORD_CALLS -= 1
+
+
+async def hash_password(password: str) -> str:
+    """
+    Returns the stored form of the password, hashed off the event loop.
+    """
+    return await run_on_password_hashing_pool(user_models.hash_password,
+                                              password)
+
+
+async def check_password_matches(password_to_check: str,
+                                 stored_password: str) -> bool:
+    """
+    Checks the password against it's stored form off the event loop.
+    """
+    return await run_on_password_hashing_pool(
+        user_models.check_password_matches, password_to_check,
+        stored_password)
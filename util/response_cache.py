@@ -0,0 +1,224 @@
+# pylint: disable=unsubscriptable-object
+#       - this is actually a pylint bug that hasn't been resolved.
+"""
+Cache of public event listing responses.
+
+Listings are cached as their serialized JSON, keyed on the normalized query
+that produced them, for `EVENT_RESPONSE_CACHE_TTL_SECONDS` at most. Every
+key is prefixed with a generation number, so dropping every listing at once
+(whenever an event is written) is just bumping the generation; anything
+computed under an older generation is never read again and ages out.
+
+The backend is in-process by default, one cache per worker. Setting
+`EVENT_RESPONSE_CACHE_REDIS_URL` shares it between every worker instead,
+through any server speaking the Redis protocol.
+
+Invalidation only reaches every worker with the Redis backend: in-process,
+a write only bumps the generation of the worker that handled it, and the
+other workers keep serving their listings for up to the TTL.
+"""
+import json
+import time
+import hashlib
+import logging
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from pydantic import BaseModel
+
+from config.db import run_in_database_executor
+from config.main import EVENT_RESPONSE_CACHE_TTL_SECONDS, \
+    EVENT_RESPONSE_CACHE_MAX_ENTRIES, EVENT_RESPONSE_CACHE_REDIS_URL
+
+# when the entry expires (on the monotonic clock), and the response json
+CachedResponse = Tuple[float, str]
+
+
+def get_response_cache_key(namespace: str, query_dict: Dict[str,
+                                                            Any]) -> str:
+    """
+    Returns the key a listing is cached under, the same for any
+    two queries holding the same values.
+    """
+    query_json = json.dumps(query_dict, sort_keys=True, default=str)
+    query_hash = hashlib.sha256(query_json.encode()).hexdigest()
+    return f"{namespace}:{query_hash}"
+
+
+class InProcessResponseCacheBackend:
+    """
+    Keeps the responses in this worker's memory, bounded by the amount of
+    entries, evicting the oldest ones first.
+
+    Not thread safe; it's only used from the event loop.
+    """
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self.entries: "OrderedDict[str, CachedResponse]" = OrderedDict()
+        self.generation = 0
+
+    async def get_generation(self) -> int:
+        return self.generation
+
+    async def get(self, key: str) -> Optional[str]:
+        """
+        Returns the cached response, or None if it isn't
+        cached or has expired.
+        """
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, response_json = entry
+        if expires_at <= time.monotonic():
+            del self.entries[key]
+            return None
+        return response_json
+
+    async def set(self, key: str, response_json: str,
+                  ttl_seconds: int) -> None:
+        """
+        Caches the response, evicting the oldest ones if full.
+        """
+        self.entries.pop(key, None)
+        self.entries[key] = (time.monotonic() + ttl_seconds, response_json)
+
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    async def invalidate(self) -> None:
+        """
+        Moves on to a new generation; the old one's entries
+        can't be read anymore, so they're dropped right away.
+        """
+        self.clear()
+
+    def clear(self) -> None:
+        self.generation += 1
+        self.entries.clear()
+
+
+class RedisResponseCacheBackend:
+    """
+    Keeps the responses in a Redis-compatible server shared by every worker,
+    letting the server expire them.
+
+    Needs the `redis` package, which is only imported when this backend is
+    configured. Calls are blocking, so they run on the database executor;
+    if the server can't be reached, the cache is skipped rather than
+    failing the request.
+
+    Connects to `url`, unless an already connected `client` is given.
+    """
+    GENERATION_KEY = "event_responses:generation"
+
+    def __init__(self, url: Optional[str] = None, client: Any = None):
+        # pylint: disable=import-outside-toplevel,import-error
+        import redis
+        self.redis_error = redis.RedisError
+        self.client = client if client is not None else redis.Redis.from_url(
+            url)
+
+    async def get_generation(self) -> int:
+        generation = await self.__run(self.client.get, self.GENERATION_KEY)
+        return int(generation or 0)
+
+    async def get(self, key: str) -> Optional[str]:
+        response_json = await self.__run(self.client.get,
+                                         self.__get_redis_key(key))
+        return response_json.decode() if response_json else None
+
+    async def set(self, key: str, response_json: str,
+                  ttl_seconds: int) -> None:
+        await self.__run(self.client.set,
+                         self.__get_redis_key(key),
+                         response_json,
+                         ex=ttl_seconds)
+
+    async def invalidate(self) -> None:
+        await self.__run(self.client.incr, self.GENERATION_KEY)
+
+    def clear(self) -> None:
+        self.client.incr(self.GENERATION_KEY)
+
+    async def __run(self, function: Callable[..., Any], *args,
+                    **kwargs) -> Any:
+        try:
+            return await run_in_database_executor(function, *args, **kwargs)
+        except self.redis_error:
+            logging.exception("Event response cache call failed")
+            return None
+
+    @staticmethod
+    def __get_redis_key(key: str) -> str:
+        return f"event_responses:{key}"
+
+
+class ResponseCache:
+    """
+    Caches serialized responses on top of a backend,
+    keeping hit/miss metrics for this worker.
+    """
+    def __init__(self, backend: Any, ttl_seconds: int):
+        self.backend = backend
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+
+    async def get_or_compute(
+            self, namespace: str, query_dict: Dict[str, Any],
+            compute_response: Callable[[], Awaitable[BaseModel]]) -> str:
+        """
+        Returns the cached JSON for the query, or computes, caches
+        and returns it if it isn't cached yet.
+
+        Cached JSON is sent as is, skipping the route's response model, so
+        a computed response is validated once here instead; responses built
+        from documents with `construct()` are checked before being cached.
+        """
+        generation = await self.backend.get_generation()
+        key = f"{generation}:{get_response_cache_key(namespace, query_dict)}"
+
+        response_json = await self.backend.get(key)
+        if response_json is not None:
+            self.hits += 1
+            return response_json
+
+        self.misses += 1
+        response = await compute_response()
+        response_json = type(response).parse_obj(response.dict()).json()
+        await self.backend.set(key, response_json, self.ttl_seconds)
+        return response_json
+
+    async def invalidate(self) -> None:
+        """
+        Drops every cached response.
+        """
+        await self.backend.invalidate()
+
+    def clear(self) -> None:
+        """
+        Drops every cached response and resets the metrics.
+        """
+        self.backend.clear()
+        self.hits = self.misses = 0
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Returns the cache's hit/miss metrics for this worker.
+        """
+        return {"hits": self.hits, "misses": self.misses}
+
+
+def get_response_cache_backend() -> Any:
+    """
+    Returns the configured backend: Redis if a url is set,
+    else in-process.
+    """
+    if EVENT_RESPONSE_CACHE_REDIS_URL:
+        return RedisResponseCacheBackend(EVENT_RESPONSE_CACHE_REDIS_URL)
+    return InProcessResponseCacheBackend(EVENT_RESPONSE_CACHE_MAX_ENTRIES)
+
+
+EVENT_RESPONSE_CACHE = ResponseCache(get_response_cache_backend(),
+                                     EVENT_RESPONSE_CACHE_TTL_SECONDS)
@@ -1,11 +1,16 @@
+# pylint: disable=unsubscriptable-object
+#       - this is actually a pylint bug that hasn't been resolved.
 """
 Holds handling functions for user operations.
 
 Uses a floating instance of the database client that is instanciated in
 the `config.db` module like all other `util` modules.
 """
-from typing import Dict, Any, List
+import time
+from contextvars import ContextVar
+from typing import Dict, Any, List, Tuple, Optional
 
+from pymongo import UpdateMany
 import pymongo.errors as pymongo_exceptions
 import pymongo.results as pymongo_results
 
@@ -14,13 +19,75 @@ from models.auth import Token
 import models.users as user_models
 import models.events as event_models
 import models.commons as common_models
-from config.db import get_database, get_database_client_name
+from config.db import get_async_database, AsyncCollection
+from config.main import TOKEN_VERSION_CACHE_TTL_SECONDS
 import util.events as event_utils
+import util.passwords as password_utils
+
+
+# per-request cache of the user documents read, keyed by (field, value) pairs
+# of their identifiers; `None` outside of a request, which disables caching
+REQUEST_USER_IDENTITY_MAP: ContextVar[Optional[Dict[Tuple[str, str],
+                                                     user_models.User]]] = \
+    ContextVar("request_user_identity_map", default=None)
+
+# in-process cache of user_id -> (token version, monotonic time it was read),
+# the version being `None` for users that don't exist
+TOKEN_VERSION_CACHE: Dict[common_models.UserId, Tuple[Optional[int],
+                                                      float]] = {}
 
 
 # instantiate the main collection to use for this util file for convenience
-def users_collection():
-    return get_database()[get_database_client_name()]["users"]
+def users_collection() -> AsyncCollection:
+    return get_async_database()["users"]
+
+
+async def start_request_user_identity_map() -> None:
+    """
+    Dependency that gives the current request an empty identity map, so that
+    every user document is read from the database at most once per request.
+    """
+    REQUEST_USER_IDENTITY_MAP.set({})
+
+
+async def clear_request_user_identity_map() -> None:
+    """
+    Forgets every user cached by the current request, if any.
+
+    Must be called after every write to the users collection.
+    """
+    identity_map = REQUEST_USER_IDENTITY_MAP.get()
+    if identity_map is not None:
+        identity_map.clear()
+
+
+async def get_user_from_identity_map(
+        query: Dict[str, str]) -> Optional[user_models.User]:
+    """
+    Returns a copy of the cached user matching every field of the
+    identifier query, or None if there is no such user (or no cache).
+    """
+    identity_map = REQUEST_USER_IDENTITY_MAP.get()
+    if not identity_map:
+        return None
+
+    cached_users = [identity_map.get(item) for item in query.items()]
+    first_user = cached_users[0]
+    if first_user and all(user is first_user for user in cached_users):
+        return first_user.copy(deep=True)
+
+    return None
+
+
+async def add_user_to_identity_map(user: user_models.User) -> None:
+    """
+    Caches the user for the rest of the current request under each
+    of it's identifiers. Does nothing outside of a request.
+    """
+    identity_map = REQUEST_USER_IDENTITY_MAP.get()
+    if identity_map is not None:
+        identity_map[("_id", user.get_id())] = user
+        identity_map[("email", user.email)] = user
 
 
 async def register_user(
@@ -33,7 +100,8 @@ async def register_user(
 
     # insert id into column
     try:
-        users_collection().insert_one(user_object.dict())
+        user_object.mark_written()
+        await users_collection().insert_one(user_object.dict())
     except pymongo_exceptions.DuplicateKeyError as dupe_error:
         detail = "Invalid user insertion: duplicate email"
         raise exceptions.DuplicateDataException(detail=detail) from dupe_error
@@ -53,7 +121,8 @@ async def get_valid_user_from_reg_form(
     user_object = user_models.User(**user_reg_form.dict(), user_type=user_type)
 
     pre_hash_user_password = user_reg_form.password
-    user_object.set_password(pre_hash_user_password)
+    user_object.password = await password_utils.hash_password(
+        pre_hash_user_password)
 
     return user_object
 
@@ -66,14 +135,20 @@ async def get_user_info_by_identifier(
     """
     query = identifier.get_database_query()
 
+    cached_user = await get_user_from_identity_map(query)
+    if cached_user:
+        return cached_user
+
     # query to database
-    user_document = users_collection().find_one(query)
+    user_document = await users_collection().find_one(query)
 
     if not user_document:
         raise exceptions.UserNotFoundException
 
     # cast the database response into a User object
-    return user_models.User(**user_document)
+    user = user_models.User(**user_document)
+    await add_user_to_identity_map(user)
+    return user.copy(deep=True)
 
 
 async def check_if_user_exists_by_id(user_id: common_models.UserId) -> None:
@@ -94,7 +169,10 @@ async def delete_user(identifier: user_models.UserIdentifier) -> None:
     """
 
     query = identifier.get_database_query()
-    response = users_collection().delete_one(query)
+    response = await users_collection().delete_one(query)
+    await clear_request_user_identity_map()
+    # the identifier may not hold the id, and deletes are rare enough
+    TOKEN_VERSION_CACHE.clear()
     if response.deleted_count == 0:
         detail = "User not found and could not be deleted"
         raise exceptions.UserNotFoundException(detail=detail)
@@ -128,7 +206,8 @@ async def check_user_password_matches(login_form: user_models.UserLoginForm,
     Compares the password of the user loging form and the user object,
     returning the boolean outcome.
     """
-    return user.check_password(login_form.password)
+    return await password_utils.check_password_matches(
+        login_form.password, user.password)
 
 
 async def update_user(
@@ -158,8 +237,15 @@ async def update_user_data_database(
     values_to_update = await get_dict_of_values_to_update(user_update_form)
     update_dict = await format_update_dict(values_to_update)
 
+    # a new password revokes every token minted with the old one
+    if "password" in values_to_update:
+        update_dict["$inc"] = {"token_version": 1}
+
     identifier_dict = user_update_form.identifier.get_database_query()
-    users_collection().update_one(identifier_dict, update_dict)
+    await users_collection().update_one(
+        identifier_dict, common_models.add_write_stamp(update_dict))
+    await clear_request_user_identity_map()
+    TOKEN_VERSION_CACHE.pop(user.get_id(), None)
 
 
 async def set_update_form_pass_to_hashed(
@@ -171,8 +257,8 @@ async def set_update_form_pass_to_hashed(
     fixme: This is ugly code.
     """
     unhashed_pass = user_update_form.dict().get("password")
-    user.set_password(unhashed_pass)
-    user_update_form.password = user.dict().get("password")
+    user.password = await password_utils.hash_password(unhashed_pass)
+    user_update_form.password = user.password
 
 
 async def format_update_dict(
@@ -209,30 +295,65 @@ async def get_dict_of_values_to_update(
 async def get_auth_token_from_user_data(user: user_models.User) -> str:
     """
     Given a User object, returns an encoded JWT string with the
-    user's identifier data (UserID) in it's payload.
-    """
-    user_id = user.get_id()
-    encoded_jwt_str = await get_auth_token_from_user_id(user_id)
+    user's identifier data (UserID), user type and token version
+    in it's payload.
+    """
+    user_type = user.user_type if isinstance(user.user_type,
+                                             str) else user.user_type.name
+    payload_dict = {
+        'user_id': user.get_id(),
+        'user_type': user_type,
+        'token_version': user.token_version,
+    }
+    encoded_jwt_str = Token.get_enc_token_str_from_dict(payload_dict)
     return encoded_jwt_str
 
 
 async def get_auth_token_from_user_id(user_id: common_models.UserId) -> str:
     """
-    Returns an encoded token string with the given user_id in it's payload.
+    Returns an encoded token string for the user with the given user_id.
+
+    Raises 404 if the user does not exist.
     """
-    payload_dict = {'user_id': user_id}
-    encoded_jwt_str = Token.get_enc_token_str_from_dict(payload_dict)
+    user_identifier = user_models.UserIdentifier(user_id=user_id)
+    user = await get_user_info_by_identifier(user_identifier)
+    encoded_jwt_str = await get_auth_token_from_user_data(user)
     return encoded_jwt_str
 
 
+async def get_token_version_by_id(
+        user_id: common_models.UserId) -> Optional[int]:
+    """
+    Returns the current token version of the user, or None if the
+    user doesn't exist.
+
+    Versions are cached in-process for `TOKEN_VERSION_CACHE_TTL_SECONDS`,
+    so checking a token only reads the database once in a while.
+    """
+    cached_version = TOKEN_VERSION_CACHE.get(user_id)
+    if cached_version:
+        token_version, read_time = cached_version
+        if time.monotonic() - read_time < TOKEN_VERSION_CACHE_TTL_SECONDS:
+            return token_version
+
+    user_identifier = user_models.UserIdentifier(user_id=user_id)
+    try:
+        user = await get_user_info_by_identifier(user_identifier)
+        token_version = user.token_version
+    except exceptions.UserNotFoundException:
+        token_version = None
+
+    TOKEN_VERSION_CACHE[user_id] = (token_version, time.monotonic())
+    return token_version
+
+
 async def get_events_from_user_identifier(
         identifier: user_models.UserIdentifier) -> List[common_models.EventId]:
     """
     Gets list of all v
     """
-    identifier_dict = identifier.get_database_query()
-    user_dict = users_collection().find_one(identifier_dict)
-    return user_dict["events_visible"]
+    user = await get_user_info_by_identifier(identifier)
+    return user.events_visible
 
 
 async def user_add_event(
@@ -258,56 +379,46 @@ async def add_event_to_user_visible(user_id: user_models.UserId,
     user_identifier = user_models.UserIdentifier(user_id=user_id)
     identifier_dict = user_identifier.get_database_query()
     if event_id not in await get_events_from_user_identifier(user_identifier):
-        users_collection().update_one(identifier_dict,
-                                      {"$push": {
-                                          "events_visible": event_id
-                                      }})
+        await users_collection().update_one(
+            identifier_dict,
+            common_models.add_write_stamp(
+                {"$push": {
+                    "events_visible": event_id
+                }}))
+        await clear_request_user_identity_map()
     else:
         raise exceptions.DuplicateDataException(
             "Event already in user's events_visible field")
 
 
-async def archive_user_event(user_id: user_models.UserId,
-                             event: event_models.Event) -> None:
-    """
-    Given a UserId and an event, moves the event to the appropriate list
-    after checking it's validity.
+async def archive_events_for_all_users(
+        event_ids: List[common_models.EventId]) -> int:
     """
-    user_identifier = user_models.UserIdentifier(user_id=user_id)
-    user = await get_user_info_by_identifier(user_identifier)
-
-    event_should_be_archived = lambda x: x in {"expired", "cancelled"}
+    Moves the events from every user's visible events to their archived
+    events, for all of the events in a single bulk write.
 
-    event_id = event.get_id()
-    event_status = event.status if isinstance(event.status,
-                                              str) else event.status.name
-
-    if event_should_be_archived(event_status):
-        await archive_event_id_from_user(user, event_id)
-
-
-async def archive_event_id_from_user(user: user_models.User,
-                                     event_id: common_models.EventId) -> None:
+    Safe to repeat, since users only match while the event is still
+    visible to them. Returns the amount of events archived across users.
     """
-    Updates the user's event list to archive the event
-    and make it not visible, also updating the new data
-    in the database.
-    """
-
-    # update user
-    update_dict = {
-        "$pull": {
-            "events_visible": event_id
-        },
-        "$push": {
-            "events_archived": event_id
-        },
-    }
+    if not event_ids:
+        return 0
 
-    user_identifier = user_models.UserIdentifier(user_id=user.get_id())
-    identifier_query_dict = user_identifier.get_database_query()
+    archive_operations = [
+        UpdateMany({"events_visible": event_id},
+                   common_models.add_write_stamp({
+                       "$pull": {
+                           "events_visible": event_id
+                       },
+                       "$push": {
+                           "events_archived": event_id
+                       },
+                   })) for event_id in event_ids
+    ]
+    archive_result = await users_collection().bulk_write(archive_operations,
+                                                         ordered=False)
 
-    users_collection().update_one(identifier_query_dict, update_dict)
+    await clear_request_user_identity_map()
+    return archive_result.modified_count
 
 
 async def add_id_to_created_events_list(
@@ -333,7 +444,9 @@ async def append_event_id_to_events_created_list(  # pylint: disable=invalid-nam
     update_dict = await get_dict_to_add_event_id_to_events_created_list(
         event_id)
 
-    result = users_collection().update_one(query, update_dict)
+    result = await users_collection().update_one(
+        query, common_models.add_write_stamp(update_dict))
+    await clear_request_user_identity_map()
     await check_update_one_result_ok(result)
 
 